@@ -0,0 +1,105 @@
+import { EventEmitter } from 'events';
+import { PassThrough } from 'stream';
+import * as readline from 'readline';
+import { spawn } from 'child_process';
+import { TeeService } from './TeeService';
+
+jest.mock('child_process', () => ({
+  spawn: jest.fn(),
+  spawnSync: jest.fn(() => ({})),
+}));
+
+interface FakeWorker extends EventEmitter {
+  stdin: PassThrough;
+  stdout: PassThrough;
+  stderr: PassThrough;
+  peakInFlight: number;
+}
+
+/**
+ * A stand-in for `claude_report --worker` that answers each request after
+ * `delayFor(path)` ms, echoing the request path as the description
+ */
+function fakeWorker(delayFor: (path: string) => number): FakeWorker {
+  const worker = new EventEmitter() as FakeWorker;
+  worker.stdin = new PassThrough();
+  worker.stdout = new PassThrough();
+  worker.stderr = new PassThrough();
+  worker.peakInFlight = 0;
+
+  let inFlight = 0;
+  readline.createInterface({ input: worker.stdin }).on('line', (line) => {
+    const { id, path } = JSON.parse(line);
+    inFlight += 1;
+    worker.peakInFlight = Math.max(worker.peakInFlight, inFlight);
+    setTimeout(() => {
+      inFlight -= 1;
+      const response = { id, path, weapon: false, description: path, decision: true };
+      worker.stdout.write(JSON.stringify(response) + '\n');
+    }, delayFor(path));
+  });
+  return worker;
+}
+
+describe('TeeService', () => {
+  const spawnMock = spawn as unknown as jest.Mock;
+
+  beforeEach(() => {
+    jest.spyOn(console, 'log').mockImplementation(() => undefined);
+    jest.spyOn(console, 'warn').mockImplementation(() => undefined);
+    jest.spyOn(console, 'error').mockImplementation(() => undefined);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+    spawnMock.mockReset();
+  });
+
+  it('should keep up to `concurrency` requests in flight and time them from dispatch', async () => {
+    const worker = fakeWorker(() => 100);
+    spawnMock.mockReturnValue(worker);
+    // Nine requests at three a time take ~300 ms, well past the 150 ms
+    // timeout; none may expire while still queued.
+    const service = new TeeService({ concurrency: 3, requestTimeoutMs: 150 });
+
+    const results = await Promise.all(
+      Array.from({ length: 9 }, () => service.verifyFile(Buffer.from('img'), 'image/png'))
+    );
+
+    expect(results.every((result) => result.decision === true)).toBe(true);
+    expect(worker.peakInFlight).toBe(3);
+    expect(spawnMock).toHaveBeenCalledTimes(1);
+    expect(spawnMock.mock.calls[0][1]).toEqual(expect.arrayContaining(['--concurrency', '3']));
+  });
+
+  it('should route out-of-order responses to the request that sent them', async () => {
+    // Earlier requests answer last
+    const delays: Record<string, number> = { png: 90, gif: 60, webp: 30, jpg: 0 };
+    const worker = fakeWorker((path) => delays[path.split('.').pop()!]);
+    spawnMock.mockReturnValue(worker);
+    const service = new TeeService({ concurrency: 4 });
+
+    const mimeTypes = ['image/png', 'image/gif', 'image/webp', 'image/jpeg'];
+    const results = await Promise.all(
+      mimeTypes.map((mimeType) => service.verifyFile(Buffer.from('img'), mimeType))
+    );
+
+    expect(results.map((result) => result.description.split('.').pop())).toEqual([
+      'png',
+      'gif',
+      'webp',
+      'jpg',
+    ]);
+    expect(worker.peakInFlight).toBe(4);
+  });
+
+  it('should fail a request closed when the worker does not answer in time', async () => {
+    spawnMock.mockReturnValue(fakeWorker(() => 200));
+    const service = new TeeService({ concurrency: 1, requestTimeoutMs: 50 });
+
+    const result = await service.verifyFile(Buffer.from('img'), 'image/png');
+
+    expect(result.decision).toBe(false);
+    expect(result.description).toContain('timed out');
+  });
+});
@@ -1,6 +1,6 @@
 import { ITeeService, TeeVerificationResult } from '../../domain/services/ITeeService';
-import { exec } from 'child_process';
-import { promisify } from 'util';
+import { ChildProcessWithoutNullStreams, spawn, spawnSync } from 'child_process';
+import * as readline from 'readline';
 import * as fs from 'fs';
 import * as path from 'path';
 import * as os from 'os';
@@ -33,7 +33,31 @@ if (backendResult.parsed) {
   console.log(`[TeeService] Loaded ${Object.keys(backendResult.parsed).length} env vars from Backend/.env`);
 }
 
-const execAsync = promisify(exec);
+// Per-image timeout for the TEE worker (Claude call included), counted from
+// the moment the request is written to the worker
+const WORKER_REQUEST_TIMEOUT_MS = 120_000;
+
+// Requests in flight in the worker at once (its --concurrency); later ones
+// wait in TeeService until a slot frees up
+const WORKER_CONCURRENCY = 8;
+
+interface PendingVerification {
+  resolve: (result: TeeVerificationResult) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+interface QueuedVerification {
+  id: string;
+  imagePath: string;
+  resolve: (result: TeeVerificationResult) => void;
+  reject: (error: Error) => void;
+}
+
+export interface TeeServiceOptions {
+  requestTimeoutMs?: number;
+  concurrency?: number;
+}
 
 /**
  * TEE Service Implementation
@@ -41,18 +65,34 @@ const execAsync = promisify(exec);
  * 
  * Process:
  * 1. Save file to temporary location
- * 2. Call Python script with file path
- * 3. Parse JSON response
+ * 2. Send the file path to a long-lived `claude_report.py --worker` process
+ * 3. Read its line-delimited JSON response
  * 4. Clean up temporary file
  * 5. Return verification result
+ *
+ * The worker is started on first use and reused for every later file, so a
+ * bulk upload pays for one interpreter start and one Claude client (with its
+ * HTTP connection pool) instead of one per image. It is restarted if it exits.
+ * It classifies up to WORKER_CONCURRENCY images at once and answers in
+ * completion order; further requests are queued here and only written (and
+ * timed) once a slot is free.
  */
 export class TeeService implements ITeeService {
   private readonly teeScriptPath: string;
   private readonly venvPythonPath: string;
   private readonly isWindows: boolean;
   private readonly useWSL: boolean;
+  private worker: ChildProcessWithoutNullStreams | null = null;
+  private readonly pending = new Map<string, PendingVerification>();
+  private readonly queue: QueuedVerification[] = [];
+  private nextRequestId = 0;
+  private readonly requestTimeoutMs: number;
+  private readonly concurrency: number;
+
+  constructor(options: TeeServiceOptions = {}) {
+    this.requestTimeoutMs = options.requestTimeoutMs ?? WORKER_REQUEST_TIMEOUT_MS;
+    this.concurrency = Math.max(1, options.concurrency ?? WORKER_CONCURRENCY);
 
-  constructor() {
     // Get absolute path to tee_v0/claude_report.py
     const projectRoot = path.resolve(__dirname, '../../../..');
     this.teeScriptPath = path.join(projectRoot, 'tee_v0', 'claude_report.py');
@@ -110,74 +150,13 @@ export class TeeService implements ITeeService {
       fs.writeFileSync(tempFilePath, fileBuffer);
       console.log(`[TeeService] Created temp file: ${tempFilePath}`);
 
-      // Determine script path (convert to WSL path if needed)
-      let scriptPath = this.teeScriptPath;
-      if (this.useWSL) {
-        scriptPath = this.convertToWSLPath(this.teeScriptPath);
-      }
-
-      // Determine temp file path for Python script
+      // Determine temp file path for the Python worker
       let pythonTempPath = tempFilePath;
       if (this.useWSL) {
         pythonTempPath = this.convertToWSLPath(tempFilePath);
       }
 
-      // Build Python command - use wrapper script for WSL to avoid quote escaping issues
-      let command: string;
-      if (this.useWSL) {
-        // Use wrapper script in WSL to handle paths and Python execution
-        const projectRoot = path.resolve(__dirname, '../../../..');
-        const wrapperScriptPath = path.join(projectRoot, 'tee_v0', 'verify_image.sh');
-        const wrapperScriptWSL = this.convertToWSLPath(wrapperScriptPath);
-        const scriptPathWSL = this.convertToWSLPath(scriptPath);
-        const tempPathWSL = this.convertToWSLPath(pythonTempPath);
-        // Get API key from environment
-        const apiKey = process.env.ANTHROPIC_API_KEY || '';
-        
-        if (!apiKey) {
-          console.error(`[TeeService] ❌ ANTHROPIC_API_KEY not found in environment!`);
-          console.error(`[TeeService] Please set ANTHROPIC_API_KEY in Backend/.env or as environment variable`);
-        } else {
-          console.log(`[TeeService] ✅ ANTHROPIC_API_KEY found (${apiKey.substring(0, 10)}...)`);
-        }
-        
-        // Use wrapper script with proper path escaping
-        // Pass API key as argument to the script
-        const apiKeyArg = apiKey ? apiKey : '';
-        command = `wsl -d Ubuntu -- bash "${wrapperScriptWSL}" "${scriptPathWSL}" "${tempPathWSL}" "${apiKeyArg}"`;
-      } else {
-        // Native Linux - use venv if available
-        if (fs.existsSync(this.venvPythonPath)) {
-          command = `"${this.venvPythonPath}" "${scriptPath}" "${pythonTempPath}"`;
-        } else {
-          command = `python3 "${scriptPath}" "${pythonTempPath}" || python "${scriptPath}" "${pythonTempPath}"`;
-        }
-      }
-
-      console.log(`[TeeService] Executing: ${command.substring(0, 200)}...`);
-      
-      // Debug: Check if API key is available
-      const apiKeyEnv = process.env.ANTHROPIC_API_KEY;
-      console.log(`[TeeService] ANTHROPIC_API_KEY in env: ${apiKeyEnv ? 'SET (' + apiKeyEnv.substring(0, 10) + '...)' : 'NOT SET'}`);
-
-      // Pass environment variables to WSL, including ANTHROPIC_API_KEY
-      const execEnv = {
-        ...process.env,
-        ANTHROPIC_API_KEY: apiKeyEnv || '',
-      };
-
-      const { stdout, stderr } = await execAsync(command, {
-        maxBuffer: 10 * 1024 * 1024, // 10MB max output
-        env: execEnv,
-      });
-
-      if (stderr && !stderr.includes('WARNING')) {
-        console.warn(`[TeeService] stderr: ${stderr}`);
-      }
-
-      // Parse JSON response
-      const cleanedOutput = this.cleanJsonOutput(stdout);
-      const result = JSON.parse(cleanedOutput) as TeeVerificationResult;
+      const result = await this.requestVerification(pythonTempPath);
 
       console.log(`[TeeService] Verification result:`, {
         weapon: result.weapon,
@@ -210,6 +189,159 @@ export class TeeService implements ITeeService {
     }
   }
 
+  /**
+   * Return the running TEE worker, starting it if needed
+   */
+  private getWorker(): ChildProcessWithoutNullStreams {
+    if (this.worker) {
+      return this.worker;
+    }
+
+    const apiKey = process.env.ANTHROPIC_API_KEY || '';
+    if (!apiKey) {
+      console.error(`[TeeService] ❌ ANTHROPIC_API_KEY not found in environment!`);
+      console.error(`[TeeService] Please set ANTHROPIC_API_KEY in Backend/.env or as environment variable`);
+    }
+
+    let command: string;
+    let args: string[];
+    if (this.useWSL) {
+      // Use wrapper script in WSL to handle paths and Python execution
+      const projectRoot = path.resolve(__dirname, '../../../..');
+      const wrapperScriptPath = path.join(projectRoot, 'tee_v0', 'verify_image.sh');
+      command = 'wsl';
+      args = [
+        '-d', 'Ubuntu', '--', 'bash',
+        this.convertToWSLPath(wrapperScriptPath),
+        '--worker',
+        apiKey,
+        '--concurrency',
+        String(this.concurrency),
+      ];
+    } else {
+      // Native Linux - use venv if available, else system python3 or python
+      command = this.resolvePython();
+      args = ['-m', 'tee_v0.claude_report', '--worker', '--concurrency', String(this.concurrency)];
+    }
+
+    // Log the full command line, with the API key masked
+    const loggedArgs = args.map((arg) => (apiKey && arg === apiKey ? '<ANTHROPIC_API_KEY>' : arg));
+    console.log(`[TeeService] Starting TEE worker: ${command} ${loggedArgs.join(' ')}`);
+    const worker = spawn(command, args, {
+      // claude_report runs as a module of the tee_v0 package
+      cwd: path.resolve(__dirname, '../../../..'),
+      env: { ...process.env, ANTHROPIC_API_KEY: apiKey },
+    });
+
+    readline.createInterface({ input: worker.stdout }).on('line', (line) => {
+      this.handleWorkerLine(line);
+    });
+    worker.stderr.on('data', (chunk: Buffer) => {
+      const text = chunk.toString();
+      if (!text.includes('WARNING')) {
+        console.warn(`[TeeService] worker stderr: ${text}`);
+      }
+    });
+    const onExit = (reason: string) => {
+      if (this.worker !== worker) {
+        return;
+      }
+      console.warn(`[TeeService] TEE worker stopped: ${reason}`);
+      this.worker = null;
+      for (const [id, request] of this.pending) {
+        clearTimeout(request.timer);
+        request.reject(new Error(`TEE worker stopped: ${reason}`));
+        this.pending.delete(id);
+      }
+      // Requests not yet written go to a fresh worker
+      this.dispatch();
+    };
+    worker.on('exit', (code, signal) => onExit(`exit code ${code ?? signal}`));
+    worker.on('error', (error) => onExit(error.message));
+    // Writes to a worker that just died surface here; onExit rejects them.
+    worker.stdin.on('error', (error) => onExit(error.message));
+
+    this.worker = worker;
+    return worker;
+  }
+
+  /**
+   * Pick the Python interpreter for a native worker: the venv's python3 if
+   * present, else the first of `python3` / `python` that can be started
+   */
+  private resolvePython(): string {
+    if (fs.existsSync(this.venvPythonPath)) {
+      return this.venvPythonPath;
+    }
+    for (const candidate of ['python3', 'python']) {
+      if (!spawnSync(candidate, ['--version']).error) {
+        return candidate;
+      }
+    }
+    return 'python3';
+  }
+
+  /**
+   * Queue one image path for the worker and wait for its answer
+   */
+  private requestVerification(imagePath: string): Promise<TeeVerificationResult> {
+    const id = String(++this.nextRequestId);
+
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id, imagePath, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Write queued requests to the worker while it has a free slot. A request's
+   * timeout starts when it is written, not while it waits in the queue.
+   */
+  private dispatch(): void {
+    while (this.queue.length > 0 && this.pending.size < this.concurrency) {
+      const { id, imagePath, resolve, reject } = this.queue.shift()!;
+      const worker = this.getWorker();
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`TEE worker timed out after ${this.requestTimeoutMs} ms`));
+        this.dispatch();
+      }, this.requestTimeoutMs);
+      this.pending.set(id, { resolve, reject, timer });
+      worker.stdin.write(JSON.stringify({ id, path: imagePath }) + '\n');
+    }
+  }
+
+  /**
+   * Route one line-delimited JSON response to the request waiting for it
+   */
+  private handleWorkerLine(line: string): void {
+    let response: any;
+    try {
+      response = JSON.parse(this.cleanJsonOutput(line));
+    } catch {
+      console.warn(`[TeeService] Ignoring non-JSON worker output: ${line.substring(0, 200)}`);
+      return;
+    }
+
+    const request = this.pending.get(String(response.id));
+    if (!request) {
+      return;
+    }
+    this.pending.delete(String(response.id));
+    clearTimeout(request.timer);
+    this.dispatch();
+
+    if (response.error) {
+      request.reject(new Error(response.error));
+    } else {
+      request.resolve({
+        weapon: response.weapon,
+        description: response.description,
+        decision: response.decision,
+      });
+    }
+  }
+
   /**
    * Convert Windows path to WSL path
    */
@@ -0,0 +1,7 @@
+"""
+TEE v0 verification scripts: ask Claude whether an image is acceptable.
+
+Run the scripts as modules from the repository root, e.g.
+`python -m tee_v0.claude_report --worker`, so that they can import the
+verdict cache and settings shared with `tee_v1`.
+"""
@@ -0,0 +1,136 @@
+"""
+Payload-size and latency benchmark for the image upload preprocessing.
+
+For every image it compares the raw file bytes (what the scripts used to
+send) with the output of `image_prep.prepare_image`, and prints:
+
+* total base64 payload before/after and the reduction,
+* preprocessing time per image,
+* with `--api`, mean end-to-end `messages.create` latency for both payloads
+  (uses ANTHROPIC_API_KEY / ANTHROPIC_BASE_URL; raw uploads are only timed
+  for formats the API accepts as-is).
+
+Usage:
+
+    python -m tee_v0.bench_image_upload path/to/photos --api
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import io
+import statistics
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from PIL import Image
+
+from .claude_report import MAX_TOKENS, MODEL, build_client, build_prompt
+from .image_prep import (
+    API_MEDIA_TYPES,
+    IMAGE_EXTENSIONS,
+    get_jpeg_quality,
+    get_max_edge,
+    get_passthrough_bytes,
+    prepare_image,
+)
+
+
+def _collect(inputs: List[Path]) -> List[Path]:
+    paths: List[Path] = []
+    for path in inputs:
+        if path.is_dir():
+            paths.extend(
+                sorted(
+                    p
+                    for p in path.rglob("*")
+                    if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS
+                )
+            )
+        else:
+            paths.append(path)
+    return paths
+
+
+def _raw_media_type(data: bytes) -> Optional[str]:
+    with Image.open(io.BytesIO(data)) as image:
+        return API_MEDIA_TYPES.get(image.format or "")
+
+
+def _timed_call(client, media_type: str, payload: bytes) -> float:
+    started = time.perf_counter()
+    client.messages.create(
+        model=MODEL,
+        max_tokens=MAX_TOKENS,
+        temperature=0.0,
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": build_prompt()},
+                    {
+                        "type": "image",
+                        "source": {
+                            "type": "base64",
+                            "media_type": media_type,
+                            "data": base64.b64encode(payload).decode("utf-8"),
+                        },
+                    },
+                ],
+            }
+        ],
+    )
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "images", nargs="*", type=Path, default=[Path(__file__).parent]
+    )
+    parser.add_argument("--api", action="store_true", help="also time API calls")
+    args = parser.parse_args()
+
+    paths = _collect(args.images)
+    if not paths:
+        raise SystemExit("No images found")
+
+    client = build_client() if args.api else None
+    raw_total = prepared_total = 0
+    prep_times: List[float] = []
+    raw_latency: List[float] = []
+    prepared_latency: List[float] = []
+
+    for path in paths:
+        data = path.read_bytes()
+        started = time.perf_counter()
+        media_type, payload = prepare_image(
+            data, get_max_edge(), get_jpeg_quality(), get_passthrough_bytes()
+        )
+        prep_times.append(time.perf_counter() - started)
+        raw_total += len(base64.b64encode(data))
+        prepared_total += len(base64.b64encode(payload))
+
+        if client is not None:
+            raw_type = _raw_media_type(data)
+            if raw_type is not None:
+                raw_latency.append(_timed_call(client, raw_type, data))
+            prepared_latency.append(_timed_call(client, media_type, payload))
+
+    print(f"images:           {len(paths)}")
+    print(f"raw payload:      {raw_total / 1e6:10.2f} MB (base64)")
+    print(
+        f"prepared payload: {prepared_total / 1e6:10.2f} MB "
+        f"({prepared_total / raw_total:.1%} of raw)"
+    )
+    print(f"preprocessing:    {statistics.mean(prep_times) * 1000:10.1f} ms/image")
+    if raw_latency:
+        print(f"raw latency:      {statistics.mean(raw_latency):10.2f} s/image")
+    if prepared_latency:
+        print(f"prepared latency: {statistics.mean(prepared_latency):10.2f} s/image")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,33 +12,19 @@ Usage (from repo root, after installing requirements):
     export ANTHROPIC_API_KEY="sk-ant-..." # bash
 
     # 3) Run the script
-    python tee_v0/claude_image_report.py
+    python -m tee_v0.claude_image_report
 """
 
 from __future__ import annotations
 
-import base64
 import json
 import os
 from pathlib import Path
 
 from anthropic import Anthropic
 
-
-def load_image_base64(path: Path) -> tuple[str, str]:
-    """
-    Load an image and return (media_type, base64_data).
-    """
-    suffix = path.suffix.lower()
-    if suffix in {".jpg", ".jpeg"}:
-        media_type = "image/jpeg"
-    elif suffix == ".png":
-        media_type = "image/png"
-    else:
-        raise ValueError(f"Unsupported image extension for {path}")
-
-    data = path.read_bytes()
-    return media_type, base64.b64encode(data).decode("utf-8")
+# Downscales/re-encodes before upload; accepts WebP, GIF and BMP too.
+from .image_prep import load_image_base64
 
 
 def build_prompt() -> str:
@@ -18,34 +18,91 @@ Usage (from repo root, after installing requirements):
     export ANTHROPIC_API_KEY="sk-ant-..." # bash
 
     # 3) Run the script (uses tee_v0/bad_gun.jpg by default)
-    python tee_v0/claude_report.py
+    python -m tee_v0.claude_report
+
+Worker mode keeps one interpreter and one HTTP connection pool alive across
+many images instead of paying a cold start per file:
+
+    # Line-delimited JSON over stdin/stdout
+    python -m tee_v0.claude_report --worker
+
+    # Same protocol over a Unix socket, one thread per connection
+    python -m tee_v0.claude_report --socket /tmp/claude_report.sock
+
+Each request line is `{"id": "...", "path": "/abs/image.jpg"}` (or just the
+path). Each response line echoes `id` and `path` and carries either the
+`weapon` / `description` / `decision` fields or an `error` message. Up to
+`--concurrency` requests are answered at once, so responses come back in
+completion order; match them to requests by `id`.
+
+Batch mode verifies many images concurrently and streams one JSON line per
+image, tagged with its `path`, in completion order:
+
+    python -m tee_v0.claude_report --batch path/to/dir more.jpg --concurrency 8
+
+Directories are searched recursively for supported images. Rate-limited,
+overloaded and failed connections are retried with exponential backoff.
+
+In every mode, verdicts are cached by SHA-256 and perceptual hash (see
+`tee_v1/verdict_cache.py`), so re-uploads and near-identical copies of an
+image are answered without calling Claude. Set `VERDICT_CACHE_PATH=""` to
+disable the cache.
 """
 
 from __future__ import annotations
 
-import base64
+import argparse
+import hashlib
 import json
 import os
+import random
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
+import anthropic
 from anthropic import Anthropic
 
+# The verdict cache and its settings are shared with the tee_v1 service.
+from tee_v1.config import (
+    get_verdict_cache_max_distance,
+    get_verdict_cache_max_entries,
+    get_verdict_cache_path,
+)
+from tee_v1.verdict_cache import VerdictCache, content_sha256, fingerprint_bytes
+
+from .image_prep import IMAGE_EXTENSIONS, load_image_base64
+
+MODEL = "claude-haiku-4-5-20251001"
+MAX_TOKENS = 300
 
-def load_image_base64(path: Path) -> Tuple[str, str]:
+# Batch mode defaults: requests in flight, attempts per image, and the
+# backoff bounds (seconds) between attempts.
+BATCH_CONCURRENCY = 8
+BATCH_MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# Errors worth retrying: 429, 5xx / 529 overloaded, network failures.
+RETRYABLE_ERRORS = (
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+    anthropic.APIConnectionError,
+)
+
+
+class ClaudeOutputError(ValueError):
     """
-    Load an image and return (media_type, base64_data).
+    Raised when Claude's answer cannot be parsed as the expected JSON.
     """
-    suffix = path.suffix.lower()
-    if suffix in {".jpg", ".jpeg"}:
-        media_type = "image/jpeg"
-    elif suffix == ".png":
-        media_type = "image/png"
-    else:
-        raise ValueError(f"Unsupported image extension for {path}")
 
-    data = path.read_bytes()
-    return media_type, base64.b64encode(data).decode("utf-8")
+    def __init__(self, raw: str) -> None:
+        super().__init__("Claude output is not valid JSON")
+        self.raw = raw
 
 
 def build_prompt() -> str:
@@ -80,6 +137,12 @@ Requirements:
 """
 
 
+# Cached verdicts are only reused for the same model and prompt.
+VERDICT_NAMESPACE = "claude:{}:{}".format(
+    MODEL, hashlib.sha256(build_prompt().encode("utf-8")).hexdigest()[:16]
+)
+
+
 def clean_markdown_fences(raw: str) -> str:
     """
     Remove optional ```json ... ``` fences if Claude adds them by mistake.
@@ -100,36 +163,67 @@ def clean_markdown_fences(raw: str) -> str:
     return cleaned
 
 
-def main() -> None:
-    import sys
-    
+def open_verdict_cache() -> Optional[VerdictCache]:
+    """
+    Open the verdict cache configured by the VERDICT_CACHE_* variables, or
+    return None if it is disabled.
+    """
+    path = get_verdict_cache_path()
+    if path is None:
+        return None
+    return VerdictCache(
+        path, get_verdict_cache_max_entries(), get_verdict_cache_max_distance()
+    )
+
+
+def build_client() -> Anthropic:
+    """
+    Create the Claude client. Reuse it: it owns the HTTP connection pool.
+    """
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise SystemExit("ANTHROPIC_API_KEY environment variable is not set")
+    return Anthropic(api_key=api_key)
+
+
+def classify_image(
+    client: Anthropic, image_path: Path, cache: Optional[VerdictCache] = None
+) -> Dict[str, Any]:
+    """
+    Ask Claude about a single image and return
+    `{"weapon": bool, "description": str, "decision": bool}`.
 
-    # Accept file path as command line argument, or use default
-    if len(sys.argv) > 1:
-        image_path = Path(sys.argv[1])
-    else:
-        image_path = Path(__file__).parent / "bad_gun.jpg"
-    
+    With a `cache`, verdicts of the same or near-identical images are reused
+    instead of calling Claude again. A byte-identical image is answered from
+    its SHA-256 before it is decoded.
+    """
     if not image_path.exists():
-        raise SystemExit(f"Image not found: {image_path}")
+        raise FileNotFoundError(f"Image not found: {image_path}")
+
+    fingerprint = None
+    if cache is not None:
+        data = image_path.read_bytes()
+        sha256 = content_sha256(data)
+        cached = cache.lookup_exact(VERDICT_NAMESPACE, sha256)
+        if cached is not None:
+            return cached
+        fingerprint = fingerprint_bytes(data, sha256)
+        if fingerprint is not None:
+            cached = cache.lookup(VERDICT_NAMESPACE, fingerprint)
+            if cached is not None:
+                return cached
 
     media_type, img_b64 = load_image_base64(image_path)
 
-    client = Anthropic(api_key=api_key)
-    prompt = build_prompt()
-
     response = client.messages.create(
-        model="claude-haiku-4-5-20251001",
-        max_tokens=300,
+        model=MODEL,
+        max_tokens=MAX_TOKENS,
         temperature=0.0,
         messages=[
             {
                 "role": "user",
                 "content": [
-                    {"type": "text", "text": prompt},
+                    {"type": "text", "text": build_prompt()},
                     {
                         "type": "image",
                         "source": {
@@ -153,10 +247,8 @@ def main() -> None:
 
     try:
         parsed = json.loads(cleaned)
-    except json.JSONDecodeError:
-        print("Raw Claude output (failed to parse as JSON):")
-        print(raw)
-        raise
+    except json.JSONDecodeError as exc:
+        raise ClaudeOutputError(raw) from exc
 
     # Ensure we return exactly the expected fields.
     weapon = bool(parsed.get("weapon", False))
@@ -164,11 +256,269 @@ def main() -> None:
     decision = bool(parsed.get("decision", not weapon))
 
     result = {"weapon": weapon, "description": description, "decision": decision}
+    if cache is not None and fingerprint is not None:
+        cache.store(VERDICT_NAMESPACE, fingerprint, result)
+    return result
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float:
+    """
+    Seconds to wait before retry `attempt` (1-based), honouring Retry-After.
+    """
+    response = getattr(exc, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        try:
+            return min(BACKOFF_MAX, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+    # Full jitter keeps concurrent workers from retrying in lockstep.
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+def classify_image_with_retry(
+    client: Anthropic,
+    image_path: Path,
+    max_attempts: int = BATCH_MAX_ATTEMPTS,
+    cache: Optional[VerdictCache] = None,
+) -> Dict[str, Any]:
+    """
+    `classify_image`, retrying rate-limit, overload and connection errors
+    with exponential backoff. At least one attempt is always made.
+    """
+    max_attempts = max(1, max_attempts)
+    attempt = 1
+    while True:
+        try:
+            return classify_image(client, image_path, cache)
+        except RETRYABLE_ERRORS as exc:
+            if attempt >= max_attempts:
+                raise
+            time.sleep(_retry_delay(exc, attempt))
+            attempt += 1
+
+
+def iter_image_paths(inputs: Iterable[Path]) -> Iterator[Path]:
+    """
+    Expand directories (recursively) into the supported images they contain;
+    explicit file paths are passed through as given.
+    """
+    for path in inputs:
+        if path.is_dir():
+            yield from sorted(
+                p
+                for p in path.rglob("*")
+                if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS
+            )
+        else:
+            yield path
+
+
+def verify_batch(
+    client: Anthropic,
+    image_paths: List[Path],
+    concurrency: int = BATCH_CONCURRENCY,
+    max_attempts: int = BATCH_MAX_ATTEMPTS,
+    cache: Optional[VerdictCache] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Verify `image_paths` with at most `concurrency` requests in flight.
+
+    Yields one result per image, tagged with its `path`, as soon as it
+    completes; failures carry an `error` instead of the verdict fields.
+    """
+    # Retries are driven by `classify_image_with_retry`, not the client.
+    client = client.with_options(max_retries=0)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {
+            pool.submit(
+                classify_image_with_retry, client, path, max_attempts, cache
+            ): path
+            for path in image_paths
+        }
+        for future in as_completed(futures):
+            result: Dict[str, Any] = {"path": str(futures[future])}
+            try:
+                result.update(future.result())
+            except Exception as exc:
+                result["error"] = f"{type(exc).__name__}: {exc}"
+            yield result
+
+
+def handle_request(
+    client: Anthropic, line: str, cache: Optional[VerdictCache] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Answer one worker request line. Returns None for blank lines.
+
+    Errors are reported in the response rather than raised, so that one bad
+    image never stops the worker.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    request_id: Any = None
+    path = line
+    if line.startswith("{"):
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            path = str(request["path"])
+        except (ValueError, KeyError, AttributeError):
+            return {"id": request_id, "error": f"Malformed request: {line[:200]}"}
+
+    response: Dict[str, Any] = {"id": request_id, "path": path}
+    try:
+        response.update(classify_image(client, Path(path), cache))
+    except Exception as exc:
+        response["error"] = f"{type(exc).__name__}: {exc}"
+    return response
+
+
+def serve_lines(
+    client: Anthropic,
+    lines: Iterable[str],
+    write: Callable[[str], None],
+    cache: Optional[VerdictCache] = None,
+    concurrency: int = BATCH_CONCURRENCY,
+) -> None:
+    """
+    Answer each request line with one JSON response line, in completion
+    order, with at most `concurrency` requests in flight.
+
+    No more lines are read while every slot is busy. Returns once every
+    request read has been answered.
+    """
+    concurrency = max(1, concurrency)
+    slots = threading.BoundedSemaphore(concurrency)
+    write_lock = threading.Lock()
+
+    def answer(line: str) -> None:
+        try:
+            response = handle_request(client, line, cache)
+            if response is not None:
+                text = json.dumps(response) + "\n"
+                with write_lock:
+                    write(text)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for line in lines:
+            slots.acquire()
+            pool.submit(answer, line)
+
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    server: "_SocketServer"
+
+    def handle(self) -> None:
+        def write(text: str) -> None:
+            self.wfile.write(text.encode("utf-8"))
+            self.wfile.flush()
+
+        lines = (raw.decode("utf-8", errors="replace") for raw in self.rfile)
+        serve_lines(self.server.client, lines, write, self.server.cache)
+
+
+class _SocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(
+        self, path: str, client: Anthropic, cache: Optional[VerdictCache]
+    ) -> None:
+        # The sync client is thread-safe; all connections share its pool.
+        self.client = client
+        self.cache = cache
+        super().__init__(path, _SocketHandler)
+
+
+def serve_socket(
+    client: Anthropic, socket_path: Path, cache: Optional[VerdictCache] = None
+) -> None:
+    """
+    Serve the worker protocol on a Unix socket until interrupted.
+    """
+    if socket_path.exists():
+        socket_path.unlink()
+    with _SocketServer(str(socket_path), client, cache) as server:
+        try:
+            server.serve_forever()
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ask Claude whether images are safe.")
+    parser.add_argument(
+        "images",
+        nargs="*",
+        type=Path,
+        help="image to verify (default: bad_gun.jpg); with --batch, images "
+        "and directories",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--worker",
+        action="store_true",
+        help="serve line-delimited JSON requests on stdin/stdout",
+    )
+    mode.add_argument(
+        "--socket", type=Path, help="serve the worker protocol on a Unix socket"
+    )
+    mode.add_argument(
+        "--batch",
+        action="store_true",
+        help="verify all given images/directories concurrently, streaming JSONL",
+    )
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("--max-attempts", type=int, default=BATCH_MAX_ATTEMPTS)
+    args = parser.parse_args()
+    if args.batch and not args.images:
+        parser.error("--batch needs at least one image or directory")
+    if args.max_attempts < 1:
+        parser.error("--max-attempts must be at least 1")
+
+    client = build_client()
+    cache = open_verdict_cache()
+
+    if args.worker:
+
+        def write(text: str) -> None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+        serve_lines(client, sys.stdin, write, cache, args.concurrency)
+        return
+    if args.socket is not None:
+        serve_socket(client, args.socket, cache)
+        return
+    if args.batch:
+        failed = False
+        image_paths = list(iter_image_paths(args.images))
+        for result in verify_batch(
+            client, image_paths, args.concurrency, args.max_attempts, cache
+        ):
+            failed = failed or "error" in result
+            print(json.dumps(result), flush=True)
+        raise SystemExit(1 if failed else 0)
+
+    image_path = Path(__file__).parent / "bad_gun.jpg"
+    if args.images:
+        image_path = args.images[0]
+    if not image_path.exists():
+        raise SystemExit(f"Image not found: {image_path}")
+
+    try:
+        result = classify_image(client, image_path, cache)
+    except ClaudeOutputError as exc:
+        print("Raw Claude output (failed to parse as JSON):")
+        print(exc.raw)
+        raise
 
     print(json.dumps(result, indent=2))
 
 
 if __name__ == "__main__":
     main()
-
-
@@ -0,0 +1,118 @@
+"""
+Image preprocessing before upload to Claude.
+
+Phone photos are often several MB and far larger than the model can use:
+images whose long edge exceeds ~1568 px are downscaled server-side anyway,
+so the extra pixels only cost upload time and bandwidth. `prepare_image`:
+
+* applies the EXIF orientation, so rotated photos are sent upright,
+* caps the long edge at `IMAGE_MAX_EDGE` pixels (default 1568),
+* re-encodes to JPEG at `IMAGE_JPEG_QUALITY` (default 85), flattening any
+  transparency onto white,
+* accepts everything Pillow can decode (JPEG, PNG, WebP, GIF, BMP, ...);
+  animated images are reduced to their first frame.
+
+Small images already in a format the API accepts (JPEG, PNG, GIF, WebP) and
+under `IMAGE_PASSTHROUGH_BYTES` (default 512 KiB) are sent unchanged.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import os
+from pathlib import Path
+from typing import Tuple
+
+from PIL import ExifTags, Image, ImageOps
+
+# Formats the Messages API accepts as-is, by Pillow format name.
+API_MEDIA_TYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "GIF": "image/gif",
+    "WEBP": "image/webp",
+}
+
+# File extensions the scripts pick up when given a directory.
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise ValueError(f"Invalid {name} value: {raw!r}") from exc
+
+
+def get_max_edge() -> int:
+    return _env_int("IMAGE_MAX_EDGE", 1568)
+
+
+def get_jpeg_quality() -> int:
+    return _env_int("IMAGE_JPEG_QUALITY", 85)
+
+
+def get_passthrough_bytes() -> int:
+    return _env_int("IMAGE_PASSTHROUGH_BYTES", 512 * 1024)
+
+
+def prepare_image(
+    data: bytes,
+    max_edge: int,
+    quality: int,
+    passthrough_bytes: int,
+) -> Tuple[str, bytes]:
+    """
+    Return `(media_type, payload)` for encoded image `data`, downscaling and
+    re-encoding it when needed.
+
+    Raises ValueError if `data` is not a decodable image.
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except Exception as exc:
+        raise ValueError("Unsupported or corrupt image") from exc
+
+    media_type = API_MEDIA_TYPES.get(image.format or "")
+    rotated = image.getexif().get(ExifTags.Base.Orientation, 1) != 1
+    if (
+        media_type is not None
+        and len(data) <= passthrough_bytes
+        and max(image.size) <= max_edge
+        and not rotated
+        and not getattr(image, "is_animated", False)
+    ):
+        return media_type, data
+
+    if rotated:
+        image = ImageOps.exif_transpose(image)
+    if max(image.size) > max_edge:
+        image = image.copy()
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+    if image.mode in ("RGBA", "LA") or "transparency" in image.info:
+        rgba = image.convert("RGBA")
+        flattened = Image.new("RGB", rgba.size, (255, 255, 255))
+        flattened.paste(rgba, mask=rgba.getchannel("A"))
+        image = flattened
+    else:
+        image = image.convert("RGB")
+
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=quality, optimize=True)
+    return "image/jpeg", out.getvalue()
+
+
+def load_image_base64(path: Path) -> Tuple[str, str]:
+    """
+    Load an image, prepare it for upload, and return (media_type, base64_data).
+    """
+    media_type, payload = prepare_image(
+        path.read_bytes(), get_max_edge(), get_jpeg_quality(), get_passthrough_bytes()
+    )
+    return media_type, base64.b64encode(payload).decode("utf-8")
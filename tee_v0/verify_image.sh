@@ -1,10 +1,14 @@
 #!/bin/bash
 # Wrapper script for TEE image verification
-# Usage: verify_image.sh <script_path> <image_path> [api_key]
+# Usage: verify_image.sh <image_path> [api_key]
+#        verify_image.sh --worker [api_key] [--concurrency N]
+# With --worker the script stays up and answers line-delimited JSON requests
+# on stdin/stdout (see claude_report.py). Arguments after the API key are
+# passed on to claude_report.py.
 
-SCRIPT_PATH="$1"
-IMAGE_PATH="$2"
-API_KEY="${3:-$ANTHROPIC_API_KEY}"
+IMAGE_PATH="$1"
+API_KEY="${2:-$ANTHROPIC_API_KEY}"
+EXTRA_ARGS=("${@:3}")
 
 # Export API key if provided
 if [ -n "$API_KEY" ]; then
@@ -15,13 +19,16 @@ fi
 SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 VENV_PYTHON="${SCRIPT_DIR}/venv/bin/python3"
 
+# claude_report runs as a module of the tee_v0 package, from the repo root
+cd "${SCRIPT_DIR}/.." || exit 1
+
 # Try venv Python first, then system python3, fallback to python
 if [ -f "$VENV_PYTHON" ]; then
-    "$VENV_PYTHON" "$SCRIPT_PATH" "$IMAGE_PATH"
+    "$VENV_PYTHON" -m tee_v0.claude_report "$IMAGE_PATH" "${EXTRA_ARGS[@]}"
 elif command -v python3 >/dev/null 2>&1; then
-    python3 "$SCRIPT_PATH" "$IMAGE_PATH"
+    python3 -m tee_v0.claude_report "$IMAGE_PATH" "${EXTRA_ARGS[@]}"
 elif command -v python >/dev/null 2>&1; then
-    python "$SCRIPT_PATH" "$IMAGE_PATH"
+    python -m tee_v0.claude_report "$IMAGE_PATH" "${EXTRA_ARGS[@]}"
 else
     echo '{"weapon":true,"description":"Python not found. Install: sudo apt install python3-venv && cd tee_v0 && python3 -m venv venv && venv/bin/pip install -r requirements.txt","decision":false}'
     exit 1
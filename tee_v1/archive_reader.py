@@ -0,0 +1,209 @@
+"""
+Streaming access to datasets shipped as archives.
+
+Datasets often arrive as `.zip` or `.tar` (optionally gzip / bzip2 / xz
+compressed) bundles. Extracting them before the analysis doubles both the
+I/O and the disk usage, so the analysis reads archive members as streams
+instead:
+
+* `list_members` returns the regular-file members of an archive. For zip it
+  reads the central directory; for tar it reads the member headers in one
+  sequential pass, decompressing but never storing the member data.
+* `iter_members` yields selected members as readable file objects in archive
+  order, in a single sequential pass, so a compressed tar is decompressed
+  once and never seeked backwards. Only one member is open at a time and
+  callers read it in blocks, so memory stays bounded per member.
+
+Member streams are forward-only, whatever the archive format. Member names
+are reported as stored, minus a leading `./`. A name stored more than once
+resolves to its last occurrence, as it would on extraction. Links and other
+special tar entries are not regular files and are skipped. This module never
+writes member data to disk; callers that need to seek within a member buffer
+it themselves (the PII scanner spools large table members to a temporary
+file, see `pii_scanner.TABLE_SPOOL_BYTES`).
+"""
+
+from __future__ import annotations
+
+import io
+import lzma
+import tarfile
+import zipfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Collection, Dict, Iterator, List, Optional, Tuple
+
+# Dataset archive suffixes, matched case-insensitively.
+ARCHIVE_SUFFIXES: Tuple[str, ...] = (
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+
+# Members read whole by `iter_member_bytes` are read in blocks of this size.
+MEMBER_READ_CHUNK = 1 << 20
+
+# Errors raised by the archive modules and their decompressors on corrupt or
+# truncated input.
+_READ_ERRORS: Tuple[type, ...] = (
+    tarfile.TarError,
+    zipfile.BadZipFile,
+    EOFError,
+    zlib.error,
+    lzma.LZMAError,
+    OSError,
+)
+
+
+class ArchiveError(ValueError):
+    """
+    Raised when a dataset archive is corrupt, truncated or unreadable.
+    """
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    # Position of the member among all entries of the archive.
+    index: int
+    name: str
+    size: int
+
+
+def is_dataset_archive(path: Path) -> bool:
+    """
+    Return True if `path` is a file with one of the `ARCHIVE_SUFFIXES`.
+    """
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES) and path.is_file()
+
+
+def is_zip_archive(path: Path) -> bool:
+    """
+    Return True if the archive at `path` is a zip, whose members can be
+    opened in any order (tar members can only be read from the start).
+    """
+    return path.name.lower().endswith(".zip")
+
+
+def _member_name(name: str) -> str:
+    while name.startswith("./"):
+        name = name[2:]
+    return name.lstrip("/")
+
+
+class _MemberReader(io.RawIOBase):
+    """
+    Forward-only view of an archive member that reports corrupt data as
+    `ArchiveError`.
+    """
+
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        try:
+            data = self._stream.read(len(buffer))
+        except _READ_ERRORS as exc:
+            raise ArchiveError(f"Corrupt archive member: {exc}") from exc
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def list_members(archive: Path) -> List[ArchiveMember]:
+    """
+    Return the regular-file members of `archive` in archive order.
+
+    Raises ArchiveError if the archive can not be read.
+    """
+    latest: Dict[str, ArchiveMember] = {}
+    try:
+        if is_zip_archive(archive):
+            with zipfile.ZipFile(archive) as bundle:
+                for index, info in enumerate(bundle.infolist()):
+                    if not info.is_dir():
+                        name = _member_name(info.filename)
+                        latest[name] = ArchiveMember(index, name, info.file_size)
+        else:
+            with tarfile.open(archive, "r|*") as bundle:
+                for index, info in enumerate(bundle):
+                    if info.isfile():
+                        name = _member_name(info.name)
+                        latest[name] = ArchiveMember(index, name, info.size)
+                # tarfile ends quietly when the data runs out where a header
+                # should be; a complete archive has an end-of-archive block.
+                if bundle.fileobj.tell() < bundle.offset + tarfile.BLOCKSIZE:
+                    raise tarfile.ReadError("unexpected end of data")
+    except _READ_ERRORS as exc:
+        raise ArchiveError(f"Unreadable dataset archive {archive.name}: {exc}") from exc
+    return sorted(latest.values(), key=lambda member: member.index)
+
+
+def iter_members(
+    archive: Path, indices: Collection[int]
+) -> Iterator[Tuple[int, BinaryIO]]:
+    """
+    Yield `(index, stream)` for the members of `archive` at `indices`, in
+    archive order.
+
+    Each stream is only valid until the next one is yielded. Members that
+    can not be opened (encrypted or unsupported zip entries) are skipped.
+    Raises ArchiveError if the archive is corrupt.
+    """
+    wanted = set(indices)
+    if not wanted:
+        return
+    try:
+        if is_zip_archive(archive):
+            with zipfile.ZipFile(archive) as bundle:
+                infos = bundle.infolist()
+                # Header order is archive order, so the file is read forwards.
+                for index in sorted(wanted, key=lambda i: infos[i].header_offset):
+                    try:
+                        stream = bundle.open(infos[index])
+                    except (RuntimeError, NotImplementedError):
+                        continue
+                    with stream:
+                        yield index, _MemberReader(stream)
+        else:
+            with tarfile.open(archive, "r|*") as bundle:
+                for index, info in enumerate(bundle):
+                    if index not in wanted:
+                        continue
+                    stream = bundle.extractfile(info)
+                    if stream is not None:
+                        yield index, _MemberReader(stream)
+                    wanted.discard(index)
+                    if not wanted:
+                        return
+    except _READ_ERRORS as exc:
+        raise ArchiveError(f"Unreadable dataset archive {archive.name}: {exc}") from exc
+
+
+def iter_member_bytes(
+    archive: Path, indices: Collection[int], max_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Yield the contents of the members of `archive` at `indices`, one member
+    at a time, in archive order.
+
+    Members are read in `MEMBER_READ_CHUNK` blocks. A member larger than
+    `max_size` bytes is only read up to that limit and yields `b""`.
+    """
+    for _, stream in iter_members(archive, indices):
+        blocks: List[bytes] = []
+        size = 0
+        while block := stream.read(MEMBER_READ_CHUNK):
+            size += len(block)
+            if max_size is not None and size > max_size:
+                blocks = []
+                break
+            blocks.append(block)
+        yield b"".join(blocks)
@@ -0,0 +1,7 @@
+"""
+Micro-benchmarks for the substitute enclave.
+
+Each module is runnable on its own, e.g.:
+
+    python -m tee_v1.benchmarks.bench_pii_scanner
+"""
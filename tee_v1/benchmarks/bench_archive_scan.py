@@ -0,0 +1,141 @@
+"""
+Benchmark for scanning archive datasets without extracting them.
+
+Builds a dataset of text files, a CSV table and binary blobs, packs it as
+`.tar.gz` and `.zip`, and for each archive times:
+
+* extract-then-scan: unpack into a temporary directory, then run
+  `scan_dataset_for_pii` over the directory,
+* streaming: run `scan_dataset_for_pii` on the archive itself, reading each
+  member as a stream.
+
+It prints throughput over the uncompressed bytes, and the bytes each
+approach writes to disk (streaming only writes the CSV, to a temporary
+file, if it is larger than `TABLE_SPOOL_BYTES`, i.e. above `--text-mb 128`).
+The findings must be identical.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_archive_scan --text-mb 32 --binary-mb 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from ..pii_scanner import scan_dataset_for_pii
+from .bench_pii_scanner import make_corpus
+
+# (path, counts per type, example hits) of each file with findings.
+Findings = List[Tuple[str, Dict[str, int], List[Tuple[str, str, str]]]]
+
+
+def make_dataset(root: Path, text_mb: float, binary_mb: float, files: int) -> int:
+    """
+    Write `files` text files and as many binary blobs, plus one CSV, and
+    return the total size in bytes.
+    """
+    (root / "tables").mkdir()
+    (root / "tables" / "records.csv").write_text(
+        "id,note\n"
+        + "".join(
+            f"{index},{line}\n"
+            for index, line in enumerate(make_corpus(text_mb / 4, seed=1).splitlines())
+        ),
+        encoding="utf-8",
+    )
+    (root / "text").mkdir()
+    (root / "blobs").mkdir()
+    for index in range(files):
+        (root / "text" / f"part{index:03d}.txt").write_text(
+            make_corpus(text_mb / files, seed=index), encoding="utf-8"
+        )
+        # Incompressible, like the images and weights of a real dataset.
+        (root / "blobs" / f"image{index:03d}.jpg").write_bytes(
+            b"\xff\xd8\xff\xe0" + os.urandom(int(binary_mb * 1_000_000 / files))
+        )
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+
+
+def pack(root: Path, target: Path) -> None:
+    paths = sorted(path for path in root.rglob("*") if path.is_file())
+    if target.suffix == ".zip":
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as bundle:
+            for path in paths:
+                bundle.write(path, path.relative_to(root).as_posix())
+    else:
+        with tarfile.open(target, "w:gz") as bundle:
+            for path in paths:
+                bundle.add(path, path.relative_to(root).as_posix())
+
+
+def _scan(root: Path) -> Findings:
+    return [(f.path, f.counts, f.examples) for f in scan_dataset_for_pii(root).files]
+
+
+def _extract_then_scan(archive: Path, scratch: Path) -> Findings:
+    if archive.suffix == ".zip":
+        with zipfile.ZipFile(archive) as bundle:
+            bundle.extractall(scratch)
+    else:
+        with tarfile.open(archive) as bundle:
+            bundle.extractall(scratch, filter="data")
+    return _scan(scratch)
+
+
+def _time(
+    label: str, run: Callable[[], Findings], size: int, written: int
+) -> Tuple[float, Findings]:
+    started = time.perf_counter()
+    findings = run()
+    elapsed = time.perf_counter() - started
+    print(
+        f"  {label:<18} {elapsed:7.2f} s {size / 1e6 / elapsed:7.1f} MB/s "
+        f"{written / 1e6:8.1f} MB written, "
+        f"{sum(sum(counts.values()) for _, counts, _ in findings)} findings"
+    )
+    return elapsed, findings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--text-mb", type=float, default=16.0)
+    parser.add_argument("--binary-mb", type=float, default=64.0)
+    parser.add_argument("--files", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        source = work / "dataset"
+        source.mkdir()
+        size = make_dataset(source, args.text_mb, args.binary_mb, args.files)
+        print(f"dataset: {size / 1e6:.1f} MB uncompressed")
+
+        for name in ("dataset.tar.gz", "dataset.zip"):
+            archive = work / name
+            pack(source, archive)
+            print(f"{name} ({archive.stat().st_size / 1e6:.1f} MB)")
+            scratch = work / f"extracted-{archive.suffix.lstrip('.')}"
+            extract_elapsed, extracted = _time(
+                "extract + scan",
+                lambda: _extract_then_scan(archive, scratch),
+                size,
+                size,
+            )
+            stream_elapsed, streamed = _time(
+                "stream", lambda: _scan(archive), size, 0
+            )
+            if streamed != extracted:
+                raise SystemExit(f"Findings differ for {name}")
+            print(f"  streaming is {extract_elapsed / stream_elapsed:.2f}x as fast")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Benchmark for the streaming canonical JSON encoder.
+
+Builds a `ComplianceReport` with `--findings` findings and times:
+
+* dumps: `json.dumps(report.dict(), ...)` then SHA-256 (the previous
+  `compute_report_hash`),
+* stream: `compute_report_hash`, which feeds SHA-256 while encoding,
+
+with the peak memory traced during each.
+
+`random_value` and `random_model` generate the values (nested dicts, lists
+and tuples of strings with escapes and non-ASCII characters, big ints,
+special floats, Pydantic models with extra fields, and invalid values) that
+tee_v1/tests/test_canonical_json.py checks the encoder on, byte for byte
+against `json.dumps`.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_canonical_json --findings 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ..crypto_utils import compute_report_hash
+from ..models import ComplianceFinding, ComplianceReport, FindingCount
+
+_ALPHABET = (
+    "abcXYZ019 _-.@/\\\"'\n\r\t\b\f\x00\x1f\x7f"
+    "\u00e9\u00fc\u2028\u2029\u4e2d\ufeff\ud800\U000103ff\U0001f600"
+)
+_FLOATS = (
+    0.0,
+    -0.0,
+    1.5,
+    -2.25,
+    1e300,
+    -1e-300,
+    5e-324,
+    0.1 + 0.2,
+    float("nan"),
+    float("inf"),
+    float("-inf"),
+)
+
+
+class _Inner(BaseModel):
+    name: str
+    weight: float = 1.0
+    tags: List[str] = []
+
+
+class _Outer(BaseModel):
+    class Config:
+        extra = "allow"
+
+    zeta: int
+    alpha: Optional[str] = None
+    inner: _Inner
+    items: List[_Inner] = []
+    meta: Dict[str, Any] = {}
+
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 12)))
+
+
+def _random_key(rng: random.Random) -> Any:
+    if rng.random() < 0.9:
+        return _random_text(rng)
+    return rng.choice([rng.randint(-5, 5), rng.choice(_FLOATS[:8]), True, None])
+
+
+def random_model(rng: random.Random, depth: int) -> BaseModel:
+    """
+    Return a random Pydantic model, with extra attributes half of the time.
+    """
+
+    def inner() -> _Inner:
+        return _Inner(
+            name=_random_text(rng),
+            weight=rng.choice(_FLOATS),
+            tags=[_random_text(rng) for _ in range(rng.randint(0, 3))],
+        )
+
+    model = _Outer(
+        zeta=rng.randint(-(10**20), 10**20),
+        alpha=rng.choice([None, _random_text(rng)]),
+        inner=inner(),
+        items=[inner() for _ in range(rng.randint(0, 3))],
+        meta={_random_text(rng): random_value(rng, depth + 1) for _ in range(2)},
+    )
+    if rng.random() < 0.5:
+        # Extra attributes, as the API attaches `weapon_flag`.
+        setattr(model, rng.choice(["weapon_flag", "Zz", "a"]), random_value(rng, 3))
+    return model
+
+
+def random_value(rng: random.Random, depth: int = 0) -> Any:
+    """
+    Return a random value, mostly JSON-serialisable, nested up to 4 levels.
+    """
+    roll = rng.random()
+    if depth >= 4 or roll < 0.35:
+        return rng.choice(
+            [
+                _random_text(rng),
+                rng.randint(-(2**70), 2**70),
+                rng.choice(_FLOATS),
+                rng.random() * 10 ** rng.randint(-8, 8),
+                True,
+                False,
+                None,
+            ]
+        )
+    if roll < 0.55:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    if roll < 0.6:
+        return tuple(random_value(rng, depth + 1) for _ in range(rng.randint(0, 3)))
+    if roll < 0.85:
+        keys = [_random_key(rng) for _ in range(rng.randint(0, 4))]
+        if rng.random() < 0.8:
+            keys = [str(key) for key in keys]
+        return {key: random_value(rng, depth + 1) for key in keys}
+    if roll < 0.98:
+        return random_model(rng, depth)
+    return rng.choice([{1, 2}, b"bytes", object(), {(1, 2): 3}])
+
+
+def make_report(findings: int, seed: int = 0) -> ComplianceReport:
+    """
+    Build a report with `findings` findings spread over 1000 files.
+    """
+    rng = random.Random(seed)
+    report = ComplianceReport(
+        datasetId="bench",
+        datasetMerkleRoot="0x" + "ab" * 32,
+        encryptedDataBlobId="bench",
+        policyVersion="v1",
+        modelVersion="v1",
+        verdict="BLOCK",
+        score=20,
+        findings=[
+            ComplianceFinding(
+                type=rng.choice(["EMAIL", "PHONE", "IBAN"]),
+                path=f"logs/part{index % 1000:04d}.csv#email:{index}",
+                detail=f"user{index}@example.com",
+            )
+            for index in range(findings)
+        ],
+        findingCounts=[
+            FindingCount(type="EMAIL", path=f"logs/part{index:04d}.csv", count=5)
+            for index in range(min(findings, 1000))
+        ],
+        findingsTotal=findings,
+    )
+    setattr(report, "weapon_flag", False)
+    setattr(report, "nautilus_like_report", {"summary": "bench", "score": 0.5})
+    return report
+
+
+def _dumps_hash(report: ComplianceReport) -> str:
+    data = json.dumps(report.dict(), sort_keys=True, separators=(",", ":"))
+    return "0x" + hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _time(label: str, run: Callable[[], str]) -> Tuple[float, str]:
+    started = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - started
+    # Peak memory is traced on a second run, as tracing slows the first.
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<8} {elapsed * 1e3:9.1f} ms {peak / 1e6:9.1f} MB peak")
+    return elapsed, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--findings", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = make_report(args.findings, args.seed)
+    print(f"report with {args.findings} findings:")
+    dumps_elapsed, expected = _time("dumps", lambda: _dumps_hash(report))
+    stream_elapsed, actual = _time("stream", lambda: compute_report_hash(report))
+    if actual != expected:
+        raise SystemExit(f"Report hashes differ: {actual} vs {expected}")
+    print(f"  streaming is {dumps_elapsed / stream_elapsed:.2f}x as fast")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Connection-reuse benchmark for the shared Claude client.
+
+Starts a local stub of the Messages API (HTTP/1.1 keep-alive) and sends the
+same number of `messages.create` calls through:
+
+* a fresh `AsyncAnthropic` + `httpx.AsyncClient` per call (the old path),
+* the process-wide `ClaudeClient`,
+
+then prints calls/sec and the TCP connections each path opened. No API key or
+network access is needed.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_claude_client --calls 200 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Awaitable, Callable, Set, Tuple
+
+import httpx
+from anthropic import AsyncAnthropic
+
+from ..claude_client import ClaudeClient
+
+_RESPONSE = json.dumps(
+    {
+        "id": "msg_stub",
+        "type": "message",
+        "role": "assistant",
+        "model": "stub",
+        "content": [{"type": "text", "text": "{}"}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    }
+).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StubServer"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.server.peers.add(self.client_address)
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(_RESPONSE)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local stub of the Messages API on a free port, recording the client
+    address of every request (one per TCP connection).
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.peers: Set[Tuple[str, int]] = set()
+
+
+async def _call(client: AsyncAnthropic) -> None:
+    await client.messages.create(
+        model="stub",
+        max_tokens=16,
+        messages=[{"role": "user", "content": "ping"}],
+    )
+
+
+async def _run(
+    calls: int, concurrency: int, one_call: Callable[[], Awaitable[None]]
+) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded() -> None:
+        async with semaphore:
+            await one_call()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(calls)))
+    return calls / (time.perf_counter() - started)
+
+
+async def _bench(base_url: str, server: StubServer, args: argparse.Namespace) -> None:
+    async def per_call() -> None:
+        http = httpx.AsyncClient(timeout=60)
+        async with AsyncAnthropic(
+            api_key="stub", base_url=base_url, http_client=http
+        ) as client:
+            await _call(client)
+
+    server.peers.clear()
+    fresh_rate = await _run(args.calls, args.concurrency, per_call)
+    fresh_connections = len(server.peers)
+
+    shared = ClaudeClient(args.concurrency, args.concurrency, 30.0, 60.0)
+    shared.start()
+    server.peers.clear()
+    try:
+        shared_rate = await _run(
+            args.calls, args.concurrency, lambda: _call(shared.client)
+        )
+    finally:
+        await shared.stop()
+    shared_connections = len(server.peers)
+
+    print(f"calls:              {args.calls} (concurrency {args.concurrency})")
+    print(
+        f"client per call:    {fresh_rate:8.1f} calls/s, "
+        f"{fresh_connections} connections"
+    )
+    print(
+        f"shared client:      {shared_rate:8.1f} calls/s, "
+        f"{shared_connections} connections"
+    )
+    print(f"shared metrics:     {shared.metrics.as_dict()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["ANTHROPIC_BASE_URL"] = base_url
+    os.environ.setdefault("ANTHROPIC_API_KEY", "stub")
+    try:
+        asyncio.run(_bench(base_url, server, args))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
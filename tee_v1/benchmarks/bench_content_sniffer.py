@@ -0,0 +1,108 @@
+"""
+Benchmark for content sniffing in the PII scanner.
+
+Builds a mixed dataset (plain text plus JPEG-, zip-, Parquet- and
+safetensors-like binaries of random bytes) and scans it:
+
+* as before, decoding every file as UTF-8 text,
+* with `_scan_file`, which sniffs each file and only decodes text,
+
+then prints the time and number of findings of each, and the bytes per
+content kind. The findings on the text files must be identical; every extra
+finding of the first pass comes from byte noise.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_content_sniffer --binary-mb 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from ..content_sniffer import ContentStats
+from ..pii_scanner import DEFAULT_ENGINE, _iter_text_segments, _scan_file
+from .bench_pii_scanner import make_corpus
+
+_BINARY_HEADERS = {
+    "photo.jpg": b"\xff\xd8\xff\xe0",
+    "weights.zip": b"PK\x03\x04",
+    "table.parquet": b"PAR1",
+    "model.safetensors": (64).to_bytes(8, "little") + b'{"__metadata__":{}}',
+}
+
+
+def make_dataset(root: Path, text_mb: float, binary_mb: float) -> None:
+    """
+    Write one text file of `text_mb` MB and binaries totalling `binary_mb` MB.
+    """
+    (root / "data.txt").write_text(make_corpus(text_mb), encoding="utf-8")
+    size = int(binary_mb * 1_000_000 / len(_BINARY_HEADERS))
+    for name, header in _BINARY_HEADERS.items():
+        (root / name).write_bytes(header + os.urandom(size))
+
+
+def _scan_as_text(path: Path) -> List[Tuple[str, str]]:
+    """
+    The pre-sniffing behaviour: decode the whole file as text.
+    """
+    with path.open("rb") as handle:
+        blocks = iter(lambda: handle.read(1 << 20), b"")
+        hits: List[List[str]] = [[] for _ in DEFAULT_ENGINE.detectors]
+        for buffer, start in _iter_text_segments(blocks):
+            for values, segment_values in zip(hits, DEFAULT_ENGINE.find(buffer, start)):
+                values.extend(segment_values)
+    return DEFAULT_ENGINE.flatten(hits)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--text-mb", type=float, default=8.0)
+    parser.add_argument("--binary-mb", type=float, default=64.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_dataset(root, args.text_mb, args.binary_mb)
+        paths = sorted(root.iterdir())
+
+        started = time.perf_counter()
+        as_text = [_scan_as_text(path) for path in paths]
+        text_elapsed = time.perf_counter() - started
+
+        stats = ContentStats()
+        started = time.perf_counter()
+        sniffed = []
+        for path in paths:
+            hits, _, _, size, kind = _scan_file(path)
+            stats.add(size, kind)
+            sniffed.append(hits)
+        sniff_elapsed = time.perf_counter() - started
+
+    text_index = [path.name for path in paths].index("data.txt")
+    if as_text[text_index] != [hit[:2] for hit in sniffed[text_index]]:
+        raise SystemExit("Findings on the text file differ")
+
+    print(
+        f"decode everything: {text_elapsed:6.2f} s, "
+        f"{sum(map(len, as_text))} findings"
+    )
+    print(
+        f"sniff first:       {sniff_elapsed:6.2f} s, "
+        f"{sum(map(len, sniffed))} findings "
+        f"({text_elapsed / sniff_elapsed:.1f}x faster)"
+    )
+    for kind, counters in stats.as_dict().items():
+        print(
+            f"  {kind:<10} {counters['files']:3d} files "
+            f"{counters['bytes'] / 1e6:8.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark for aggregated findings with capped examples.
+
+Writes a log in which every line holds an email address, then for each
+example cap times the scan plus building and serialising the report's
+findings, and records the peak traced memory and the JSON size:
+
+* cap 0: every match is kept and becomes a `ComplianceFinding`,
+* cap K: matches are only counted past the first K per type and file.
+
+The totals fed to `compute_verdict_and_score` must be identical.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_findings_cap --lines 1000000 --caps 0 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+from ..pii_scanner import (
+    build_report_findings,
+    compute_verdict_and_score,
+    scan_dataset_for_pii,
+)
+
+
+def make_log(path: Path, lines: int) -> None:
+    """
+    Write `lines` log lines, each with one email address.
+    """
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(lines):
+            handle.write(
+                f"2024-05-01T12:00:{index % 60:02d}Z INFO login ok"
+                f" user=user{index}@example.com session={index:08x}\n"
+            )
+
+
+def _run(root: Path, cap: int) -> int:
+    started = time.perf_counter()
+    tracemalloc.start()
+    files = scan_dataset_for_pii(root, max_examples=cap).files
+    findings, counts, total = build_report_findings(files)
+    body = json.dumps(
+        {
+            "findings": [finding.dict() for finding in findings],
+            "findingCounts": [count.dict() for count in counts],
+            "findingsTotal": total,
+        }
+    )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    elapsed = time.perf_counter() - started
+    verdict, _ = compute_verdict_and_score(total)
+    print(
+        f"cap {cap:<6} {elapsed:7.2f} s {peak / 1e6:9.1f} MB peak "
+        f"{len(body) / 1e3:10.1f} kB JSON {len(findings):9d} listed "
+        f"{total:9d} total {verdict}"
+    )
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--caps", type=int, nargs="+", default=[0, 10])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_log(root / "app.log", args.lines)
+        print(f"log: {(root / 'app.log').stat().st_size / 1e6:.1f} MB")
+        totals: List[int] = [_run(root, cap) for cap in args.caps]
+        if len(set(totals)) != 1:
+            raise SystemExit(f"Totals differ: {totals}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+CPU throughput benchmark for gun detection.
+
+Runs the detector over the same set of images twice: one `predict` call per
+image (`run_gun_detection`), then the batched path
+(`iter_gun_detection_batches`), and prints images/sec for each.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_gun_detection --images path/to/dir --count 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+from pathlib import Path
+from typing import List
+
+from ..weapon_and_claude import (
+    DETECTION_BATCH_SIZE,
+    IMAGE_EXTENSIONS,
+    iter_gun_detection_batches,
+    load_gun_detector,
+    run_gun_detection,
+)
+
+DEFAULT_IMAGES = Path(__file__).resolve().parents[2] / "tee_v0"
+
+
+def collect_images(root: Path, count: int) -> List[Path]:
+    found = sorted(
+        p
+        for p in root.rglob("*")
+        if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS
+    )
+    if not found:
+        raise SystemExit(f"No images found under {root}")
+    # Repeat the available images until `count` is reached.
+    return list(itertools.islice(itertools.cycle(found), count))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--images", type=Path, default=DEFAULT_IMAGES)
+    parser.add_argument("--count", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=DETECTION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if not load_gun_detector():
+        raise SystemExit("Gun detection model is not available (see GUN_MODEL_PATH)")
+
+    images = collect_images(args.images, args.count)
+
+    started = time.perf_counter()
+    for path in images:
+        run_gun_detection(path)
+    per_image = len(images) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in iter_gun_detection_batches(images, batch_size=args.batch_size):
+        pass
+    batched = len(images) / (time.perf_counter() - started)
+
+    print(f"images:    {len(images)}")
+    print(f"per-image: {per_image:8.1f} images/s")
+    print(f"batched:   {batched:8.1f} images/s (batch size {args.batch_size})")
+
+
+if __name__ == "__main__":
+    main()
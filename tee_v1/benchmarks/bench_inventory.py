@@ -0,0 +1,66 @@
+"""
+Directory-walk benchmark for the shared dataset inventory.
+
+Builds a synthetic tree of many small files and compares:
+
+* three independent `rglob("*")` + `is_file()` + `stat()` walks (one per
+  analysis stage, as before the inventory existed),
+* a single `build_inventory` walk.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_inventory --files 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from ..inventory import build_inventory
+
+
+def make_tree(root: Path, files: int, per_dir: int) -> None:
+    for index in range(files):
+        directory = root / f"d{index // per_dir:05d}"
+        if index % per_dir == 0:
+            directory.mkdir()
+        (directory / f"f{index:07d}.txt").write_bytes(b"x")
+
+
+def _rglob_walk(root: Path) -> int:
+    total = 0
+    for path in root.rglob("*"):
+        if path.is_file():
+            total += path.stat().st_size
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--per-dir", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_tree(root, args.files, args.per_dir)
+
+        started = time.perf_counter()
+        for _ in range(3):
+            _rglob_walk(root)
+        three_walks = time.perf_counter() - started
+
+        started = time.perf_counter()
+        inventory = build_inventory(root)
+        one_walk = time.perf_counter() - started
+
+    print(f"files:          {len(inventory.files)}")
+    print(f"3x rglob walks: {three_walks:8.2f} s")
+    print(f"inventory:      {one_walk:8.2f} s ({three_walks / one_walk:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
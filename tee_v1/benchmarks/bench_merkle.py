@@ -0,0 +1,84 @@
+"""
+Benchmark for building the dataset Merkle tree.
+
+Builds a dataset of text files, a CSV table and binary blobs, then times,
+serially and with `--workers` processes:
+
+* hashing: `hash_dataset`, the pass that hashes every file before the scan
+  so the root can be checked first,
+* scan: `scan_dataset_for_pii`, which hashes every file again in the same
+  read as it scans it,
+* tree: building the `MerkleTree` (leaves, levels and root) from the scan's
+  content digests, plus producing and checking every inclusion proof.
+
+All runs must agree on the root.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_merkle --text-mb 32 --binary-mb 64 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from ..inventory import build_inventory
+from ..merkle import MerkleTree, verify_inclusion
+from ..pii_scanner import hash_dataset, scan_dataset_for_pii
+from .bench_archive_scan import make_dataset
+
+
+def _report(label: str, elapsed: float, size: int) -> None:
+    print(f"{label:<22} {elapsed:7.2f} s {size / 1e6 / elapsed:8.1f} MB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--text-mb", type=float, default=16.0)
+    parser.add_argument("--binary-mb", type=float, default=64.0)
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        size = make_dataset(root, args.text_mb, args.binary_mb, args.files)
+        print(f"dataset: {size / 1e6:.1f} MB in {args.files * 2 + 1} files")
+
+        inventory = build_inventory(root)
+        roots = set()
+        for workers in sorted({1, args.workers}):
+            started = time.perf_counter()
+            roots.add(MerkleTree(hash_dataset(inventory, workers)).root)
+            _report(f"hash, {workers} worker(s)", time.perf_counter() - started, size)
+
+            started = time.perf_counter()
+            scan = scan_dataset_for_pii(root, workers=workers)
+            _report(f"scan, {workers} worker(s)", time.perf_counter() - started, size)
+
+            started = time.perf_counter()
+            tree = MerkleTree(scan.digests)
+            built = time.perf_counter() - started
+            for path, digest in tree.digests.items():
+                proof = tree.proof(path)
+                if proof is None or not verify_inclusion(
+                    path, digest, proof, tree.root
+                ):
+                    raise SystemExit(f"Invalid proof for {path}")
+            proved = time.perf_counter() - started - built
+            print(
+                f"{'tree from digests':<22} {built * 1e3:7.2f} ms, "
+                f"{len(tree.paths)} proofs in {proved * 1e3:.2f} ms"
+            )
+            roots.add(tree.root)
+
+        if len(roots) != 1:
+            raise SystemExit(f"Roots differ: {sorted(roots)}")
+        print(f"root: {roots.pop()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Parity and latency check of the ONNX Runtime gun detector against ultralytics.
+
+Loads the train18 weights through both backends, runs them over the same
+images and reports:
+
+* per-image max-confidence agreement (absolute difference and whether the
+  `> 0.5` weapon decision matches),
+* mean per-image latency of each backend.
+
+Export the ONNX model first, e.g. `yolo export model=.../best.pt format=onnx`.
+
+The same parity check runs under pytest (tee_v1/tests/test_onnx_detector.py)
+when the weights, their export and ultralytics are installed.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_onnx_detector --images path/to/dir --count 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from PIL import Image
+
+from ..config import get_gun_detector_onnx_path
+from ..onnx_detector import OnnxGunDetector
+from ..weapon_and_claude import decode_image, load_yolo_model, max_confidence
+from .bench_gun_detection import DEFAULT_IMAGES, collect_images
+
+
+def _timed(
+    fn: Callable[[Image.Image], float], images: List[Image.Image]
+) -> Tuple[List[float], float]:
+    fn(images[0])  # warm-up
+    started = time.perf_counter()
+    scores = [fn(image) for image in images]
+    return scores, (time.perf_counter() - started) / len(images)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--images", type=Path, default=DEFAULT_IMAGES)
+    parser.add_argument("--count", type=int, default=32)
+    parser.add_argument("--onnx", type=Path, default=get_gun_detector_onnx_path())
+    parser.add_argument("--tolerance", type=float, default=0.05)
+    args = parser.parse_args()
+
+    yolo = load_yolo_model()
+    if yolo is None:
+        raise SystemExit("ultralytics model is not available (see GUN_MODEL_PATH)")
+    if not args.onnx.exists():
+        raise SystemExit(f"ONNX model not found: {args.onnx}")
+    onnx_detector = OnnxGunDetector(args.onnx)
+
+    images = [
+        image
+        for image in map(decode_image, collect_images(args.images, args.count))
+        if image is not None
+    ]
+
+    def run_ultralytics(image: Image.Image) -> float:
+        results = yolo.predict(source=image, imgsz=640, verbose=False)
+        return max((max_confidence(r) for r in results), default=0.0)
+
+    def run_onnx(image: Image.Image) -> float:
+        return onnx_detector.max_confidences([image])[0]
+
+    reference, reference_latency = _timed(run_ultralytics, images)
+    candidate, candidate_latency = _timed(run_onnx, images)
+
+    diffs = [abs(a - b) for a, b in zip(reference, candidate)]
+    flips = sum((a > 0.5) != (b > 0.5) for a, b in zip(reference, candidate))
+    print(f"images:          {len(images)}")
+    print(f"max |conf diff|: {max(diffs):.4f}")
+    print(f"decision flips:  {flips}")
+    print(f"ultralytics:     {reference_latency * 1000:8.1f} ms/image")
+    print(f"onnxruntime:     {candidate_latency * 1000:8.1f} ms/image")
+
+    if flips or max(diffs) > args.tolerance:
+        raise SystemExit("ONNX backend does not match ultralytics")
+
+
+if __name__ == "__main__":
+    main()
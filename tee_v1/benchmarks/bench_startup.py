@@ -0,0 +1,66 @@
+"""
+Startup-time benchmark for the FastAPI app.
+
+In a fresh interpreter per run, measures:
+
+* `import`: time to import `tee_v1.main` (what uvicorn waits for before it
+  can answer `/health`),
+* `warm-up`: time for `load_gun_detector()` to load the model afterwards
+  (what `/ready` waits for).
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_startup --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+_PROBE = """
+import json, time
+started = time.perf_counter()
+import tee_v1.main
+imported = time.perf_counter()
+from tee_v1.weapon_and_claude import load_gun_detector
+load_gun_detector()
+warmed = time.perf_counter()
+print(json.dumps({"import": imported - started, "warm-up": warmed - imported}))
+"""
+
+
+def _probe() -> Dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=_REPO_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runs: Dict[str, List[float]] = {"import": [], "warm-up": []}
+    for _ in range(args.repeat):
+        for name, seconds in _probe().items():
+            runs[name].append(seconds)
+
+    for name, samples in runs.items():
+        print(f"{name:8s} median {statistics.median(samples) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark for the streamed analysis (`POST /analyze-dataset/stream`).
+
+Builds a dataset of `--files` text files holding PII, then drives the ASGI
+app in process, without the report cache, the findings index or the Claude
+call, and times:
+
+* /analyze-dataset: the time until the whole JSON response is received,
+* /analyze-dataset/stream: the time until the first finding line and until
+  the last (result) line.
+
+The findings of the stream, stable-sorted by `order` and put back into the
+result's report, must hash to the signed `payload.reportHash` and equal the
+report of /analyze-dataset.
+
+Usage:
+
+    python -m tee_v1.benchmarks.bench_stream_analyze --files 64 --mb 32 --workers 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .bench_pii_scanner import make_corpus
+
+
+def make_dataset(root: Path, files: int, size_mb: float) -> None:
+    """
+    Write `files` text files totalling about `size_mb` MB under `root`.
+    """
+    corpus = make_corpus(size_mb / files)
+    for index in range(files):
+        (root / f"part{index:04d}.csv").write_text(corpus, encoding="utf-8")
+
+
+async def _post(
+    app: Any, path: str, body: Dict[str, Any]
+) -> Tuple[float, Optional[float], bytes]:
+    """
+    POST `body` to `path` and return the seconds until the whole response,
+    the seconds until the first finding line (streamed responses only), and
+    the response body.
+    """
+    payload = json.dumps(body).encode("utf-8")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 80),
+    }
+    chunks: List[bytes] = []
+    first: Optional[float] = None
+    sent = False
+    started = time.perf_counter()
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal first
+        if message["type"] != "http.response.body":
+            return
+        chunk = message.get("body", b"")
+        chunks.append(chunk)
+        if first is None and chunk.startswith(b'{"type":"finding"'):
+            first = time.perf_counter() - started
+
+    await app(scope, receive, send)
+    return time.perf_counter() - started, first, b"".join(chunks)
+
+
+def _rebuild(lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Rebuild the /analyze-dataset response from the lines of a stream.
+    """
+    result = lines[-1]
+    if result["type"] != "result":
+        raise SystemExit(f"Stream ended with {result}")
+    findings = sorted(
+        (line for line in lines if line["type"] == "finding"),
+        key=lambda line: line["order"],
+    )
+    response = {key: value for key, value in result.items() if key != "type"}
+    response["report"]["findings"] = [line["finding"] for line in findings]
+    return response
+
+
+async def _bench(root: Path, dataset_root: str) -> None:
+    from ..crypto_utils import compute_report_hash
+    from ..main import app
+    from ..models import ComplianceReport
+
+    body = {
+        "datasetId": "bench",
+        "datasetMerkleRoot": dataset_root,
+        "encryptedDataBlobId": root.name,
+        "policyVersion": "v1",
+        "modelVersion": "v1",
+    }
+    async with app.router.lifespan_context(app):
+        full, _, data = await _post(app, "/analyze-dataset", body)
+        expected = json.loads(data)
+        print(f"{'/analyze-dataset':<24} response   {full * 1e3:9.1f} ms")
+
+        total, first, data = await _post(app, "/analyze-dataset/stream", body)
+        lines = [json.loads(line) for line in data.splitlines()]
+        if first is None:
+            raise SystemExit("The stream listed no findings")
+        print(f"{'/analyze-dataset/stream':<24} 1st finding {first * 1e3:8.1f} ms")
+        print(f"{'':<24} result     {total * 1e3:9.1f} ms")
+
+    response = _rebuild(lines)
+    report = ComplianceReport(**response["report"])
+    for key, value in expected["report"].items():
+        if key not in ComplianceReport.__fields__:
+            setattr(report, key, value)
+    if compute_report_hash(report) != response["payload"]["reportHash"]:
+        raise SystemExit("The streamed findings do not match the signed reportHash")
+    if response["report"] != expected["report"]:
+        raise SystemExit("The streamed report differs from /analyze-dataset's")
+    print(
+        f"{len(lines) - 1} findings streamed; report hash and contents match"
+        f" ({full / first:.1f}x earlier first finding)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=32)
+    parser.add_argument("--mb", type=float, default=16.0)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "dataset"
+        root.mkdir()
+        make_dataset(root, args.files, args.mb)
+        print(f"dataset: {args.mb:.1f} MB in {args.files} files")
+
+        # Configure the service before it is imported: measure the scan, not
+        # the caches or the Claude API.
+        os.environ.update(
+            DEV_DATASET_BASE_PATH=tmp,
+            REPORT_CACHE_DIR=str(Path(tmp) / "cache"),
+            REPORT_CACHE_MAX_BYTES="0",
+            PII_INDEX_PATH="",
+            PII_SCAN_WORKERS=str(args.workers),
+            GUN_DETECTOR_WARMUP="0",
+        )
+        os.environ.pop("ANTHROPIC_API_KEY", None)
+
+        from ..merkle import MerkleTree
+        from ..pii_scanner import scan_dataset_for_pii
+
+        dataset_root = MerkleTree(scan_dataset_for_pii(root).digests).root
+        asyncio.run(_bench(root, dataset_root))
+
+
+if __name__ == "__main__":
+    main()
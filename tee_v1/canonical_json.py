@@ -0,0 +1,184 @@
+"""
+Streaming canonical JSON encoder.
+
+The canonical encoding of the enclave is
+`json.dumps(obj, sort_keys=True, separators=(",", ":"))` over the `.dict()`
+of a Pydantic model. Building it that way materializes the whole nested dict
+and then the whole JSON string, which on reports with tens of thousands of
+findings dominates the response time and memory.
+
+`write_canonical_json` produces exactly the same bytes, but in chunks of
+about `CHUNK_CHARS` characters handed to a sink as they are produced (e.g.
+`hashlib.sha256().update`, or `bytearray.extend`), so neither the dict nor
+the full string is ever built:
+
+* Pydantic models are walked through their field values, as `.dict()` would
+  copy them. Models that exclude fields or use enum values fall back to
+  `.dict()`.
+* The sorted keys of each model class are resolved once and their encoded
+  `"key":` prefixes are reused for every instance.
+* Strings are escaped by the `json` module's own (C) ASCII escaper, and
+  numbers use `int` / `float` repr with `NaN` / `Infinity`, as `json` does.
+
+Like `json.dumps`, the encoder raises TypeError on values it can not encode
+and on non-string keys that JSON can not represent.
+"""
+
+from __future__ import annotations
+
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+# Number of encoded characters buffered before they are handed to the sink.
+CHUNK_CHARS = 1 << 16
+
+_INFINITY = float("inf")
+
+# (sorted keys, '{"key":' / ',"key":' prefixes) per model class and field set.
+_Template = Tuple[Tuple[str, ...], Tuple[str, ...]]
+_TEMPLATES: Dict[Tuple[type, Tuple[str, ...]], _Template] = {}
+
+
+def _float_repr(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == _INFINITY:
+        return "Infinity"
+    if value == -_INFINITY:
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _key_repr(key: Any) -> str:
+    # Same conversions, in the same order, as `json.dumps`.
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _float_repr(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+    )
+
+
+def _template(model: BaseModel, keys: Tuple[str, ...]) -> _Template:
+    cache_key = (type(model), keys)
+    template = _TEMPLATES.get(cache_key)
+    if template is None:
+        ordered = tuple(sorted(keys))
+        prefixes = tuple(
+            ("{" if index == 0 else ",") + encode_basestring_ascii(key) + ":"
+            for index, key in enumerate(ordered)
+        )
+        template = _TEMPLATES[cache_key] = (ordered, prefixes)
+    return template
+
+
+def _walks_fields(model: BaseModel) -> bool:
+    # `.dict()` returns the field values as stored unless the model excludes
+    # fields or replaces enums with their values.
+    return model.__exclude_fields__ is None and not model.__config__.use_enum_values
+
+
+class _Encoder:
+    __slots__ = ("_parts", "_size", "_sink")
+
+    def __init__(self, sink: Callable[[bytes], Any]) -> None:
+        self._parts: List[str] = []
+        self._size = 0
+        self._sink = sink
+
+    def _emit(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= CHUNK_CHARS:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            # Output is pure ASCII: every non-ASCII character is escaped.
+            self._sink("".join(self._parts).encode("ascii"))
+            self._parts.clear()
+            self._size = 0
+
+    def encode(self, value: Any) -> None:
+        if isinstance(value, str):
+            self._emit(encode_basestring_ascii(value))
+        elif value is None:
+            self._emit("null")
+        elif value is True:
+            self._emit("true")
+        elif value is False:
+            self._emit("false")
+        elif isinstance(value, int):
+            self._emit(int.__repr__(value))
+        elif isinstance(value, float):
+            self._emit(_float_repr(value))
+        elif isinstance(value, (list, tuple)):
+            self._encode_list(value)
+        elif isinstance(value, dict):
+            self._encode_dict(value)
+        elif isinstance(value, BaseModel):
+            self._encode_model(value)
+        else:
+            raise TypeError(
+                f"Object of type {type(value).__name__} is not JSON serializable"
+            )
+
+    def _encode_list(self, values: Any) -> None:
+        if not values:
+            self._emit("[]")
+            return
+        separator = "["
+        for item in values:
+            self._emit(separator)
+            self.encode(item)
+            separator = ","
+        self._emit("]")
+
+    def _encode_dict(self, mapping: Dict[Any, Any]) -> None:
+        if not mapping:
+            self._emit("{}")
+            return
+        separator = "{"
+        for key, item in sorted(mapping.items(), key=lambda pair: pair[0]):
+            self._emit(separator + encode_basestring_ascii(_key_repr(key)) + ":")
+            self.encode(item)
+            separator = ","
+        self._emit("}")
+
+    def _encode_model(self, model: BaseModel) -> None:
+        if not _walks_fields(model):
+            self._encode_dict(model.dict())
+            return
+        values = model.__dict__
+        if not values:
+            self._emit("{}")
+            return
+        keys, prefixes = _template(model, tuple(values))
+        for key, prefix in zip(keys, prefixes):
+            self._emit(prefix)
+            self.encode(values[key])
+        self._emit("}")
+
+
+def write_canonical_json(obj: Any, sink: Callable[[bytes], Any]) -> None:
+    """
+    Encode `obj` as canonical JSON, passing the bytes to `sink` in chunks.
+
+    The concatenated chunks equal
+    `json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")`,
+    with Pydantic models (at any depth) encoded as their `.dict()`.
+    """
+    encoder = _Encoder(sink)
+    encoder.encode(obj)
+    encoder.flush()
@@ -0,0 +1,109 @@
+"""
+Process-wide async Anthropic client.
+
+One `AsyncAnthropic` instance, backed by one pooled `httpx.AsyncClient`, is
+shared by every request so that keep-alive connections and TLS sessions are
+reused instead of being rebuilt (and leaked) per call:
+
+* `start()` creates the client (called from the app lifespan) and `stop()`
+  closes its connection pool.
+* Pool limits and timeouts come from `config` (`CLAUDE_MAX_CONNECTIONS`,
+  `CLAUDE_MAX_KEEPALIVE_CONNECTIONS`, `CLAUDE_KEEPALIVE_EXPIRY`,
+  `CLAUDE_TIMEOUT`).
+* `metrics` counts requests sent, TCP connections opened and TLS handshakes,
+  from httpcore's trace events; requests minus connections is the number of
+  requests served on a reused connection.
+
+The endpoint honours `ANTHROPIC_BASE_URL`, so the client can be pointed at a
+local stub server.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import httpx
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+
+
+@dataclass
+class ConnectionMetrics:
+    requests: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+
+    @property
+    def reused_requests(self) -> int:
+        return max(0, self.requests - self.connections_opened)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {**asdict(self), "reused_requests": self.reused_requests}
+
+
+class ClaudeClient:
+    """
+    Owner of the shared `AsyncAnthropic` client and its connection pool.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        timeout: float,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = timeout
+        self._http: Optional[httpx.AsyncClient] = None
+        self._client: Optional[AsyncAnthropic] = None
+        self.metrics = ConnectionMetrics()
+
+    def start(self) -> None:
+        """
+        Create the pooled client. Without ANTHROPIC_API_KEY nothing is created
+        and `client` raises on use.
+        """
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key or self._client is not None:
+            return
+        from anthropic import AsyncAnthropic
+
+        self._http = httpx.AsyncClient(
+            limits=self._limits,
+            timeout=self._timeout,
+            event_hooks={"request": [self._attach_trace]},
+        )
+        self._client = AsyncAnthropic(api_key=api_key, http_client=self._http)
+
+    async def stop(self) -> None:
+        """
+        Close the connection pool.
+        """
+        client, self._client, self._http = self._client, None, None
+        if client is not None:
+            await client.close()
+
+    @property
+    def client(self) -> AsyncAnthropic:
+        if self._client is None:
+            raise RuntimeError("ANTHROPIC_API_KEY environment variable is not set")
+        return self._client
+
+    async def _attach_trace(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            self.metrics.connections_opened += 1
+        elif event == "connection.start_tls.complete":
+            self.metrics.tls_handshakes += 1
+        elif event.endswith(".send_request_headers.started"):
+            self.metrics.requests += 1
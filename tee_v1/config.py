@@ -8,8 +8,12 @@ environment variable.
 
 from __future__ import annotations
 
+import json
 import os
 from pathlib import Path
+from typing import Optional, Tuple
+
+from .archive_reader import ARCHIVE_SUFFIXES
 
 # Resolve the repository root as the parent of this package.
 _REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -33,14 +37,23 @@ def get_dataset_base_path() -> Path:
 
 def resolve_dataset_path(encrypted_data_blob_id: str) -> Path:
     """
-    Map an `encryptedDataBlobId` string to a local dataset directory.
+    Map an `encryptedDataBlobId` string to a local dataset directory or
+    archive.
 
     In the real system this would perform Walrus blob decryption. For local
-    development, we simply treat the blob ID as a folder path relative to the
-    configured base dataset directory.
+    development, we simply treat the blob ID as a path relative to the
+    configured base dataset directory: a folder, or a `.zip` / `.tar(.gz)`
+    bundle that is read without extraction. If nothing exists at that path,
+    the blob ID plus each of the `ARCHIVE_SUFFIXES` is tried in turn.
     """
     base = get_dataset_base_path()
     dataset_path = (base / encrypted_data_blob_id).resolve()
+    if not dataset_path.exists():
+        for suffix in ARCHIVE_SUFFIXES:
+            candidate = dataset_path.with_name(dataset_path.name + suffix)
+            if candidate.is_file():
+                dataset_path = candidate
+                break
 
     # Basic safety: ensure we do not escape the base directory via "..".
     try:
@@ -53,3 +66,295 @@ def resolve_dataset_path(encrypted_data_blob_id: str) -> Path:
     return dataset_path
 
 
+def get_pii_scan_workers() -> int:
+    """
+    Return the number of worker processes used to scan a dataset for PII.
+
+    Read from the `PII_SCAN_WORKERS` environment variable. `1` (the default)
+    scans in-process; `0` or `auto` uses one worker per CPU core.
+    """
+    raw = os.getenv("PII_SCAN_WORKERS", "1").strip().lower()
+    if raw in {"0", "auto"}:
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid PII_SCAN_WORKERS value: {raw!r}") from exc
+
+
+def get_table_sample_rows() -> int:
+    """
+    Return how many rows of each table (CSV, JSONL, Parquet) the PII scan
+    samples.
+
+    Read from `TABLE_SAMPLE_ROWS`; `0` (the default) scans every row.
+    """
+    raw = os.getenv("TABLE_SAMPLE_ROWS", "0").strip()
+    try:
+        return max(0, int(raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid TABLE_SAMPLE_ROWS value: {raw!r}") from exc
+
+
+def get_findings_max_examples() -> int:
+    """
+    Return how many example findings of each type per file the report lists.
+
+    Read from `FINDINGS_MAX_EXAMPLES`, default 10; `0` lists every finding.
+    Findings beyond the cap are still counted in the report.
+    """
+    raw = os.getenv("FINDINGS_MAX_EXAMPLES", "10").strip()
+    try:
+        return max(0, int(raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid FINDINGS_MAX_EXAMPLES value: {raw!r}") from exc
+
+
+def get_report_cache_dir() -> Path:
+    """
+    Return the directory holding cached compliance reports.
+
+    Overridable with `REPORT_CACHE_DIR`; defaults to `<repo_root>/.cache/reports`.
+    """
+    override = os.getenv("REPORT_CACHE_DIR")
+    if override:
+        return Path(override).expanduser().resolve()
+    return _REPO_ROOT / ".cache" / "reports"
+
+
+def get_report_cache_max_bytes() -> int:
+    """
+    Return the size budget of the report cache in bytes.
+
+    Read from `REPORT_CACHE_MAX_BYTES` (default 256 MiB). `0` disables caching.
+    """
+    raw = os.getenv("REPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+    try:
+        return max(0, int(raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid REPORT_CACHE_MAX_BYTES value: {raw!r}") from exc
+
+
+def get_pii_index_path() -> Optional[Path]:
+    """
+    Return the path of the per-file PII findings index, or None if disabled.
+
+    Overridable with `PII_INDEX_PATH`; set it to an empty string to disable
+    incremental rescanning. Defaults to `<repo_root>/.cache/pii_index.sqlite3`.
+    """
+    override = os.getenv("PII_INDEX_PATH")
+    if override is None:
+        return _REPO_ROOT / ".cache" / "pii_index.sqlite3"
+    if not override.strip():
+        return None
+    return Path(override).expanduser().resolve()
+
+
+def get_job_workers() -> int:
+    """
+    Return how many analysis jobs run concurrently (`JOB_WORKERS`, default 2).
+    """
+    return _get_positive_int("JOB_WORKERS", 2)
+
+
+def get_job_queue_depth() -> int:
+    """
+    Return how many jobs may wait in the queue (`JOB_QUEUE_DEPTH`, default 16).
+    """
+    return _get_positive_int("JOB_QUEUE_DEPTH", 16)
+
+
+def get_batch_concurrency() -> int:
+    """
+    Return how many datasets of one /analyze-datasets batch are analysed
+    concurrently (`BATCH_CONCURRENCY`, default 4).
+    """
+    return _get_positive_int("BATCH_CONCURRENCY", 4)
+
+
+def get_batch_max_datasets() -> int:
+    """
+    Return how many datasets one /analyze-datasets request may hold
+    (`BATCH_MAX_DATASETS`, default 64).
+    """
+    return _get_positive_int("BATCH_MAX_DATASETS", 64)
+
+
+def _get_positive_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid {name} value: {raw!r}") from exc
+
+
+def get_weapon_sample_size(policy_version: str) -> int:
+    """
+    Return how many images to sample for gun detection under a policy.
+
+    `WEAPON_SAMPLE_SIZES` may hold a JSON object mapping policy versions to
+    sample sizes, e.g. `{"v2": 200}`. Policies not listed there use
+    `WEAPON_SAMPLE_SIZE` (default 1). Every size is at least 1; a value that
+    does not parse as an integer (or a map that does not parse as a JSON
+    object) is ignored in favour of the default.
+    """
+    default = 1
+    try:
+        default = max(1, int(os.getenv("WEAPON_SAMPLE_SIZE", "1")))
+    except ValueError:
+        pass
+    raw = os.getenv("WEAPON_SAMPLE_SIZES")
+    if not raw:
+        return default
+    try:
+        per_policy = json.loads(raw)
+        return max(1, int(per_policy[policy_version]))
+    except (ValueError, TypeError, KeyError, IndexError):
+        return default
+
+
+GUN_DETECTOR_BACKENDS = ("ultralytics", "onnx")
+
+
+def get_gun_detector_backend() -> str:
+    """
+    Return the gun detection backend: `ultralytics` (default) or `onnx`.
+
+    Read from `GUN_DETECTOR_BACKEND`. The ONNX backend runs an exported model
+    on ONNX Runtime's CPU provider, without PyTorch.
+    """
+    raw = os.getenv("GUN_DETECTOR_BACKEND", "ultralytics").strip().lower()
+    if raw not in GUN_DETECTOR_BACKENDS:
+        raise ValueError(f"Invalid GUN_DETECTOR_BACKEND value: {raw!r}")
+    return raw
+
+
+def get_gun_detector_onnx_path() -> Path:
+    """
+    Return the path of the exported ONNX gun detection model.
+
+    Overridable with `GUN_DETECTOR_ONNX_PATH`; defaults to `best.onnx` next to
+    the train18 weights, which is where `yolo export format=onnx` writes it.
+    """
+    override = os.getenv("GUN_DETECTOR_ONNX_PATH")
+    if override:
+        return Path(override).expanduser().resolve()
+    return (
+        _REPO_ROOT
+        / "tee_v0"
+        / "Guns-Detection-YOLOv8-main"
+        / "runs"
+        / "detect"
+        / "train18"
+        / "weights"
+        / "best.onnx"
+    )
+
+
+def get_gun_detector_warmup() -> bool:
+    """
+    Return whether the gun detector is loaded in the background at startup.
+
+    Read from `GUN_DETECTOR_WARMUP` (default on). When off, the model is
+    loaded by the first request that needs it.
+    """
+    raw = os.getenv("GUN_DETECTOR_WARMUP", "1").strip().lower()
+    if raw in {"1", "true", "yes", "on"}:
+        return True
+    if raw in {"0", "false", "no", "off"}:
+        return False
+    raise ValueError(f"Invalid GUN_DETECTOR_WARMUP value: {raw!r}")
+
+
+def get_verify_dataset_merkle_root() -> bool:
+    """
+    Return whether datasets whose contents do not match the request's
+    `datasetMerkleRoot` are rejected.
+
+    Read from `VERIFY_DATASET_MERKLE_ROOT` (default on). The root must be
+    built over the file contents as described in `merkle`, not the
+    backend's manifest root. When off, datasets are analysed whatever root
+    the request carries.
+    """
+    raw = os.getenv("VERIFY_DATASET_MERKLE_ROOT", "1").strip().lower()
+    if raw in {"1", "true", "yes", "on"}:
+        return True
+    if raw in {"0", "false", "no", "off"}:
+        return False
+    raise ValueError(f"Invalid VERIFY_DATASET_MERKLE_ROOT value: {raw!r}")
+
+
+def get_verdict_cache_path() -> Optional[Path]:
+    """
+    Return the path of the per-image verdict cache, or None if disabled.
+
+    Overridable with `VERDICT_CACHE_PATH`; set it to an empty string to
+    disable. Defaults to `<repo_root>/.cache/verdicts.sqlite3`.
+    """
+    override = os.getenv("VERDICT_CACHE_PATH")
+    if override is None:
+        return _REPO_ROOT / ".cache" / "verdicts.sqlite3"
+    if not override.strip():
+        return None
+    return Path(override).expanduser().resolve()
+
+
+def get_verdict_cache_max_entries() -> int:
+    """
+    Return how many images the verdict cache remembers
+    (`VERDICT_CACHE_MAX_ENTRIES`, default 10000).
+    """
+    return _get_positive_int("VERDICT_CACHE_MAX_ENTRIES", 10000)
+
+
+def get_verdict_cache_max_distance() -> int:
+    """
+    Return the Hamming distance (out of 64 bits) up to which two perceptual
+    hashes are considered the same image.
+
+    Read from `VERDICT_CACHE_MAX_DISTANCE` (default 4). `0` still matches
+    re-encodes that hash identically; lower values are stricter.
+    """
+    raw = os.getenv("VERDICT_CACHE_MAX_DISTANCE", "4")
+    try:
+        return max(0, int(raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid VERDICT_CACHE_MAX_DISTANCE value: {raw!r}") from exc
+
+
+def get_claude_pool_limits() -> Tuple[int, int, float]:
+    """
+    Return `(max_connections, max_keepalive_connections, keepalive_expiry)`
+    for the shared Claude client.
+
+    Read from `CLAUDE_MAX_CONNECTIONS` (default 10),
+    `CLAUDE_MAX_KEEPALIVE_CONNECTIONS` (default 10) and
+    `CLAUDE_KEEPALIVE_EXPIRY` in seconds (default 30).
+    """
+    return (
+        _get_positive_int("CLAUDE_MAX_CONNECTIONS", 10),
+        _get_positive_int("CLAUDE_MAX_KEEPALIVE_CONNECTIONS", 10),
+        _get_positive_float("CLAUDE_KEEPALIVE_EXPIRY", 30.0),
+    )
+
+
+def get_claude_timeout() -> float:
+    """
+    Return the Claude request timeout in seconds (`CLAUDE_TIMEOUT`, default 60).
+    """
+    return _get_positive_float("CLAUDE_TIMEOUT", 60.0)
+
+
+def _get_positive_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        value = float(raw)
+    except ValueError as exc:
+        raise ValueError(f"Invalid {name} value: {raw!r}") from exc
+    if value <= 0:
+        raise ValueError(f"Invalid {name} value: {raw!r}")
+    return value
@@ -0,0 +1,212 @@
+"""
+Content sniffing for dataset files.
+
+Decoding every file as UTF-8 and running the PII regexes over it wastes CPU
+on images, archives and model weights, and turns their byte noise into false
+hits. `sniff_content` looks at the first block of a file and assigns it one
+of the content kinds below:
+
+* `image`, `structured` (columnar / database formats) and `archive` are
+  recognised by their magic bytes,
+* `binary` is anything else with NUL bytes, a high share of control bytes,
+  or (for non-UTF-8 data) near-random byte entropy,
+* `text` is what remains, and is the only kind the text scanner reads.
+
+Magic bytes are only trusted when the file suffix agrees with them (or is
+not one of `SUFFIX_KINDS`). A file whose suffix names another kind, such as
+JPEG magic on a `.csv`, would otherwise be skipped both by the text scanner
+and by the stages that pick files by suffix, so it is classified as text
+and scanned instead.
+
+`unreadable` is never sniffed: the scanner assigns it to files (and archive
+members) that could not be read at all.
+
+`ContentStats` keeps per-kind file and byte counters.
+"""
+
+from __future__ import annotations
+
+import codecs
+import math
+import threading
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+TEXT = "text"
+STRUCTURED = "structured"
+IMAGE = "image"
+ARCHIVE = "archive"
+BINARY = "binary"
+UNREADABLE = "unreadable"
+
+CONTENT_KINDS: Tuple[str, ...] = (
+    TEXT,
+    STRUCTURED,
+    IMAGE,
+    ARCHIVE,
+    BINARY,
+    UNREADABLE,
+)
+
+# Bump whenever the classification rules change: stored findings of files
+# classified by older rules must not be reused.
+SNIFFER_VERSION = 2
+
+# Only this many leading bytes are inspected.
+SNIFF_BYTES = 8192
+
+# (offset, magic bytes, kind), checked in order.
+_MAGIC: Tuple[Tuple[int, bytes, str], ...] = (
+    (0, b"\xff\xd8\xff", IMAGE),  # JPEG
+    (0, b"\x89PNG\r\n\x1a\n", IMAGE),
+    (0, b"GIF87a", IMAGE),
+    (0, b"GIF89a", IMAGE),
+    (8, b"WEBP", IMAGE),  # RIFF container
+    (0, b"II*\x00", IMAGE),  # TIFF
+    (0, b"MM\x00*", IMAGE),
+    (0, b"PAR1", STRUCTURED),  # Parquet
+    (0, b"SQLite format 3\x00", STRUCTURED),
+    (0, b"ARROW1", STRUCTURED),
+    (0, b"Obj\x01", STRUCTURED),  # Avro
+    (0, b"\x89HDF\r\n\x1a\n", STRUCTURED),
+    (0, b"\x93NUMPY", STRUCTURED),
+    (0, b"PK\x03\x04", ARCHIVE),  # zip (also .pt / .npz / .xlsx)
+    (0, b"PK\x05\x06", ARCHIVE),  # empty zip
+    (0, b"\x1f\x8b", ARCHIVE),  # gzip
+    (0, b"\xfd7zXZ\x00", ARCHIVE),
+    (0, b"(\xb5/\xfd", ARCHIVE),  # zstd
+    (0, b"7z\xbc\xaf'\x1c", ARCHIVE),
+    (257, b"ustar", ARCHIVE),  # tar
+    (0, b"\x7fELF", BINARY),
+    (0, b"%PDF-", BINARY),
+)
+
+# Content kind each well-known file suffix implies.
+SUFFIX_KINDS: Dict[str, str] = {
+    **dict.fromkeys(
+        (".txt", ".csv", ".tsv", ".json", ".jsonl", ".ndjson", ".md", ".log"), TEXT
+    ),
+    **dict.fromkeys((".xml", ".html", ".htm", ".yaml", ".yml"), TEXT),
+    **dict.fromkeys(
+        (".png", ".jpg", ".jpeg", ".gif", ".webp", ".tif", ".tiff", ".bmp"), IMAGE
+    ),
+    **dict.fromkeys(
+        (".parquet", ".sqlite", ".sqlite3", ".db", ".arrow", ".feather"), STRUCTURED
+    ),
+    **dict.fromkeys((".avro", ".h5", ".hdf5", ".npy"), STRUCTURED),
+    **dict.fromkeys(
+        (".zip", ".gz", ".tgz", ".xz", ".txz", ".zst", ".7z", ".tar"), ARCHIVE
+    ),
+    ".pdf": BINARY,
+    ".safetensors": BINARY,
+}
+
+_BMP_HEADER_SIZES = {
+    size.to_bytes(4, "little") for size in (12, 40, 52, 56, 64, 108, 124)
+}
+
+# Bytes that may appear in text: printable ASCII, common whitespace and
+# anything >= 0x80 (UTF-8 sequences). Deleting them leaves control bytes.
+_TEXT_BYTES = (
+    bytes([8, 9, 10, 12, 13, 27]) + bytes(range(0x20, 0x7F)) + bytes(range(0x80, 0x100))
+)
+
+# A sample with more than this share of control bytes is binary.
+_MAX_CONTROL_RATIO = 0.1
+
+# Non-UTF-8 samples at or above this entropy (bits per byte) are binary;
+# natural-language text in legacy encodings stays well below it.
+_MAX_TEXT_ENTROPY = 7.0
+
+
+def _entropy(sample: bytes) -> float:
+    total = len(sample)
+    return -sum(
+        count / total * math.log2(count / total) for count in Counter(sample).values()
+    )
+
+
+def _is_safetensors(head: bytes) -> bool:
+    # 8-byte little-endian header length followed by a JSON header.
+    return (
+        len(head) >= 10
+        and head[8:10] == b'{"'
+        and int.from_bytes(head[:8], "little") < (1 << 32)
+    )
+
+
+def _is_bmp(head: bytes) -> bool:
+    # "BM" alone is too common at the start of text; also require a known
+    # DIB header size.
+    return head.startswith(b"BM") and head[14:18] in _BMP_HEADER_SIZES
+
+
+def _by_magic(head: bytes) -> Optional[str]:
+    for offset, magic, kind in _MAGIC:
+        if head.startswith(magic, offset):
+            return kind
+    if _is_bmp(head):
+        return IMAGE
+    if _is_safetensors(head):
+        return BINARY
+    return None
+
+
+def sniff_content(head: bytes, suffix: str = "") -> str:
+    """
+    Classify a file from its first bytes and return its content kind.
+
+    `head` should hold at least `SNIFF_BYTES` bytes unless the file is
+    shorter. An empty file is text. `suffix` is the file suffix; when it
+    implies another kind than the magic bytes (see `SUFFIX_KINDS`), the
+    file is text.
+    """
+    kind = _by_magic(head)
+    if kind is not None:
+        expected = SUFFIX_KINDS.get(suffix.lower(), kind)
+        return kind if expected == kind else TEXT
+
+    sample = head[:SNIFF_BYTES]
+    if not sample:
+        return TEXT
+    if b"\x00" in sample:
+        return BINARY
+    control = len(sample.translate(None, _TEXT_BYTES))
+    if control > len(sample) * _MAX_CONTROL_RATIO:
+        return BINARY
+    if sample.isascii():
+        return TEXT
+    try:
+        # The sample may end inside a multi-byte sequence.
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        if _entropy(sample) >= _MAX_TEXT_ENTROPY:
+            return BINARY
+    return TEXT
+
+
+class ContentStats:
+    """
+    Thread-safe per-kind file and byte counters.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._files: Dict[str, int] = {}
+        self._bytes: Dict[str, int] = {}
+
+    def add(self, size: int, kind: str) -> None:
+        """
+        Count one file of `kind` holding `size` bytes.
+        """
+        with self._lock:
+            self._files[kind] = self._files.get(kind, 0) + 1
+            self._bytes[kind] = self._bytes.get(kind, 0) + size
+
+    def as_dict(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                kind: {"files": self._files[kind], "bytes": self._bytes[kind]}
+                for kind in CONTENT_KINDS
+                if kind in self._files
+            }
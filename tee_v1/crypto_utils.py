@@ -3,20 +3,23 @@ Cryptographic helpers for the substitute enclave.
 
 This module is responsible for:
 * Generating a local Ed25519 keypair on startup.
-* Computing canonical JSON encodings.
-* Hashing reports to obtain a deterministic `reportHash`.
+* Computing canonical JSON encodings (see `canonical_json`).
+* Hashing reports to obtain a deterministic `reportHash`; the canonical JSON
+  is fed to SHA-256 as it is encoded, never built in full.
 * Signing payloads and exposing the enclave public key.
 """
 
 from __future__ import annotations
 
 import hashlib
-import json
 import secrets
-from typing import Any, Mapping
+from typing import Any, Callable, Mapping
 
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from pydantic import BaseModel
+
+from .canonical_json import write_canonical_json
 
 # Constant measurement string for the local substitute TEE.
 ENCLAVE_MEASUREMENT = "substitute-local-dev-nautilus-v1"
@@ -45,6 +48,16 @@ def get_enclave_public_key_hex() -> str:
     return "0x" + raw.hex()
 
 
+def _write_canonical(obj: Any, sink: Callable[[bytes], Any]) -> None:
+    if not isinstance(obj, BaseModel) and hasattr(obj, "dict"):
+        obj = obj.dict()
+    if not isinstance(obj, (BaseModel, Mapping)):
+        raise TypeError(
+            "canonical_json_bytes expects a mapping or Pydantic model with .dict()"
+        )
+    write_canonical_json(obj, sink)
+
+
 def canonical_json_bytes(obj: Any) -> bytes:
     """
     Serialize an object to canonical JSON bytes.
@@ -52,15 +65,13 @@ def canonical_json_bytes(obj: Any) -> bytes:
     The object can be:
     * A plain mapping / dict.
     * A Pydantic model (anything with a `.dict()` method).
-    """
-    if hasattr(obj, "dict"):
-        obj = obj.dict()  # type: ignore[assignment]
-    if not isinstance(obj, Mapping):
-        raise TypeError(
-            "canonical_json_bytes expects a mapping or Pydantic model with .dict()"
-        )
 
-    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    The bytes are those of `json.dumps(obj.dict(), sort_keys=True,
+    separators=(",", ":"))`, written straight into one buffer.
+    """
+    buffer = bytearray()
+    _write_canonical(obj, buffer.extend)
+    return bytes(buffer)
 
 
 def sha256_hex_prefixed(data: bytes) -> str:
@@ -75,11 +86,12 @@ def compute_report_hash(report: Any) -> str:
     """
     Compute a deterministic report hash from a `ComplianceReport`-like object.
 
-    The report is first turned into canonical JSON and then hashed with
-    SHA-256. The return value is a 0x-prefixed hex string.
+    The report's canonical JSON is hashed with SHA-256 chunk by chunk as it
+    is encoded. The return value is a 0x-prefixed hex string.
     """
-    canonical = canonical_json_bytes(report)
-    return sha256_hex_prefixed(canonical)
+    hasher = hashlib.sha256()
+    _write_canonical(report, hasher.update)
+    return "0x" + hasher.hexdigest()
 
 
 def generate_tee_nonce() -> str:
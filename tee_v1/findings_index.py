@@ -0,0 +1,161 @@
+"""
+Persistent per-file index of PII findings.
+
+Consecutive commits of a dataset usually touch only a few files. The index
+lets the scanner skip files it has already seen:
+
+* `files` maps a file's stat fingerprint (device, inode, size, mtime) to the
+  SHA-256 digest of its contents, recorded when it was last scanned.
+* `findings` maps a content digest plus a detector-set fingerprint to the
+  findings of that content (example hits plus match counts per type) and
+  its content kind (see `content_sniffer`).
+
+A file whose stat fingerprint is unchanged is therefore never re-read. A
+modified file gets a new mtime and is rescanned, which refreshes both rows.
+Callers that have already hashed the contents (see `pii_scanner.hash_dataset`)
+look findings up by that digest instead (`lookup_content`), which does not
+trust the stat fingerprint at all. The index is a small SQLite database
+shared by all requests of the process.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# (st_dev, st_ino, st_size, st_mtime_ns)
+FileKey = Tuple[int, int, int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (dev, ino)
+);
+CREATE TABLE IF NOT EXISTS findings (
+    digest TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    hits TEXT NOT NULL,
+    kind TEXT NOT NULL DEFAULT 'text',
+    counts TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (digest, engine)
+);
+"""
+
+
+def file_key(path: Path) -> Optional[FileKey]:
+    """
+    Return the stat fingerprint of `path`, or None if it can not be stat'ed.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class FindingsIndex:
+    """
+    SQLite-backed store of per-file findings, safe to share across threads.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(findings)")
+            }
+            if "kind" not in columns:
+                # Index created before content kinds were recorded.
+                self._conn.execute(
+                    "ALTER TABLE findings ADD COLUMN kind TEXT NOT NULL DEFAULT 'text'"
+                )
+            if "counts" not in columns:
+                # Index created before match counts were recorded. Its rows
+                # were stored under engine keys that are no longer looked up.
+                self._conn.execute(
+                    "ALTER TABLE findings ADD COLUMN counts TEXT NOT NULL DEFAULT '{}'"
+                )
+
+    def lookup(
+        self, key: FileKey, engine: str
+    ) -> Optional[Tuple[List[Tuple[str, str, str]], Dict[str, int], str, str]]:
+        """
+        Return the recorded `(type, detail, location)` hits, match counts per
+        type, content digest and content kind for an unchanged file.
+        """
+        dev, ino, size, mtime_ns = key
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT f.hits, f.counts, s.digest, f.kind FROM files AS s"
+                " JOIN findings AS f ON f.digest = s.digest AND f.engine = ?"
+                " WHERE s.dev = ? AND s.ino = ? AND s.size = ? AND s.mtime_ns = ?",
+                (engine, dev, ino, size, mtime_ns),
+            ).fetchone()
+        if row is None:
+            return None
+        hits = [
+            (finding_type, detail, location)
+            for finding_type, detail, location in json.loads(row[0])
+        ]
+        return hits, json.loads(row[1]), row[2], row[3]
+
+    def lookup_content(
+        self, digest: str, engine: str
+    ) -> Optional[Tuple[List[Tuple[str, str, str]], Dict[str, int], str]]:
+        """
+        Return the recorded `(type, detail, location)` hits, match counts per
+        type and content kind for contents with the SHA-256 digest `digest`.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT hits, counts, kind FROM findings"
+                " WHERE digest = ? AND engine = ?",
+                (digest, engine),
+            ).fetchone()
+        if row is None:
+            return None
+        hits = [
+            (finding_type, detail, location)
+            for finding_type, detail, location in json.loads(row[0])
+        ]
+        return hits, json.loads(row[1]), row[2]
+
+    def store(
+        self,
+        key: FileKey,
+        digest: str,
+        engine: str,
+        hits: List[Tuple[str, str, str]],
+        counts: Dict[str, int],
+        kind: str,
+    ) -> None:
+        """
+        Record the content digest, hits, match counts and content kind of a
+        freshly scanned file.
+        """
+        dev, ino, size, mtime_ns = key
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                (dev, ino, size, mtime_ns, digest),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO findings (digest, engine, hits, kind, counts)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (digest, engine, json.dumps(hits), kind, json.dumps(counts)),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
@@ -0,0 +1,141 @@
+"""
+One-pass inventory of a dataset directory.
+
+An analysis used to walk the dataset tree once per stage (PII scan, image
+sampling, dataset stats), each walk `stat`-ing every file again. The
+inventory walks the tree once with `os.scandir`, which reports entry types
+without extra syscalls, and `stat`s each regular file exactly once. Every
+stage then works off the same list.
+
+Walk semantics match `Path.rglob("*")` + `is_file()`: symlinks to files are
+included, symlinked directories are not descended into.
+
+A dataset shipped as an archive (see `archive_reader`) is inventoried from
+its member list instead; its entries point into the archive and are read as
+member streams, never extracted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from .archive_reader import is_dataset_archive, list_members
+from .findings_index import FileKey
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    path: Path
+    # Path relative to the dataset root, as reported in findings.
+    relative_path: str
+    size: int
+    # Stat fingerprint for the findings index.
+    key: FileKey
+    # Index of the member within the dataset archive, for archive datasets;
+    # `path` is then the archive path joined with the member name.
+    member: Optional[int] = None
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix.lower()
+
+
+@dataclass(frozen=True)
+class DatasetInventory:
+    root: Path
+    # Sorted by path, which fixes the order of findings in the report.
+    files: List[FileEntry]
+    # True when `root` is an archive and `files` are its members.
+    archive: bool = False
+
+    @property
+    def total_size(self) -> int:
+        return sum(entry.size for entry in self.files)
+
+
+def _sort_files(files: List[FileEntry]) -> None:
+    # Same order as sorting the `Path`s (component-wise, case-folded on
+    # Windows), without the cost of `Path.__lt__`.
+    files.sort(
+        key=lambda entry: os.path.normcase(entry.relative_path).split(os.sep)
+    )
+
+
+def _member_inode(archive_inode: int, name: str) -> int:
+    # Stand-in inode for an archive member: negative, so it never collides
+    # with a real file's.
+    digest = hashlib.blake2b(f"{archive_inode}/{name}".encode(), digest_size=7)
+    return -1 - int.from_bytes(digest.digest(), "big")
+
+
+def _archive_inventory(archive: Path) -> DatasetInventory:
+    """
+    List the members of a dataset archive as inventory entries.
+
+    A member's findings-index key combines the archive's device and mtime
+    with the member's name and size, so every member of a rewritten archive
+    is rescanned. Raises ArchiveError if the archive can not be read.
+    """
+    stat = archive.stat()
+    files = [
+        FileEntry(
+            path=archive / member.name,
+            relative_path=member.name.replace("/", os.sep),
+            size=member.size,
+            key=(
+                stat.st_dev,
+                _member_inode(stat.st_ino, member.name),
+                member.size,
+                stat.st_mtime_ns,
+            ),
+            member=member.index,
+        )
+        for member in list_members(archive)
+    ]
+    _sort_files(files)
+    return DatasetInventory(root=archive, files=files, archive=True)
+
+
+def build_inventory(root: Path) -> DatasetInventory:
+    """
+    Walk `root` once and return its regular files with their metadata.
+
+    Files that disappear or can not be stat'ed during the walk are skipped.
+    If `root` is a dataset archive, its members are listed instead.
+    """
+    if is_dataset_archive(root):
+        return _archive_inventory(root)
+
+    files: List[FileEntry] = []
+    stack = [(str(root), "")]
+    while stack:
+        directory, relative = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            relative_path = f"{relative}{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, relative_path + os.sep))
+                    continue
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append(
+                FileEntry(
+                    path=Path(entry.path),
+                    relative_path=relative_path,
+                    size=stat.st_size,
+                    key=(stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns),
+                )
+            )
+    _sort_files(files)
+    return DatasetInventory(root=root, files=files)
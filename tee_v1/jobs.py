@@ -0,0 +1,142 @@
+"""
+In-process job queue for long-running dataset analyses.
+
+`POST /jobs` enqueues an analysis and returns immediately; the analysis runs
+on a fixed number of asyncio workers and reports its progress on the `Job`
+object, which `GET /jobs/{id}` exposes. The queue has a bounded depth, and a
+submission whose key matches a queued or running job attaches to that job
+instead of starting a new one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+class JobQueueFullError(RuntimeError):
+    """
+    Raised when a job is submitted while the queue is at its depth limit.
+    """
+
+
+class Job:
+    """
+    A single analysis job and its progress counters.
+    """
+
+    def __init__(self, key: Hashable, payload: Any) -> None:
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.payload = payload
+        self.status = "queued"  # queued -> running -> succeeded | failed
+        self.stage = "queued"
+        self.files_scanned = 0
+        self.bytes_scanned = 0
+        self.bytes_by_kind: Dict[str, int] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def on_file(self, size: int, kind: str) -> None:
+        """
+        Progress callback for the PII scanner: one more file accounted for.
+        """
+        self.files_scanned += 1
+        self.bytes_scanned += size
+        self.bytes_by_kind[kind] = self.bytes_by_kind.get(kind, 0) + size
+
+    @property
+    def done(self) -> bool:
+        return self.status in {"succeeded", "failed"}
+
+
+class JobManager:
+    """
+    Run jobs through `runner` on `workers` concurrent asyncio workers.
+
+    At most `max_queued` jobs wait in the queue; the `max_finished` most
+    recently finished jobs are kept around so their results can be fetched.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Job], Awaitable[Any]],
+        workers: int,
+        max_queued: int,
+        max_finished: int = 256,
+    ) -> None:
+        self._runner = runner
+        self._worker_count = workers
+        self._max_finished = max_finished
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max_queued)
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[Hashable, Job] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._workers: List[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        """
+        Spawn the worker tasks. Must be called from a running event loop.
+        """
+        for _ in range(self._worker_count):
+            self._workers.append(asyncio.create_task(self._work()))
+
+    async def stop(self) -> None:
+        """
+        Cancel the worker tasks and wait for them to exit.
+        """
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    def submit(self, key: Hashable, payload: Any) -> Job:
+        """
+        Enqueue a job, or return the queued/running job with the same key.
+        """
+        existing = self._active.get(key)
+        if existing is not None:
+            return existing
+
+        job = Job(key, payload)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as exc:
+            raise JobQueueFullError("Job queue is full, retry later") from exc
+
+        self._jobs[job.id] = job
+        self._active[key] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            try:
+                job.result = await self._runner(job)
+                job.status = "succeeded"
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # surfaced through GET /jobs/{id}
+                job.error = str(exc) or exc.__class__.__name__
+                job.status = "failed"
+            finally:
+                job.stage = "done"
+                job.finished_at = time.time()
+                self._active.pop(job.key, None)
+                self._retire(job)
+                self._queue.task_done()
+
+    def _retire(self, job: Job) -> None:
+        self._finished[job.id] = None
+        while len(self._finished) > self._max_finished:
+            old_id, _ = self._finished.popitem(last=False)
+            self._jobs.pop(old_id, None)
@@ -1,27 +1,103 @@
 """
 FastAPI application exposing the substitute enclave API.
 
-Endpoint:
-    POST /analyze-dataset
+Endpoints:
+    GET /health, GET /ready, GET /metrics
+    POST /analyze-dataset, POST /analyze-dataset/stream, POST /analyze-datasets
+    GET /datasets/{datasetMerkleRoot}/proof
+    POST /jobs, GET /jobs/{jobId}, GET /jobs/{jobId}/result
 
-This endpoint:
+`/analyze-dataset`:
 1. Accepts a Nautilus-like request payload.
-2. Loads dataset files from a local folder (no decryption).
-3. Runs simple PII detection.
-4. Builds a `ComplianceReport`.
+2. Loads dataset files from a local folder or `.zip` / `.tar(.gz)` archive
+   (no decryption; archive members are streamed, not extracted).
+3. Hashes every file (on the scan's worker pool) and rejects the dataset
+   unless the Merkle tree of those hashes has the requested
+   `datasetMerkleRoot` (see `merkle` for the leaf scheme); then runs PII
+   detection with the detectors of the request's `policyVersion` (see
+   `policies`), which rejects the dataset if the files it reads no longer
+   match those hashes.
+4. Builds a `ComplianceReport`: findings are counted per file and type, and
+   only the first `FINDINGS_MAX_EXAMPLES` of each are listed. The policy's
+   thresholds turn the total count into a verdict.
 5. Computes a deterministic `reportHash` (SHA-256 of canonical JSON).
 6. Generates a substitute attestation + Ed25519 signature.
 7. Returns `{ attestation, payload, signature, report }`.
+
+Blocking stages (PII scanning, sampling + gun detection, dataset stats) run in
+the threadpool so that the event loop stays free to serve other requests and
+health checks; the Claude call is awaited on an async client.
+
+Reports are cached on disk by (the Merkle root computed from the dataset
+contents, policyVersion and the policy's fingerprint, modelVersion, findings
+example cap, table row sampling); a cache hit skips the scan and report of
+steps 3–4 but not the hashing, so a report is never served for contents it
+was not built from. The nonce and signature are generated fresh for every
+response.
+
+`/analyze-dataset/stream` returns the same analysis as NDJSON: findings are
+sent while the scan progresses, and the signed result comes last.
+
+`/analyze-datasets` runs the pipeline for a batch of requests, a bounded
+number at a time, and returns either one signed response per dataset or a
+single signature over the Merkle root of all the report hashes.
+
+`/jobs` runs the same pipeline asynchronously for datasets that take longer
+than the caller's HTTP timeout: submission returns a job id at once, progress
+can be polled, and the signed response is fetched once the job has finished.
+
+The gun detection model is not loaded at import time: the app starts serving
+at once and warms the detector in a background thread (unless
+`GUN_DETECTOR_WARMUP=0`). `/ready` reports whether the detector is warm.
+
+All Claude calls share one pooled async client, opened at startup and closed
+at shutdown; `/metrics` exposes its connection-reuse counters, along with the
+files and bytes scanned per content kind (text, image, structured, archive,
+binary).
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from .config import resolve_dataset_path
+from .archive_reader import ArchiveError, is_dataset_archive
+from .claude_client import ClaudeClient
+from .config import (
+    get_batch_concurrency,
+    get_batch_max_datasets,
+    get_claude_pool_limits,
+    get_claude_timeout,
+    get_findings_max_examples,
+    get_gun_detector_backend,
+    get_gun_detector_warmup,
+    get_job_queue_depth,
+    get_job_workers,
+    get_pii_index_path,
+    get_pii_scan_workers,
+    get_report_cache_dir,
+    get_report_cache_max_bytes,
+    get_table_sample_rows,
+    get_verify_dataset_merkle_root,
+    get_weapon_sample_size,
+    resolve_dataset_path,
+)
+from .content_sniffer import ContentStats
 from .crypto_utils import (
     ENCLAVE_MEASUREMENT,
     compute_report_hash,
@@ -29,65 +105,198 @@ from .crypto_utils import (
     get_enclave_public_key_hex,
     sign_payload,
 )
+from .findings_index import FindingsIndex
+from .inventory import DatasetInventory, build_inventory
+from .jobs import Job, JobManager, JobQueueFullError
+from .merkle import (
+    DatasetMerkleMismatchError,
+    MerkleTree,
+    merkle_leaf,
+    merkle_levels,
+    merkle_proof,
+    merkle_root,
+    normalize_root,
+)
 from .models import (
     AnalyzeDatasetRequest,
     AnalyzeDatasetResponse,
+    AnalyzeDatasetsRequest,
+    AnalyzeDatasetsResponse,
     Attestation,
+    BatchPayload,
+    BatchResult,
     ComplianceReport,
+    JobStatus,
+    MerkleProof,
+    MerkleProofStep,
     TeePayload,
+    UnscannedFile,
+)
+from .pii_scanner import (
+    DatasetScan,
+    FileFindings,
+    build_report_findings,
+    hash_dataset,
+    scan_dataset_for_pii,
 )
-from .pii_scanner import compute_verdict_and_score, scan_dataset_for_pii
+from .policies import CompiledPolicy, compile_policy
+from .report_cache import ReportCache, merkle_cache_key, report_cache_key
 from .weapon_and_claude import (
+    IMAGE_EXTENSIONS,
     call_claude_report,
+    compute_dataset_stats,
     compute_weapon_flag_from_samples,
+    gun_detector_version,
+    gun_detector_warm,
+    load_gun_detector,
     sample_files,
 )
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    claude_client.start()
+    job_manager.start()
+    # Warm the detector without delaying startup; requests that need it
+    # before it is ready simply wait on the same load.
+    warmup = (
+        asyncio.create_task(run_in_threadpool(load_gun_detector))
+        if get_gun_detector_warmup()
+        else None
+    )
+    try:
+        yield
+    finally:
+        if warmup is not None:
+            warmup.cancel()
+        await job_manager.stop()
+        await claude_client.stop()
+
+
 app = FastAPI(
     title="SIRIUS Substitute Enclave",
     description="Local development substitute for Nautilus TEE attestation service.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+claude_client = ClaudeClient(*get_claude_pool_limits(), timeout=get_claude_timeout())
 
-@app.get("/health", tags=["meta"])
-async def health() -> dict:
+report_cache = ReportCache(get_report_cache_dir(), get_report_cache_max_bytes())
+
+_pii_index_path = get_pii_index_path()
+findings_index = FindingsIndex(_pii_index_path) if _pii_index_path else None
+
+
+# Process-wide per-content-kind counters of the files scanned.
+content_stats = ContentStats()
+
+
+def _hash_dataset(inventory: DatasetInventory) -> MerkleTree:
     """
-    Lightweight health check endpoint.
+    Hash the dataset contents on the scan's worker pool and build their
+    Merkle tree.
     """
-    return {"status": "ok"}
+    return MerkleTree(hash_dataset(inventory, get_pii_scan_workers()))
 
 
-@app.post("/analyze-dataset", response_model=AnalyzeDatasetResponse, tags=["analysis"])
-async def analyze_dataset(request: AnalyzeDatasetRequest) -> AnalyzeDatasetResponse:
+def _scan_for_pii(
+    inventory: DatasetInventory,
+    policy: CompiledPolicy,
+    tree: MerkleTree,
+    on_file: Optional[Callable[[int, str], None]] = None,
+    on_findings: Optional[Callable[[int, FileFindings], None]] = None,
+) -> DatasetScan:
     """
-    Analyze a dataset stored on the local filesystem and return a compliance
-    report plus a signed payload that mimics the Nautilus TEE output shape.
+    Scan the dataset for PII with the detectors of `policy`.
+
+    `tree` holds the digests hashed before the scan. Raises
+    DatasetMerkleMismatchError if the contents read by the scan differ.
     """
-    dataset_path: Path = resolve_dataset_path(request.encryptedDataBlobId)
 
-    if not dataset_path.exists() or not dataset_path.is_dir():
-        raise HTTPException(
-            status_code=404,
-            detail=f"Dataset directory not found: {dataset_path}",
-        )
+    def record(size: int, kind: str) -> None:
+        content_stats.add(size, kind)
+        if on_file is not None:
+            on_file(size, kind)
 
-    # 1–3. PII scanning
-    findings = scan_dataset_for_pii(dataset_path)
-    verdict, score = compute_verdict_and_score(findings)
+    scan = scan_dataset_for_pii(
+        inventory.root,
+        workers=get_pii_scan_workers(),
+        index=findings_index,
+        on_file=record,
+        inventory=inventory,
+        sample_rows=get_table_sample_rows(),
+        max_examples=get_findings_max_examples(),
+        on_findings=on_findings,
+        engine=policy.engine,
+        digests=tree.digests,
+    )
+    scanned = MerkleTree(scan.digests)
+    if not scanned.matches(tree.root):
+        # The dataset changed since it was hashed.
+        raise DatasetMerkleMismatchError(tree.root, scanned.root)
+    return scan
 
-    # Extra step: random sampling + gun detection (weapon_flag).
-    sampled_files = sample_files(dataset_path, sample_size=1)
-    weapon_flag = compute_weapon_flag_from_samples(sampled_files)
+
+def _detect_weapon(inventory: DatasetInventory, policy_version: str) -> bool:
+    sampled_files: Sequence[Path] = sample_files(
+        inventory.root,
+        sample_size=get_weapon_sample_size(policy_version),
+        suffixes=IMAGE_EXTENSIONS,
+        inventory=inventory,
+    )
+    return compute_weapon_flag_from_samples(sampled_files, inventory=inventory)
+
+
+async def _build_report(
+    request: AnalyzeDatasetRequest,
+    inventory: DatasetInventory,
+    tree: MerkleTree,
+    job: Optional[Job] = None,
+    on_findings: Optional[Callable[[int, FileFindings], None]] = None,
+) -> ComplianceReport:
+    """
+    Run the analysis pipeline on a hashed dataset and build the
+    `ComplianceReport`.
+
+    `tree` is the Merkle tree of the contents hashed beforehand; raises
+    DatasetMerkleMismatchError if the scan reads different contents. When
+    running as a job, progress is reported on `job`. `on_findings` receives
+    the findings of each file as it is scanned (see `scan_dataset_for_pii`).
+    """
+    # 1–3. PII scanning, plus the extra random sampling + gun detection
+    # (weapon_flag) and dataset stats. The tree is walked once; the stages
+    # share that inventory, and the two blocking ones run concurrently in the
+    # threadpool.
+    if job is not None:
+        job.stage = "scanning"
+    policy = compile_policy(request.policyVersion)
+    scan, weapon_flag = await asyncio.gather(
+        run_in_threadpool(
+            _scan_for_pii,
+            inventory,
+            policy,
+            tree,
+            job.on_file if job is not None else None,
+            on_findings,
+        ),
+        run_in_threadpool(_detect_weapon, inventory, request.policyVersion),
+    )
+    dataset_stats = compute_dataset_stats(inventory.root, inventory)
+    findings, finding_counts, findings_total = build_report_findings(scan.files)
+    verdict, score = policy.verdict_and_score(findings_total)
 
     # Optional: call Claude to generate a Nautilus-like JSON report which
     # includes the weapon_flag. This is side-effectful (external API) and may
     # fail; we keep the core compliance report independent.
+    if job is not None:
+        job.stage = "reporting"
     claude_report: Dict[str, Any] | None = None
     try:
-        claude_report = call_claude_report(
+        claude_report = await call_claude_report(
+            claude_client.client,
             dataset_id=request.datasetId,
-            dataset_path=dataset_path,
+            dataset_stats=dataset_stats,
             weapon_flag=weapon_flag,
         )
     except Exception:
@@ -103,6 +312,11 @@ async def analyze_dataset(request: AnalyzeDatasetRequest) -> AnalyzeDatasetRespo
         verdict=verdict,
         score=score,
         findings=findings,
+        findingCounts=finding_counts,
+        findingsTotal=findings_total,
+        unscannedFiles=[
+            UnscannedFile(path=path, kind=kind) for path, kind in scan.unscanned
+        ],
     )
 
     # Attach extra insights as attributes on the report object so that they
@@ -113,6 +327,136 @@ async def analyze_dataset(request: AnalyzeDatasetRequest) -> AnalyzeDatasetRespo
     if claude_report is not None:
         setattr(report, "nautilus_like_report", claude_report)
 
+    return report
+
+
+@app.get("/health", tags=["meta"])
+async def health() -> dict:
+    """
+    Lightweight health check endpoint.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["meta"])
+async def metrics() -> dict:
+    """
+    Connection-reuse counters of the shared Claude client, and the files and
+    bytes scanned so far per content kind.
+    """
+    return {
+        "claudeClient": claude_client.metrics.as_dict(),
+        "contentKinds": content_stats.as_dict(),
+    }
+
+
+@app.get("/ready", tags=["meta"])
+async def ready() -> JSONResponse:
+    """
+    Readiness check: 200 once the gun detector is warm, 503 until then.
+    """
+    warm = gun_detector_warm()
+    return JSONResponse(
+        status_code=200 if warm else 503,
+        content={
+            "status": "ready" if warm else "warming",
+            "gunDetectorBackend": get_gun_detector_backend(),
+        },
+    )
+
+
+def _resolve_dataset(request: AnalyzeDatasetRequest) -> Path:
+    """
+    Return the local dataset directory or archive for `request`, or raise a
+    404.
+    """
+    dataset_path: Path = resolve_dataset_path(request.encryptedDataBlobId)
+
+    if not dataset_path.is_dir() and not is_dataset_archive(dataset_path):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Dataset directory or archive not found: {dataset_path}",
+        )
+    return dataset_path
+
+
+async def _report_for(
+    request: AnalyzeDatasetRequest,
+    dataset_path: Path,
+    job: Optional[Job] = None,
+    on_findings: Optional[Callable[[int, FileFindings], None]] = None,
+) -> ComplianceReport:
+    """
+    Return the compliance report for a resolved dataset, from the report cache
+    when possible. `on_findings` is only called when the dataset is scanned.
+
+    Raises DatasetMerkleMismatchError, before anything is scanned, if the
+    contents do not match the request's `datasetMerkleRoot` (unless
+    verification is disabled).
+    """
+    if job is not None:
+        job.stage = "hashing"
+    inventory = await run_in_threadpool(build_inventory, dataset_path)
+    tree = await run_in_threadpool(_hash_dataset, inventory)
+    # The contents must match the root that the signed payload commits to.
+    if get_verify_dataset_merkle_root():
+        tree.verify(request.datasetMerkleRoot)
+    await run_in_threadpool(
+        report_cache.put, merkle_cache_key(tree.root), {"digests": tree.digests}
+    )
+
+    # Repeat analyses of the same contents under the same policy/model are
+    # served from the report cache, keyed by the root of the contents just
+    # hashed. Only the request-specific identifiers are refreshed.
+    cache_key = report_cache_key(
+        tree.root,
+        request.policyVersion,
+        request.modelVersion,
+        get_findings_max_examples(),
+        compile_policy(request.policyVersion).fingerprint,
+        get_table_sample_rows(),
+        get_weapon_sample_size(request.policyVersion),
+        gun_detector_version(),
+    )
+    cached = await run_in_threadpool(report_cache.get, cache_key)
+    if cached is not None:
+        return ComplianceReport(**cached).copy(
+            update={
+                "datasetId": request.datasetId,
+                "datasetMerkleRoot": request.datasetMerkleRoot,
+                "encryptedDataBlobId": request.encryptedDataBlobId,
+            }
+        )
+    report = await _build_report(request, inventory, tree, job, on_findings)
+    await run_in_threadpool(report_cache.put, cache_key, report.dict())
+    return report
+
+
+def _attestation(tee_nonce: str) -> Attestation:
+    # Substitute attestation
+    return Attestation(
+        teeMeasurement=ENCLAVE_MEASUREMENT,
+        teeNonce=tee_nonce,
+        enclavePubKey=get_enclave_public_key_hex(),
+        provider="LOCAL_DEV_SUBSTITUTE",
+    )
+
+
+async def _analyze(
+    request: AnalyzeDatasetRequest, dataset_path: Path, job: Optional[Job] = None
+) -> AnalyzeDatasetResponse:
+    """
+    Produce the signed analysis response for a resolved dataset.
+    """
+    report = await _report_for(request, dataset_path, job)
+    if job is not None:
+        job.stage = "signing"
+    return _sign_report(request, report)
+
+
+def _sign_report(
+    request: AnalyzeDatasetRequest, report: ComplianceReport
+) -> AnalyzeDatasetResponse:
     # 5. Deterministic reportHash
     report_hash = compute_report_hash(report)
 
@@ -129,19 +473,300 @@ async def analyze_dataset(request: AnalyzeDatasetRequest) -> AnalyzeDatasetRespo
 
     signature = sign_payload(payload)
 
-    # Substitute attestation
-    attestation = Attestation(
-        teeMeasurement=ENCLAVE_MEASUREMENT,
-        teeNonce=tee_nonce,
-        enclavePubKey=get_enclave_public_key_hex(),
-        provider="LOCAL_DEV_SUBSTITUTE",
-    )
-
     return AnalyzeDatasetResponse(
-        attestation=attestation,
+        attestation=_attestation(tee_nonce),
         payload=payload,
         signature=signature,
         report=report,
     )
 
 
+async def _run_job(job: Job) -> AnalyzeDatasetResponse:
+    request, dataset_path = job.payload
+    return await _analyze(request, dataset_path, job)
+
+
+job_manager = JobManager(_run_job, get_job_workers(), get_job_queue_depth())
+
+
+def _job_status(job: Job) -> JobStatus:
+    return JobStatus(
+        jobId=job.id,
+        status=job.status,
+        stage=job.stage,
+        filesScanned=job.files_scanned,
+        bytesScanned=job.bytes_scanned,
+        bytesByKind=dict(job.bytes_by_kind),
+        error=job.error,
+    )
+
+
+@app.post("/analyze-dataset", response_model=AnalyzeDatasetResponse, tags=["analysis"])
+async def analyze_dataset(request: AnalyzeDatasetRequest) -> AnalyzeDatasetResponse:
+    """
+    Analyze a dataset stored on the local filesystem and return a compliance
+    report plus a signed payload that mimics the Nautilus TEE output shape.
+
+    A corrupt or truncated dataset archive, or a dataset whose contents do not
+    match `datasetMerkleRoot`, is rejected with a 422.
+    """
+    try:
+        return await _analyze(request, _resolve_dataset(request))
+    except (ArchiveError, DatasetMerkleMismatchError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+async def _analyze_batch_item(
+    request: AnalyzeDatasetRequest, batch: bool, limit: asyncio.Semaphore
+) -> BatchResult:
+    """
+    Analyse one dataset of a batch; failures are reported in the result
+    with the status /analyze-dataset would have returned.
+    """
+    try:
+        async with limit:
+            dataset_path = _resolve_dataset(request)
+            if not batch:
+                response = await _analyze(request, dataset_path)
+                return BatchResult(
+                    datasetId=request.datasetId, status=200, response=response
+                )
+            report = await _report_for(request, dataset_path)
+    except HTTPException as exc:
+        return BatchResult(
+            datasetId=request.datasetId, status=exc.status_code, error=exc.detail
+        )
+    except (ArchiveError, DatasetMerkleMismatchError) as exc:
+        return BatchResult(datasetId=request.datasetId, status=422, error=str(exc))
+    except Exception as exc:  # one dataset must not fail the whole batch
+        return BatchResult(datasetId=request.datasetId, status=500, error=str(exc))
+    return BatchResult(
+        datasetId=request.datasetId,
+        status=200,
+        report=report,
+        reportHash=compute_report_hash(report),
+    )
+
+
+@app.post(
+    "/analyze-datasets", response_model=AnalyzeDatasetsResponse, tags=["analysis"]
+)
+async def analyze_datasets(request: AnalyzeDatasetsRequest) -> AnalyzeDatasetsResponse:
+    """
+    Analyze several datasets concurrently (at most `BATCH_CONCURRENCY` at a
+    time) and return their results in request order.
+
+    With `signing="perDataset"` each successful result holds the same signed
+    response as /analyze-dataset. With `signing="batch"` one signature covers
+    the Merkle root of the report hashes of all successful results, each of
+    which carries its report, report hash and inclusion proof. A dataset
+    that fails is reported in its result and does not fail the batch.
+    """
+    max_datasets = get_batch_max_datasets()
+    if len(request.datasets) > max_datasets:
+        raise HTTPException(
+            status_code=422,
+            detail=f"A batch may hold at most {max_datasets} datasets",
+        )
+
+    batch = request.signing == "batch"
+    limit = asyncio.Semaphore(get_batch_concurrency())
+    results = await asyncio.gather(
+        *(_analyze_batch_item(item, batch, limit) for item in request.datasets)
+    )
+    if not batch:
+        return AnalyzeDatasetsResponse(results=results)
+
+    signed = [result for result in results if result.reportHash is not None]
+    levels = merkle_levels(
+        [normalize_root(result.reportHash or "") for result in signed]
+    )
+    for index, result in enumerate(signed):
+        result.proof = [
+            MerkleProofStep(hash=sibling, position=side)
+            for sibling, side in merkle_proof(levels, index)
+        ]
+
+    tee_nonce = generate_tee_nonce()
+    payload = BatchPayload(
+        batchMerkleRoot=merkle_root(levels),
+        reportCount=len(signed),
+        teeNonce=tee_nonce,
+    )
+    return AnalyzeDatasetsResponse(
+        results=results,
+        attestation=_attestation(tee_nonce),
+        payload=payload,
+        signature=sign_payload(payload),
+    )
+
+
+@app.get(
+    "/datasets/{dataset_merkle_root}/proof",
+    response_model=MerkleProof,
+    tags=["analysis"],
+)
+async def get_merkle_proof(dataset_merkle_root: str, path: str) -> MerkleProof:
+    """
+    Return the inclusion proof of the file at `path` in a dataset analysed
+    earlier, identified by the Merkle root computed from its contents.
+
+    Proofs are served from the report cache, so they are only available
+    while the dataset's entry has not been evicted.
+    """
+    cached = await run_in_threadpool(
+        report_cache.get, merkle_cache_key(dataset_merkle_root)
+    )
+    if cached is None:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown dataset: {dataset_merkle_root}"
+        )
+    tree = MerkleTree(cached["digests"])
+    steps = tree.proof(path)
+    if steps is None or not tree.matches(dataset_merkle_root):
+        raise HTTPException(
+            status_code=404, detail=f"File not in dataset {dataset_merkle_root}: {path}"
+        )
+    return MerkleProof(
+        datasetMerkleRoot=tree.root,
+        path=path,
+        contentHash=tree.digests[path],
+        leaf=merkle_leaf(path, tree.digests[path]),
+        proof=[
+            MerkleProofStep(hash=sibling, position=side) for sibling, side in steps
+        ],
+    )
+
+
+def _ndjson(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def _stream_analysis(
+    request: AnalyzeDatasetRequest, dataset_path: Path
+) -> AsyncIterator[bytes]:
+    """
+    Yield the NDJSON lines of a streamed analysis: findings as the files
+    holding them are scanned, then the signed result (or an error).
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Optional[Tuple[int, FileFindings]]] = asyncio.Queue()
+
+    def on_findings(position: int, file: FileFindings) -> None:
+        # Called from the scanning thread.
+        loop.call_soon_threadsafe(queue.put_nowait, (position, file))
+
+    async def run() -> ComplianceReport:
+        try:
+            return await _report_for(request, dataset_path, on_findings=on_findings)
+        finally:
+            # The scan's callbacks were all queued before it returned.
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(run())
+    try:
+        streamed = False
+        while (item := await queue.get()) is not None:
+            position, file = item
+            streamed = True
+            for finding in build_report_findings([file])[0]:
+                yield _ndjson(
+                    {"type": "finding", "order": position, "finding": finding.dict()}
+                )
+        try:
+            report = await task
+        except (ArchiveError, DatasetMerkleMismatchError) as exc:
+            yield _ndjson({"type": "error", "status": 422, "detail": str(exc)})
+            return
+        except Exception as exc:  # the status line has already been sent
+            yield _ndjson({"type": "error", "status": 500, "detail": str(exc)})
+            return
+        if not streamed:
+            # Served from the report cache: nothing was scanned.
+            for order, finding in enumerate(report.findings):
+                yield _ndjson(
+                    {"type": "finding", "order": order, "finding": finding.dict()}
+                )
+        response = _sign_report(request, report)
+        yield _ndjson(
+            {"type": "result", **response.dict(exclude={"report": {"findings"}})}
+        )
+    finally:
+        task.cancel()
+
+
+@app.post("/analyze-dataset/stream", tags=["analysis"])
+async def analyze_dataset_stream(request: AnalyzeDatasetRequest) -> StreamingResponse:
+    """
+    Streaming variant of /analyze-dataset, answering with NDJSON
+    (`application/x-ndjson`) as the dataset is scanned:
+
+    * `{"type": "finding", "order": n, "finding": {...}}` for every finding
+      listed in the report, as soon as the file holding it is scanned (with
+      a worker pool, as its batch of small files completes). Files
+      complete out of order; stable-sorting the findings by `order` gives
+      the report's order. The dataset is hashed and checked against
+      `datasetMerkleRoot` before the first finding is sent, and only the
+      findings of contents matching those hashes are sent.
+    * a last `{"type": "result", "attestation", "payload", "signature",
+      "report"}` line, the /analyze-dataset response without
+      `report.findings`. `payload.reportHash` covers the report with the
+      sorted findings put back, exactly as in /analyze-dataset.
+    * or a last `{"type": "error", "status", "detail"}` line if the analysis
+      fails once streaming has started (e.g. a dataset modified while it
+      is scanned, or a corrupt archive member).
+    """
+    dataset_path = _resolve_dataset(request)
+    return StreamingResponse(
+        _stream_analysis(request, dataset_path), media_type="application/x-ndjson"
+    )
+
+
+@app.post("/jobs", response_model=JobStatus, status_code=202, tags=["analysis"])
+async def submit_job(request: AnalyzeDatasetRequest) -> JobStatus:
+    """
+    Queue an analysis and return its job id immediately.
+
+    Submitting the same dataset (same folder, Merkle root, policy and model
+    versions) while a job for it is queued or running returns that job.
+    """
+    dataset_path = _resolve_dataset(request)
+    key = (
+        str(dataset_path),
+        request.datasetMerkleRoot,
+        request.policyVersion,
+        request.modelVersion,
+    )
+    try:
+        job = job_manager.submit(key, (request, dataset_path))
+    except JobQueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    return _job_status(job)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus, tags=["analysis"])
+async def get_job(job_id: str) -> JobStatus:
+    """
+    Report the status and progress of a job.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return _job_status(job)
+
+
+@app.get(
+    "/jobs/{job_id}/result", response_model=AnalyzeDatasetResponse, tags=["analysis"]
+)
+async def get_job_result(job_id: str) -> AnalyzeDatasetResponse:
+    """
+    Return the signed response of a successfully finished job.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is still {job.status}")
+    return job.result
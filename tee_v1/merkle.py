@@ -0,0 +1,184 @@
+"""
+Merkle tree over the contents of a dataset.
+
+`AnalyzeDatasetRequest.datasetMerkleRoot` commits to the dataset that was
+scanned. The enclave recomputes a root from the bytes it reads and refuses
+to sign a report for a dataset that does not match it (unless
+`VERIFY_DATASET_MERKLE_ROOT` is turned off).
+
+The tree has the shape of the backend's `MerkleService`:
+
+* one leaf per file, in sorted relative path order (POSIX separators), equal
+  to `sha256("<path>|<sha256 of the file contents>")`,
+* a parent is `sha256(left + right)` over the two hex strings; the last node
+  of an odd level is promoted unchanged,
+* the root of an empty dataset is `sha256("")`.
+
+but not its leaves: `MerkleService.computeManifestRoot` hashes manifest
+entries (`datasetId|blobId|path|sha256(metadata JSON)`, sorted by entry
+id), and their metadata is not part of the dataset the enclave reads. The
+`datasetMerkleRoot` of a request is therefore the root over the content
+leaves above, which callers compute from the files they submit, not the
+manifest root of a commit.
+
+Hashes are lowercase hex; the root is reported `0x`-prefixed. The content
+digests come from `pii_scanner.hash_dataset`, which hashes the files on the
+scan's worker pool before the scan starts.
+
+`MerkleTree.proof` returns the inclusion proof of one file and
+`verify_inclusion` checks such a proof against a root.
+
+The same tree shape, over arbitrary ordered leaves (`merkle_levels`), lets
+one signature cover the report hashes of a batch of analyses.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+# (sibling hash, "left" or "right" of the running hash)
+ProofStep = Tuple[str, str]
+
+
+class DatasetMerkleMismatchError(ValueError):
+    """
+    Raised when the dataset's contents do not match the requested Merkle root.
+    """
+
+    def __init__(self, expected: str, computed: str) -> None:
+        super().__init__(
+            f"datasetMerkleRoot mismatch: the request commits to {expected},"
+            f" the dataset contents hash to {computed}"
+        )
+        self.expected = expected
+        self.computed = computed
+
+
+def _sha256_hex(data: str) -> str:
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def merkle_leaf(path: str, content_digest: str) -> str:
+    """
+    Return the leaf hash of the file at relative `path` whose contents have
+    the SHA-256 hex digest `content_digest`.
+    """
+    return _sha256_hex(f"{path}|{content_digest}")
+
+
+def merkle_levels(leaves: Sequence[str]) -> List[List[str]]:
+    """
+    Return the levels of the tree over the hex `leaves`, from the leaves up
+    to the root.
+    """
+    level = list(leaves)
+    levels = [level]
+    while len(level) > 1:
+        level = [
+            _sha256_hex(level[index] + level[index + 1])
+            if index + 1 < len(level)
+            else level[index]
+            for index in range(0, len(level), 2)
+        ]
+        levels.append(level)
+    return levels
+
+
+def merkle_root(levels: List[List[str]]) -> str:
+    """
+    Return the `0x`-prefixed root of a tree built by `merkle_levels`.
+    """
+    top = levels[-1]
+    return "0x" + (top[0] if top else _sha256_hex(""))
+
+
+def merkle_proof(levels: List[List[str]], index: int) -> List[ProofStep]:
+    """
+    Return the inclusion proof of the leaf at `index`, from the leaf up.
+
+    Promoted nodes have no sibling and add no step.
+    """
+    steps: List[ProofStep] = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            steps.append((level[sibling], "left" if sibling < index else "right"))
+        index //= 2
+    return steps
+
+
+def fold_proof(leaf: str, proof: List[ProofStep]) -> str:
+    """
+    Return the root hash (without `0x`) that `proof` leads to from `leaf`.
+    """
+    node = leaf
+    for sibling, side in proof:
+        node = _sha256_hex(sibling + node if side == "left" else node + sibling)
+    return node
+
+
+def normalize_root(root: str) -> str:
+    """
+    Return `root` as lowercase hex without a `0x` prefix.
+    """
+    root = root.strip().lower()
+    return root[2:] if root.startswith("0x") else root
+
+
+class MerkleTree:
+    """
+    Merkle tree over the files of a dataset, keyed by relative path.
+    """
+
+    def __init__(self, digests: Mapping[str, str]) -> None:
+        """
+        Build the tree from a mapping of relative POSIX path to content
+        SHA-256 hex digest.
+        """
+        self.paths: List[str] = sorted(digests)
+        self.digests: Dict[str, str] = dict(digests)
+        self._positions = {path: index for index, path in enumerate(self.paths)}
+        self.levels = merkle_levels(
+            [merkle_leaf(path, self.digests[path]) for path in self.paths]
+        )
+
+    @property
+    def root(self) -> str:
+        """
+        Return the `0x`-prefixed root hash.
+        """
+        return merkle_root(self.levels)
+
+    def matches(self, root: str) -> bool:
+        """
+        Return True if `root` (with or without `0x`, any case) is this root.
+        """
+        return normalize_root(root) == normalize_root(self.root)
+
+    def verify(self, expected_root: str) -> None:
+        """
+        Raise DatasetMerkleMismatchError unless `expected_root` is this root.
+        """
+        if not self.matches(expected_root):
+            raise DatasetMerkleMismatchError(expected_root, self.root)
+
+    def proof(self, path: str) -> Optional[List[ProofStep]]:
+        """
+        Return the inclusion proof of the file at `path`, from its leaf up, or
+        None if the dataset has no such file.
+        """
+        index = self._positions.get(path)
+        if index is None:
+            return None
+        return merkle_proof(self.levels, index)
+
+
+def verify_inclusion(
+    path: str, content_digest: str, proof: List[ProofStep], root: str
+) -> bool:
+    """
+    Return True if `proof` shows that the file at `path` with contents hashing
+    to `content_digest` belongs to the dataset with Merkle root `root`.
+    """
+    return fold_proof(merkle_leaf(path, content_digest), proof) == normalize_root(root)
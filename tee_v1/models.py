@@ -8,7 +8,7 @@ changes, aside from the endpoint URL.
 
 from __future__ import annotations
 
-from typing import List, Literal
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -41,17 +41,54 @@ class ComplianceFinding(BaseModel):
     """
 
     type: str = Field(..., description="Type of finding, e.g. EMAIL, PHONE, IBAN")
-    path: str = Field(..., description="File path within the dataset where it was found")
+    path: str = Field(
+        ...,
+        description=(
+            "File path within the dataset where it was found; for tables"
+            " (CSV, JSONL, Parquet) suffixed with `#column:row`, or"
+            " `#column:header` for a CSV header cell"
+        ),
+    )
     detail: str = Field(
         ..., description="Short detail describing the finding (e.g. matched value)"
     )
 
 
+class FindingCount(BaseModel):
+    """
+    Number of findings of one type within one dataset file.
+    """
+
+    type: str = Field(..., description="Type of finding, e.g. EMAIL, PHONE, IBAN")
+    path: str = Field(..., description="File path within the dataset")
+    count: int = Field(..., ge=1, description="Number of matches in the file")
+
+
+class UnscannedFile(BaseModel):
+    """
+    A dataset file whose contents were not scanned for PII.
+    """
+
+    path: str = Field(..., description="File path within the dataset")
+    kind: Literal["binary", "archive", "unreadable"] = Field(
+        ...,
+        description=(
+            "Why it was not scanned: binary data, a nested archive, or a file"
+            " (or archive member) that could not be read"
+        ),
+    )
+
+
 class ComplianceReport(BaseModel):
     """
     High-level compliance report for a dataset, derived from PII scanning.
     """
 
+    class Config:
+        # Extra insights (e.g. `weapon_flag`) are attached by the API handler
+        # and must be serialised, and therefore hashed, with the report.
+        extra = "allow"
+
     datasetId: str
     datasetMerkleRoot: str
     encryptedDataBlobId: str
@@ -62,7 +99,20 @@ class ComplianceReport(BaseModel):
     score: int = Field(..., ge=0, le=100)
 
     findings: List[ComplianceFinding] = Field(
-        default_factory=list, description="List of PII / compliance findings"
+        default_factory=list,
+        description=(
+            "Example PII / compliance findings: the first FINDINGS_MAX_EXAMPLES"
+            " of each type in each file"
+        ),
+    )
+    findingCounts: List[FindingCount] = Field(
+        default_factory=list,
+        description="Number of findings per file and type, including those not listed",
+    )
+    findingsTotal: int = Field(0, ge=0, description="Total number of findings")
+    unscannedFiles: List[UnscannedFile] = Field(
+        default_factory=list,
+        description="Files that were only hashed, not scanned for PII",
     )
 
 
@@ -106,3 +156,108 @@ class AnalyzeDatasetResponse(BaseModel):
     report: ComplianceReport
 
 
+class JobStatus(BaseModel):
+    """
+    Status of an asynchronous analysis job, returned by the /jobs endpoints.
+    """
+
+    jobId: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    stage: str = Field(
+        ..., description="Current pipeline stage, e.g. scanning, reporting, signing"
+    )
+    filesScanned: int = 0
+    bytesScanned: int = 0
+    bytesByKind: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Bytes accounted for so far, per content kind (text, image, ...)",
+    )
+    error: Optional[str] = None
+
+
+class MerkleProofStep(BaseModel):
+    """
+    One step of a Merkle inclusion proof.
+    """
+
+    hash: str = Field(..., description="Hex-encoded sibling hash")
+    position: Literal["left", "right"] = Field(
+        ..., description="Side of the sibling when hashing the pair"
+    )
+
+
+class MerkleProof(BaseModel):
+    """
+    Inclusion proof of one file in an analysed dataset, returned by
+    GET /datasets/{datasetMerkleRoot}/proof.
+
+    Folding `proof` over `leaf` (`sha256(left + right)` over hex strings)
+    yields `datasetMerkleRoot`; `leaf` is `sha256("<path>|<contentHash>")`.
+    """
+
+    datasetMerkleRoot: str
+    path: str = Field(..., description="File path within the dataset")
+    contentHash: str = Field(..., description="SHA-256 of the file contents")
+    leaf: str
+    proof: List[MerkleProofStep] = Field(
+        default_factory=list, description="Sibling hashes from the leaf up"
+    )
+
+
+class AnalyzeDatasetsRequest(BaseModel):
+    """
+    Request body for POST /analyze-datasets: several analyses at once.
+
+    With `signing="perDataset"` every dataset gets its own signed response,
+    exactly as from /analyze-dataset. With `signing="batch"` the enclave
+    signs a single `BatchPayload` committing to the Merkle root of all the
+    report hashes, and every result carries the inclusion proof of its
+    report hash.
+    """
+
+    datasets: List[AnalyzeDatasetRequest] = Field(..., min_items=1)
+    signing: Literal["perDataset", "batch"] = "perDataset"
+
+
+class BatchPayload(BaseModel):
+    """
+    Payload signed by the enclave for a batch: the Merkle root over the
+    report hashes of the successful analyses, in request order.
+    """
+
+    batchMerkleRoot: str
+    reportCount: int = Field(..., ge=0)
+    teeNonce: str
+
+
+class BatchResult(BaseModel):
+    """
+    Outcome of one dataset of a batch, in request order.
+    """
+
+    datasetId: str
+    status: int = Field(
+        ..., description="HTTP status the dataset would get from /analyze-dataset"
+    )
+    error: Optional[str] = None
+    # signing="perDataset"
+    response: Optional[AnalyzeDatasetResponse] = None
+    # signing="batch"
+    report: Optional[ComplianceReport] = None
+    reportHash: Optional[str] = None
+    proof: List[MerkleProofStep] = Field(
+        default_factory=list,
+        description="Inclusion proof of `reportHash` in `batchMerkleRoot`",
+    )
+
+
+class AnalyzeDatasetsResponse(BaseModel):
+    """
+    Response returned by POST /analyze-datasets. `attestation`, `payload` and
+    `signature` are only set with `signing="batch"`.
+    """
+
+    results: List[BatchResult]
+    attestation: Optional[Attestation] = None
+    payload: Optional[BatchPayload] = None
+    signature: Optional[str] = None
@@ -0,0 +1,198 @@
+"""
+ONNX Runtime backend for the YOLOv8 gun detector.
+
+Runs the exported train18 weights (`yolo export format=onnx`) on the CPU
+execution provider without PyTorch or ultralytics:
+
+* Letterbox preprocessing in NumPy/Pillow, matching ultralytics' `LetterBox`
+  (aspect-preserving resize, centred padding with grey 114).
+* Decoding of the raw `(batch, 4 + nc, anchors)` YOLOv8 head output.
+* Class-aware greedy NMS in NumPy.
+
+The defaults (conf 0.25, IoU 0.7, 640x640) are those of `YOLO.predict`, so
+per-image maximum confidences match the ultralytics backend up to resize
+interpolation differences.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import onnxruntime as ort
+from PIL import Image
+
+LETTERBOX_COLOR = 114
+
+
+@dataclass(frozen=True)
+class Detection:
+    class_id: int
+    confidence: float
+    # Box corners in original image pixels.
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+
+def letterbox(
+    image: Image.Image, size: int
+) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Resize `image` into a `size`x`size` canvas keeping its aspect ratio.
+
+    Returns the CHW float32 tensor in [0, 1], the scale ratio, and the
+    (left, top) padding, which are needed to map boxes back.
+    """
+    width, height = image.size
+    ratio = min(size / width, size / height)
+    new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+    pad_w, pad_h = (size - new_w) / 2, (size - new_h) / 2
+    left, top = int(round(pad_w - 0.1)), int(round(pad_h - 0.1))
+
+    if (new_w, new_h) != (width, height):
+        image = image.resize((new_w, new_h), Image.BILINEAR)
+    canvas = np.full((size, size, 3), LETTERBOX_COLOR, dtype=np.uint8)
+    canvas[top : top + new_h, left : left + new_w] = np.asarray(image.convert("RGB"))
+
+    tensor = canvas.transpose(2, 0, 1).astype(np.float32) / 255.0
+    return tensor, ratio, (left, top)
+
+
+def _box_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-9)
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> List[int]:
+    """
+    Greedy non-maximum suppression; returns kept indices by descending score.
+    """
+    order = np.argsort(-scores, kind="stable")
+    keep: List[int] = []
+    while order.size:
+        best = int(order[0])
+        keep.append(best)
+        if order.size == 1:
+            break
+        rest = order[1:]
+        order = rest[_box_iou(boxes[best], boxes[rest]) <= iou_threshold]
+    return keep
+
+
+def decode_predictions(
+    output: np.ndarray,
+    conf_threshold: float,
+    iou_threshold: float,
+    max_detections: int = 300,
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Turn raw YOLOv8 output `(batch, 4 + nc, anchors)` into per-image
+    `(boxes_xyxy, scores, class_ids)` after thresholding and NMS.
+
+    Boxes are in letterboxed model-input coordinates.
+    """
+    decoded = []
+    for prediction in output:
+        prediction = prediction.T  # (anchors, 4 + nc)
+        class_scores = prediction[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(class_ids)), class_ids]
+        mask = scores > conf_threshold
+        xywh, scores, class_ids = prediction[mask, :4], scores[mask], class_ids[mask]
+
+        boxes = np.empty_like(xywh)
+        boxes[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+        boxes[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+
+        # Offset boxes per class so that NMS never suppresses across classes.
+        offsets = class_ids[:, None].astype(boxes.dtype) * 7680.0
+        keep = nms(boxes + offsets, scores, iou_threshold)[:max_detections]
+        decoded.append((boxes[keep], scores[keep], class_ids[keep]))
+    return decoded
+
+
+class OnnxGunDetector:
+    """
+    YOLOv8 detector running on ONNX Runtime's CPU execution provider.
+    """
+
+    def __init__(
+        self,
+        model_path: Path,
+        imgsz: int = 640,
+        conf_threshold: float = 0.25,
+        iou_threshold: float = 0.7,
+    ) -> None:
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        # Static exports (the default) only accept a batch of exactly 1.
+        self._max_batch: Optional[int] = (
+            model_input.shape[0] if isinstance(model_input.shape[0], int) else None
+        )
+        self.imgsz = imgsz
+        self.conf_threshold = conf_threshold
+        self.iou_threshold = iou_threshold
+
+    def detect(self, images: Sequence[Image.Image]) -> List[List[Detection]]:
+        """
+        Run detection over `images` and return the detections of each image.
+        """
+        prepared = [letterbox(image, self.imgsz) for image in images]
+        step = self._max_batch or max(1, len(prepared))
+        results: List[List[Detection]] = []
+        for start in range(0, len(prepared), step):
+            chunk = prepared[start : start + step]
+            batch = np.stack([tensor for tensor, _, _ in chunk])
+            (output,) = self._session.run(None, {self._input_name: batch})
+            decoded = decode_predictions(
+                output, self.conf_threshold, self.iou_threshold
+            )
+            for (_, ratio, pad), image, (boxes, scores, class_ids) in zip(
+                chunk, images[start : start + step], decoded
+            ):
+                results.append(
+                    _to_detections(image, ratio, pad, boxes, scores, class_ids)
+                )
+        return results
+
+    def max_confidences(self, images: Sequence[Image.Image]) -> List[float]:
+        """
+        Return the highest detection confidence per image (0.0 if none).
+        """
+        return [
+            max((d.confidence for d in detections), default=0.0)
+            for detections in self.detect(images)
+        ]
+
+
+def _to_detections(
+    image: Image.Image,
+    ratio: float,
+    pad: Tuple[int, int],
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    class_ids: np.ndarray,
+) -> List[Detection]:
+    width, height = image.size
+    boxes = boxes.copy()
+    boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad[0]) / ratio).clip(0, width)
+    boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad[1]) / ratio).clip(0, height)
+    return [
+        Detection(int(c), float(s), *(float(v) for v in box))
+        for box, s, c in zip(boxes, scores, class_ids)
+    ]
@@ -7,104 +7,1183 @@ detectors for:
 * Phone numbers
 * IBANs
 
-It returns a list of `ComplianceFinding` instances plus helper functions to
-derive a verdict and score.
+All detectors are evaluated by a `DetectorEngine`, which makes a single
+prefilter pass over each buffer and only runs the full detector regexes on the
+candidate windows it finds. Detectors with the same trigger share one
+branch of that pass, and a detector's optional validator (e.g. a checksum)
+only runs on the matches of its pattern. Results are identical to running
+every detector's `finditer` over the whole buffer and keeping the matches
+that pass its validator (and, for engines that resolve overlaps, keeping one
+of the matches that overlap).
+
+The detector set is chosen per `policyVersion` (see `policies`); the default
+engine holds the email, phone and IBAN detectors of the `v1` policy.
+
+Files are streamed in fixed-size chunks rather than loaded whole. Chunks are
+only split after a character that no detector can match, so a match spanning
+a chunk boundary is still reported exactly once and memory stays bounded by
+the chunk size.
+
+Datasets can be scanned by a pool of worker processes. Files are handed out
+in small batches, largest first, and the findings are merged back in sorted
+path order, so the result (and therefore the report hash) does not depend on
+the worker count.
+
+With a `FindingsIndex`, files whose size, mtime and inode are unchanged since
+a previous scan reuse their recorded findings, so rescanning a dataset costs
+in proportion to what changed. Callers that hashed the dataset first
+(`hash_dataset`, which only reads and hashes, on the same pool) pass those
+digests instead: findings are then reused by content digest, never by stat.
+
+The file list comes from a `DatasetInventory` (one `os.scandir` walk per
+request, shared with the other analysis stages).
+
+A dataset shipped as a `.zip` / `.tar(.gz)` archive is scanned without being
+extracted: its members are streamed from the archive in one pass, in archive
+order (one pass per pool task), through the same per-file scan. A tar
+archive is always scanned by a single process: its members can only be
+reached by reading (and decompressing) it from the start, which a pool would
+do once per worker. Tables in archive members are buffered first, in memory
+up to `TABLE_SPOOL_BYTES` and in a temporary file beyond that, since table
+parsing needs to seek and member streams can not. Archives found
+inside a dataset are still only hashed.
+
+Files that are only hashed (binary data, nested archives, and files or
+archive members that can not be read) are listed in `DatasetScan.unscanned`
+rather than passed off as clean.
+
+Before scanning, each file is classified from its first block and suffix by
+`content_sniffer.sniff_content`. Tables (CSV/TSV, JSONL and Parquet) are read
+by `table_extractors` and only their string columns are scanned, cell by
+cell, optionally on a sample of rows; their findings carry a `column:row`
+location. Other text is decoded and scanned as a stream. Images (left to the
+gun-detection stage), other structured formats, archives and binary files are
+hashed but not decoded, which avoids both the wasted CPU and the false hits
+from byte noise.
+
+Callers can pass an `on_file` callback to follow progress; it receives the
+size in bytes and the content kind of every file once that file has been
+accounted for.
+
+Findings are aggregated per file: every match is counted per type, but only
+the first few (`max_examples`) are kept as examples, so a log with millions
+of matches costs a counter rather than millions of objects. The scan returns
+lightweight `FileFindings`; `build_report_findings` turns them into the
+report's `ComplianceFinding` / `FindingCount` models, and
+`compute_verdict_and_score` derives a verdict from the total count.
+
+Every file is SHA-256 hashed in the pass that scans it, and the scan also
+returns these content digests, from which the dataset Merkle root is built
+without reading the data again (see `merkle`).
 """
 
 from __future__ import annotations
 
+import codecs
+import hashlib
+import inspect
+import io
+import json
+import os
 import re
+import shutil
+import tempfile
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import accumulate
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Match,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
 
-from .models import ComplianceFinding
+from .archive_reader import is_zip_archive, iter_members
+from .content_sniffer import (
+    ARCHIVE,
+    BINARY,
+    SNIFFER_VERSION,
+    STRUCTURED,
+    TEXT,
+    UNREADABLE,
+    sniff_content,
+)
+from .findings_index import FindingsIndex
+from .inventory import DatasetInventory, FileEntry, build_inventory
+from .models import ComplianceFinding, FindingCount
+from .table_extractors import (
+    CSV,
+    EXTRACTOR_VERSION,
+    HEADER_ROW,
+    PARQUET,
+    ColumnBatch,
+    TableFormatError,
+    iter_columns,
+    table_format,
+)
 
 # Very lightweight regex patterns for demo purposes.
 EMAIL_REGEX = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
 PHONE_REGEX = re.compile(r"\+?\d[\d\s\-().]{7,}\d")
 IBAN_REGEX = re.compile(r"\b[A-Z]{2}\d{2}[A-Z0-9]{11,30}\b")
 
+# Files are read in blocks of this many bytes.
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Tables in archive members are buffered in memory up to this many bytes
+# before parsing, and in a temporary file beyond that.
+TABLE_SPOOL_BYTES = 32 << 20
+
+# Files handed to a pool worker at once: one file, or small files totalling
+# at most this many bytes, so findings are reported about as soon as each
+# file is scanned.
+POOL_BATCH_BYTES = 1 << 20
 
-def _read_text_file(path: Path) -> str:
+# Content kinds that are only hashed, never run through the detectors, and
+# are listed in the report as such. Images are left to the weapon stage.
+UNSCANNED_KINDS: Tuple[str, ...] = (BINARY, ARCHIVE, UNREADABLE)
+
+# Upper bound, in characters, on the unscanned tail carried between chunks.
+# Only a run longer than this without any splittable character (see
+# `DetectorEngine.split_point`) is ever cut inside a potential match.
+STREAM_MAX_CARRY = 4 << 20
+
+_EMAIL_CHARS = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.+-@"
+)
+
+
+@dataclass(frozen=True)
+class Detector:
     """
-    Read a file as text, falling back to ignoring errors for non-UTF-8 content.
+    A single regex-based PII detector.
+
+    `trigger` is a cheap regex fragment folded into the engine's shared
+    prefilter pass, and `lead` lists (as a character-class body) every
+    character a trigger hit can start with. `alphabet` is a character-class
+    body covering every character a match can contain. Every match of `pattern` must be
+    reachable from a trigger hit, either:
+    * starting exactly at the hit (`anchored=True`), or
+    * lying within the hit once it is widened over the characters in `extend`.
+
+    Triggers of different detectors must never consume a character another
+    trigger could start on, otherwise the shared pass would hide hits.
+    Detectors with identical triggers share one branch instead.
+
+    `validate`, if set, is called with the value of every match of `pattern`
+    and drops the match when it returns False. It must be a module-level
+    function, so that engines can be sent to worker processes.
     """
+
+    name: str
+    pattern: Pattern[str]
+    trigger: str
+    lead: str
+    alphabet: str
+    anchored: bool = False
+    extend: FrozenSet[str] = frozenset()
+    validate: Optional[Callable[[str], bool]] = None
+
+
+def _validator_id(detector: Detector) -> Optional[str]:
+    """
+    Identify a detector's validator by name and by a hash of its source, so
+    that changing a check (e.g. a checksum) changes the engine fingerprint.
+    """
+    validate = detector.validate
+    if validate is None:
+        return None
     try:
-        return path.read_text(encoding="utf-8", errors="ignore")
-    except OSError:
-        return ""
+        source = inspect.getsource(validate)
+    except (OSError, TypeError):
+        # No source available: fall back to the bytecode.
+        code = getattr(validate, "__code__", None)
+        source = code.co_code.hex() if code is not None else ""
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    return f"{validate.__module__}.{validate.__qualname__}:{digest}"
 
 
-def _iter_files(root: Path) -> Iterable[Path]:
+class DetectorEngine:
     """
-    Yield all files under the given root directory recursively.
+    Run a set of detectors over a text buffer in one prefilter pass.
+
+    The prefilter is a single alternation of the detectors' distinct
+    triggers. Each hit is turned into a candidate window (or anchor) on which
+    the full pattern of every detector sharing that trigger runs, so the
+    expensive regexes and validators only ever see a small fraction of the
+    buffer.
+
+    With `resolve_overlaps`, a span of text is reported by one detector
+    only: when matches of different detectors overlap, a match that passed
+    a validator wins over those of detectors without one, then the longer
+    match, then the detector registered first.
     """
-    for path in root.rglob("*"):
-        if path.is_file():
-            yield path
 
+    def __init__(
+        self, detectors: Sequence[Detector], resolve_overlaps: bool = False
+    ) -> None:
+        self.detectors: Tuple[Detector, ...] = tuple(detectors)
+        self.resolve_overlaps = resolve_overlaps
+        triggers: Dict[str, List[int]] = {}
+        for index, detector in enumerate(self.detectors):
+            triggers.setdefault(detector.trigger, []).append(index)
+        # Detector indices per prefilter branch, in registration order.
+        self._groups: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(group) for group in triggers.values()
+        )
+        leads = "".join(d.lead for d in self.detectors)
+        branches = "|".join(
+            f"(?P<g{index}>{trigger})" for index, trigger in enumerate(triggers)
+        )
+        # The leading lookahead lets the regex engine skip uninteresting
+        # characters before trying any of the branches.
+        self._prefilter = re.compile(f"(?=[{leads}])(?:{branches})")
+
+        alphabets = "".join(d.alphabet for d in self.detectors)
+        self._last_split = re.compile(f"(?s).*[^{alphabets}]")
+
+        # Identifies what this engine detects, so that stored findings are
+        # never reused across different detector sets, or once a validator's
+        # code changes. Validators and overlap resolution are only listed when
+        # present, which keeps the fingerprint of plain engines (and the
+        # findings stored under it) unchanged.
+        self.fingerprint = hashlib.sha256(
+            json.dumps(
+                [
+                    [d.name, d.pattern.pattern, d.pattern.flags]
+                    + ([_validator_id(d)] if d.validate is not None else [])
+                    for d in self.detectors
+                ]
+                + (["resolve-overlaps"] if resolve_overlaps else [])
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def split_point(self, text: str, pos: int = 0) -> Optional[int]:
+        """
+        Return the largest index after `pos` at which `text` can be split.
+
+        The character just before the split can not be part of any match, so
+        scanning both sides separately gives the same result as scanning the
+        whole. Returns None when `text[pos:]` has no such character.
+        """
+        match = self._last_split.match(text, pos)
+        return match.end() if match else None
+
+    def scan(
+        self, text: str, pos: int = 0, endpos: Optional[int] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Return `(detector name, matched value)` pairs found in `text[pos:endpos]`.
+
+        Pairs are grouped by detector in registration order, and in match order
+        within a detector, exactly as successive `finditer` passes would yield.
+        """
+        return self.flatten(self.find(text, pos, endpos))
+
+    def flatten(self, hits: Sequence[List[str]]) -> List[Tuple[str, str]]:
+        """
+        Turn per-detector match lists into `(detector name, value)` pairs.
+        """
+        return [
+            (detector.name, value)
+            for detector, values in zip(self.detectors, hits)
+            for value in values
+        ]
+
+    def find(
+        self, text: str, pos: int = 0, endpos: Optional[int] = None
+    ) -> List[List[str]]:
+        """
+        Return the matched values in `text[pos:endpos]`, one list per detector.
+        """
+        hits: List[List[str]] = [[] for _ in self.detectors]
+        for index, match in self.iter_matches(text, pos, endpos):
+            hits[index].append(match.group(0))
+        return hits
+
+    def iter_matches(
+        self, text: str, pos: int = 0, endpos: Optional[int] = None
+    ) -> Iterator[Tuple[int, Match[str]]]:
+        """
+        Yield `(detector index, match)` for every match in `text[pos:endpos]`.
+
+        Matches of one detector come in `finditer` order; matches of
+        different detectors are interleaved in prefilter order. Matches
+        rejected by a detector's validator are skipped, and so are those
+        that lose an overlap when `resolve_overlaps` is set.
+        """
+        matches = self._iter_window_matches(text, pos, endpos)
+        if not self.resolve_overlaps:
+            return matches
+        return iter(self._without_overlaps(list(matches)))
+
+    def _without_overlaps(
+        self, matches: List[Tuple[int, Match[str]]]
+    ) -> List[Tuple[int, Match[str]]]:
+        def rank(position: int) -> Tuple[bool, int, int]:
+            index, match = matches[position]
+            validated = self.detectors[index].validate is not None
+            return (not validated, match.start() - match.end(), index)
 
-def scan_dataset_for_pii(dataset_root: Path) -> List[ComplianceFinding]:
+        # Spans kept so far; they are disjoint, so sorted by start and end.
+        starts: List[int] = []
+        ends: List[int] = []
+        kept: List[int] = []
+        for position in sorted(range(len(matches)), key=rank):
+            start, end = matches[position][1].span()
+            slot = bisect_left(starts, end)
+            if slot and ends[slot - 1] > start:
+                continue
+            starts.insert(slot, start)
+            ends.insert(slot, end)
+            kept.append(position)
+        return [matches[position] for position in sorted(kept)]
+
+    def _iter_window_matches(
+        self, text: str, pos: int, endpos: Optional[int]
+    ) -> Iterator[Tuple[int, Match[str]]]:
+        if endpos is None:
+            endpos = len(text)
+
+        # Per-detector resume position, preserving `finditer`'s
+        # non-overlapping semantics for anchored and extended windows.
+        cursors = [pos] * len(self.detectors)
+
+        for hit in self._prefilter.finditer(text, pos, endpos):
+            for index in self._groups[int(hit.lastgroup[1:])]:  # type: ignore[index]
+                detector = self.detectors[index]
+                validate = detector.validate
+                start, end = hit.start(), hit.end()
+                if start < cursors[index]:
+                    continue
+
+                if detector.anchored:
+                    match = detector.pattern.match(text, start, endpos)
+                    if match:
+                        if validate is None or validate(match.group(0)):
+                            yield index, match
+                        cursors[index] = match.end()
+                    continue
+
+                if detector.extend:
+                    extend = detector.extend
+                    while start > cursors[index] and text[start - 1] in extend:
+                        start -= 1
+                    while end < endpos and text[end] in extend:
+                        end += 1
+
+                # `finditer` takes its end position for the end of the text,
+                # where a trailing `\b` or lookahead would always succeed: one
+                # more character lets the pattern see what really follows.
+                # Matches lie within the window, so none can reach into it.
+                for match in detector.pattern.finditer(
+                    text, start, min(end + 1, endpos)
+                ):
+                    if match.end() > end:
+                        break
+                    if validate is None or validate(match.group(0)):
+                        yield index, match
+                cursors[index] = end
+
+
+# Default detectors, in the order their findings are reported.
+#
+# * EMAIL matches never leave a run of `_EMAIL_CHARS` and always contain "@".
+# * PHONE matches never leave a run of digits, whitespace and "+-()." that is at
+#   least 9 characters long, so the trigger itself is the window.
+# * IBAN matches always start with two capitals followed by two digits.
+DEFAULT_DETECTORS: Tuple[Detector, ...] = (
+    Detector(
+        name="EMAIL",
+        pattern=EMAIL_REGEX,
+        trigger="@",
+        lead="@",
+        alphabet=r"a-zA-Z0-9_.+\-@",
+        extend=_EMAIL_CHARS,
+    ),
+    Detector(
+        name="PHONE",
+        pattern=PHONE_REGEX,
+        trigger=r"[+\d\s\-().]{9,}",
+        lead=r"+\d\s\-().",
+        alphabet=r"+\d\s\-().",
+    ),
+    Detector(
+        name="IBAN",
+        pattern=IBAN_REGEX,
+        trigger=r"[A-Z]{2}(?=\d\d)",
+        lead="A-Z",
+        alphabet="A-Z0-9",
+        anchored=True,
+    ),
+)
+
+DEFAULT_ENGINE = DetectorEngine(DEFAULT_DETECTORS)
+
+
+def index_engine_key(
+    sample_rows: int = 0,
+    max_examples: int = 0,
+    engine: DetectorEngine = DEFAULT_ENGINE,
+) -> str:
     """
-    Recursively scan all files under `dataset_root` for simple PII patterns.
+    Key of the stored findings in a `FindingsIndex`: the detector set plus
+    everything else that decides what a file yields (content-sniffing rules,
+    table extraction and its row sampling, and the example cap).
+    """
+    return (
+        f"{engine.fingerprint}:sniffer-{SNIFFER_VERSION}"
+        f":tables-{EXTRACTOR_VERSION}:sample-{sample_rows}"
+        f":examples-{max_examples}"
+    )
+
+
+def _iter_text_segments(
+    blocks: Iterable[bytes],
+    engine: DetectorEngine = DEFAULT_ENGINE,
+    max_carry: int = STREAM_MAX_CARRY,
+) -> Iterator[Tuple[str, int]]:
+    """
+    Decode a stream of byte blocks as `(buffer, start)` text segments to scan
+    from `start`.
+
+    Bytes are decoded incrementally as UTF-8, ignoring errors, which yields the
+    same text as decoding the whole file at once. Each segment ends at an
+    `engine.split_point`; the unscanned tail is carried into the next segment
+    together with one character of look-behind context for word boundaries.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    context = ""
+    carry = ""
+
+    for block in blocks:
+        buffer = context + carry + decoder.decode(block)
+        start = len(context)
+
+        split = engine.split_point(buffer, start)
+        if split is None:
+            if len(buffer) - start < max_carry:
+                carry = buffer[start:]
+                continue
+            split = len(buffer)
+
+        yield buffer[:split], start
+        context = buffer[split - 1 : split]
+        carry = buffer[split:]
+
+    buffer = context + carry + decoder.decode(b"", final=True)
+    if len(buffer) > len(context):
+        yield buffer, len(context)
+
+
+# A `(type, detail, location)` finding within one file. The location is empty
+# for plain text and `column:row` for tables.
+Hit = Tuple[str, str, str]
+
+# Result of scanning one file: its example hits (at most `max_examples` per
+# type, in report order), its number of matches per type, the SHA-256 hex
+# digest of its contents, its size in bytes and its content kind.
+FileScan = Tuple[List[Hit], Dict[str, int], str, int, str]
+
+# Joins the cells of a column batch so that it is scanned as one string. It is
+# outside every default detector's alphabet, so no match spans two cells.
+_CELL_SEPARATOR = "\x00"
+
+
+class _HashingReader(io.RawIOBase):
+    """
+    Binary reader that hashes and counts every byte read through it.
+    """
+
+    def __init__(self, raw: BinaryIO, hasher: Any) -> None:
+        self._raw = raw
+        self._hasher = hasher
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        count = self._raw.readinto(buffer) or 0
+        self._hasher.update(memoryview(buffer)[:count])
+        self.size += count
+        return count
+
+
+class _DetachableReader(io.RawIOBase):
+    """
+    Seekable view of an open file handed to the table readers.
+
+    pyarrow reads ahead on its own I/O threads and may still be reading when
+    a parse error surfaces. Once closed, the view never touches the file
+    again, so the caller can seek and reread it safely.
     """
-    findings: List[ComplianceFinding] = []
 
-    for file_path in _iter_files(dataset_root):
-        contents = _read_text_file(file_path)
-        if not contents:
+    def __init__(self, raw: BinaryIO) -> None:
+        self._raw = raw
+        self._lock = threading.Lock()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        with self._lock:
+            if self.closed:
+                return 0
+            return self._raw.readinto(buffer) or 0
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        with self._lock:
+            if self.closed:
+                raise ValueError("seek on closed file")
+            return self._raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        with self._lock:
+            if self.closed:
+                raise ValueError("tell on closed file")
+            return self._raw.tell()
+
+    def close(self) -> None:
+        # Waits for a read in flight on another thread.
+        with self._lock:
+            super().close()
+
+
+def _scan_columns(
+    columns: Iterable[ColumnBatch],
+    engine: DetectorEngine = DEFAULT_ENGINE,
+    max_examples: int = 0,
+) -> Tuple[List[Hit], Dict[str, int]]:
+    """
+    Scan column batches and return their example hits and match counts.
+
+    Hits are located as `column:row` (or `column:header` for CSV header
+    cells) and ordered by column (first appearance), row and detector. With
+    `max_examples > 0` only the first that many hits per detector are kept.
+    """
+    order: Dict[str, int] = {}
+    located: List[Tuple[int, int, int, int, str]] = []
+    names: List[str] = []
+    counts = [0] * len(engine.detectors)
+    # Hits kept per (detector, column). Rows only grow within a column, so
+    # the first `max_examples` of each are enough to pick the overall first.
+    kept: Dict[Tuple[int, int], int] = {}
+    for name, rows, values in columns:
+        column = order.get(name)
+        if column is None:
+            column = order[name] = len(names)
+            names.append(name)
+        text = _CELL_SEPARATOR.join(values)
+        starts: Optional[List[int]] = None
+        for index, match in engine.iter_matches(text):
+            counts[index] += 1
+            if max_examples:
+                seen = kept.get((index, column), 0)
+                if seen >= max_examples:
+                    continue
+                kept[index, column] = seen + 1
+            if starts is None:
+                starts = list(accumulate((len(v) + 1 for v in values), initial=0))
+            offset = match.start()
+            cell = bisect_right(starts, offset) - 1
+            located.append((column, rows[cell], index, offset, match.group(0)))
+
+    located.sort()
+    taken = [0] * len(engine.detectors)
+    hits: List[Hit] = []
+    for column, row, index, _, value in located:
+        if max_examples and taken[index] >= max_examples:
             continue
+        taken[index] += 1
+        location = f"{names[column]}:{'header' if row == HEADER_ROW else row}"
+        hits.append((engine.detectors[index].name, value, location))
+    return hits, _named_counts(engine, counts)
 
-        relative_path = str(file_path.relative_to(dataset_root))
 
-        for match in EMAIL_REGEX.finditer(contents):
-            findings.append(
-                ComplianceFinding(
-                    type="EMAIL",
-                    path=relative_path,
-                    detail=match.group(0),
-                )
+def _named_counts(engine: DetectorEngine, counts: Sequence[int]) -> Dict[str, int]:
+    return {
+        detector.name: count
+        for detector, count in zip(engine.detectors, counts)
+        if count
+    }
+
+
+def _scan_table(
+    handle: BinaryIO,
+    fmt: str,
+    engine: DetectorEngine,
+    sample_rows: int,
+    chunk_size: int,
+    use_arrow: bool = True,
+    max_examples: int = 0,
+) -> FileScan:
+    """
+    Scan an open table file column by column, hashing all of its bytes.
+
+    Raises TableFormatError if it can not be parsed as `fmt`.
+    """
+    hasher = hashlib.sha256()
+    handle.seek(0)
+    view = _DetachableReader(handle)
+    try:
+        if fmt == PARQUET:
+            columns = iter_columns(fmt, view, sample_rows)
+            hits, counts = _scan_columns(columns, engine, max_examples)
+        else:
+            reader = _HashingReader(view, hasher)
+            source = io.BufferedReader(reader, chunk_size)
+            columns = iter_columns(fmt, source, sample_rows, use_arrow=use_arrow)
+            hits, counts = _scan_columns(columns, engine, max_examples)
+            # Hash whatever the extractor left unread.
+            while source.read(chunk_size):
+                pass
+            return hits, counts, hasher.hexdigest(), reader.size, STRUCTURED
+    finally:
+        view.close()
+
+    # Parquet is read from its footer, so it is hashed in a second pass.
+    handle.seek(0)
+    size = 0
+    for block in iter(lambda: handle.read(chunk_size), b""):
+        hasher.update(block)
+        size += len(block)
+    return hits, counts, hasher.hexdigest(), size, STRUCTURED
+
+
+def _scan_stream(
+    handle: BinaryIO,
+    head: bytes,
+    kind: str,
+    engine: DetectorEngine,
+    chunk_size: int,
+    max_examples: int = 0,
+) -> FileScan:
+    """
+    Scan an open file from its already read first block `head`.
+
+    Only text is decoded and run through the detectors; other kinds are just
+    hashed. With `max_examples > 0` only the first that many values per
+    detector are kept; every match is counted.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    hits: List[List[str]] = [[] for _ in engine.detectors]
+    counts = [0] * len(engine.detectors)
+
+    def read_blocks(block: bytes) -> Iterator[bytes]:
+        nonlocal size
+        while block:
+            hasher.update(block)
+            size += len(block)
+            yield block
+            block = handle.read(chunk_size)
+
+    try:
+        blocks = read_blocks(head)
+        if kind == TEXT:
+            for buffer, start in _iter_text_segments(blocks, engine):
+                for index, match in engine.iter_matches(buffer, start):
+                    counts[index] += 1
+                    if not max_examples or counts[index] <= max_examples:
+                        hits[index].append(match.group(0))
+        else:
+            for _ in blocks:
+                pass
+    except OSError:
+        # A file that fails midway is not scanned at all.
+        return _unreadable_scan()
+    located = [(name, value, "") for name, value in engine.flatten(hits)]
+    return located, _named_counts(engine, counts), hasher.hexdigest(), size, kind
+
+
+def _scan_handle(
+    handle: BinaryIO,
+    suffix: str,
+    engine: DetectorEngine,
+    chunk_size: int,
+    sample_rows: int,
+    max_examples: int = 0,
+) -> FileScan:
+    """
+    Scan an open file from its start, hashing its bytes in the same pass.
+
+    The first block decides the file's content kind. Tables are scanned
+    column by column (see `table_extractors`), other text as a stream, and
+    everything else is only hashed. A file that looks like a table but does
+    not parse as one is scanned according to its sniffed kind instead.
+    """
+    head = handle.read(chunk_size)
+    kind = sniff_content(head, suffix)
+    fmt = table_format(suffix, head, kind)
+    if fmt is None:
+        return _scan_stream(handle, head, kind, engine, chunk_size, max_examples)
+
+    if not handle.seekable():
+        # Table parsing seeks (Parquet footers, retries); archive members
+        # can not, so they are buffered first.
+        with tempfile.SpooledTemporaryFile(TABLE_SPOOL_BYTES) as spool:
+            spool.write(head)
+            shutil.copyfileobj(handle, spool, chunk_size)
+            spool.seek(0)
+            return _scan_handle(
+                spool, suffix, engine, chunk_size, sample_rows, max_examples
             )
 
-        for match in PHONE_REGEX.finditer(contents):
-            findings.append(
-                ComplianceFinding(
-                    type="PHONE",
-                    path=relative_path,
-                    detail=match.group(0),
-                )
+    # A CSV rejected by pyarrow is retried with the stdlib reader.
+    for use_arrow in (True, False) if fmt == CSV else (True,):
+        try:
+            return _scan_table(
+                handle, fmt, engine, sample_rows, chunk_size, use_arrow, max_examples
             )
+        except TableFormatError:
+            pass
+    handle.seek(0)
+    head = handle.read(chunk_size)
+    return _scan_stream(handle, head, kind, engine, chunk_size, max_examples)
+
+
+def _unreadable_scan() -> FileScan:
+    return [], {}, hashlib.sha256().hexdigest(), 0, UNREADABLE
 
-        for match in IBAN_REGEX.finditer(contents):
+
+def _scan_file(
+    path: Path,
+    engine: DetectorEngine = DEFAULT_ENGINE,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    sample_rows: int = 0,
+    max_examples: int = 0,
+) -> FileScan:
+    """
+    Scan one file in streaming mode, hashing its bytes in the same pass.
+    """
+    try:
+        with path.open("rb") as handle:
+            return _scan_handle(
+                handle,
+                path.suffix.lower(),
+                engine,
+                chunk_size,
+                sample_rows,
+                max_examples,
+            )
+    except OSError:
+        # Files that can not be opened are not scanned.
+        return _unreadable_scan()
+
+
+def _iter_scans(
+    entries: Sequence[FileEntry],
+    sample_rows: int = 0,
+    archive: Optional[Path] = None,
+    max_examples: int = 0,
+    engine: DetectorEngine = DEFAULT_ENGINE,
+) -> Iterator[Tuple[FileEntry, FileScan]]:
+    """
+    Scan `entries` and yield each with its result as soon as it is scanned.
+
+    Files are scanned in `entries` order. The members of an `archive` are
+    streamed from it in one pass, in archive order; members that can not be
+    opened come last and are reported `UNREADABLE`.
+    """
+    if archive is None:
+        for entry in entries:
+            yield entry, _scan_file(
+                entry.path,
+                engine,
+                sample_rows=sample_rows,
+                max_examples=max_examples,
+            )
+        return
+
+    by_member = {entry.member: entry for entry in entries}
+    for index, stream in iter_members(archive, list(by_member)):
+        entry = by_member.pop(index)
+        yield entry, _scan_handle(
+            stream,
+            entry.suffix,
+            engine,
+            STREAM_CHUNK_SIZE,
+            sample_rows,
+            max_examples,
+        )
+    for entry in by_member.values():
+        yield entry, _unreadable_scan()
+
+
+def _scan_entries(
+    entries: Sequence[FileEntry],
+    sample_rows: int = 0,
+    archive: Optional[Path] = None,
+    max_examples: int = 0,
+    engine: DetectorEngine = DEFAULT_ENGINE,
+) -> List[FileScan]:
+    """
+    Scan `entries` and return their results in the same order.
+
+    This is the unit of work handed to pool workers, so it returns plain
+    tuples that are cheap to pickle.
+    """
+    results = {
+        entry.path: scan
+        for entry, scan in _iter_scans(
+            entries, sample_rows, archive, max_examples, engine
+        )
+    }
+    return [results[entry.path] for entry in entries]
+
+
+def _batch_by_size(
+    entries: Sequence[FileEntry], batch_bytes: int = POOL_BATCH_BYTES
+) -> List[List[FileEntry]]:
+    """
+    Split `entries` into batches of one file, or of small files totalling at
+    most `batch_bytes`, largest files first.
+    """
+    batches: List[List[FileEntry]] = []
+    total = batch_bytes
+    for entry in sorted(entries, key=lambda entry: entry.size, reverse=True):
+        if total + entry.size > batch_bytes:
+            batches.append([])
+            total = 0
+        batches[-1].append(entry)
+        total += entry.size
+    return batches
+
+
+def _scan_files_parallel(
+    entries: Sequence[FileEntry],
+    workers: int,
+    on_scan: Optional[Callable[[FileEntry, FileScan], None]] = None,
+    sample_rows: int = 0,
+    archive: Optional[Path] = None,
+    max_examples: int = 0,
+    engine: DetectorEngine = DEFAULT_ENGINE,
+) -> List[FileScan]:
+    """
+    Scan `entries` on a process pool and return results in `entries` order.
+
+    `on_scan` is called with each entry and its result as its batch (see
+    `_batch_by_size`) completes. With a zip `archive`, every task opens its
+    own members in it.
+    """
+    batches = _batch_by_size(entries)
+
+    results: Dict[Path, FileScan] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+        futures = {
+            pool.submit(
+                _scan_entries, batch, sample_rows, archive, max_examples, engine
+            ): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            for entry, scan in zip(futures[future], future.result()):
+                results[entry.path] = scan
+                if on_scan is not None:
+                    on_scan(entry, scan)
+
+    return [results[entry.path] for entry in entries]
+
+
+class FileFindings:
+    """
+    Aggregated findings of one file.
+
+    `counts` maps each finding type to its number of matches in the file;
+    `examples` holds the first matches, as `(type, value, location)` hits
+    in report order, at most `max_examples` per type. Plain slots and tuples
+    keep millions of matches out of per-finding objects; the Pydantic models
+    are only built for the response (see `build_report_findings`).
+    """
+
+    __slots__ = ("path", "counts", "examples")
+
+    def __init__(
+        self, path: str, counts: Dict[str, int], examples: List[Hit]
+    ) -> None:
+        self.path = path
+        self.counts = counts
+        self.examples = examples
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+class DatasetScan:
+    """
+    Result of scanning a dataset.
+
+    `files` holds the `FileFindings` of the files with findings, in sorted
+    path order. `digests` maps the relative POSIX path of every file to the
+    SHA-256 hex digest of its contents, read in the same pass (see
+    `merkle.MerkleTree`). `unscanned` lists the `(path, kind)` of the files
+    whose contents were not run through the detectors (see
+    `UNSCANNED_KINDS`), in sorted path order.
+    """
+
+    __slots__ = ("files", "digests", "unscanned")
+
+    def __init__(
+        self,
+        files: List[FileFindings],
+        digests: Dict[str, str],
+        unscanned: List[Tuple[str, str]],
+    ) -> None:
+        self.files = files
+        self.digests = digests
+        self.unscanned = unscanned
+
+
+def scan_dataset_for_pii(
+    dataset_root: Path,
+    workers: int = 1,
+    index: Optional[FindingsIndex] = None,
+    on_file: Optional[Callable[[int, str], None]] = None,
+    inventory: Optional[DatasetInventory] = None,
+    sample_rows: int = 0,
+    max_examples: int = 0,
+    on_findings: Optional[Callable[[int, FileFindings], None]] = None,
+    engine: DetectorEngine = DEFAULT_ENGINE,
+    digests: Optional[Mapping[str, str]] = None,
+) -> DatasetScan:
+    """
+    Recursively scan all files under `dataset_root` for simple PII patterns.
+
+    `dataset_root` may also be a dataset archive, whose members are streamed
+    from it without extraction. Files with findings are returned in sorted
+    path order, along with the content digest of every file. With
+    `workers > 1` files are scanned on a process pool of that size; the
+    findings are the same. With an `index`, unchanged files reuse their
+    recorded findings and digest, and only new or modified files are read.
+    Pass the request's `inventory` to avoid walking the tree again. With
+    `sample_rows > 0`, only that many rows of each table are scanned. With
+    `max_examples > 0`, only the first that many matches per type and file
+    are kept as examples; every match is still counted.
+
+    `on_findings` is called with the position of each file with findings in
+    the inventory and its `FileFindings` as soon as the file is accounted
+    for, in completion order rather than path order.
+
+    `engine` holds the detectors of the request's policy (see
+    `policies.compile_policy`); findings recorded in the `index` are only
+    reused under the same detectors.
+
+    `digests` are the content digests of the files read by `hash_dataset`,
+    keyed like `DatasetScan.digests`. The `index` is then looked up by these
+    digests rather than by stat, and the findings of a file whose contents
+    no longer hash to its digest are not passed to `on_findings` (the
+    returned `digests` tell the caller the dataset changed).
+    """
+    if inventory is None:
+        inventory = build_inventory(dataset_root)
+    engine_key = index_engine_key(sample_rows, max_examples, engine)
+    results: Dict[Path, Tuple[List[Hit], Dict[str, int], str, str]] = {}
+    pending: List[FileEntry] = []
+    positions = {entry.path: position for position, entry in enumerate(inventory.files)}
+
+    def account(
+        entry: FileEntry, hits: List[Hit], counts: Dict[str, int], size: int, kind: str
+    ) -> None:
+        if on_file is not None:
+            on_file(size, kind)
+        if on_findings is not None and counts:
+            on_findings(
+                positions[entry.path], FileFindings(entry.relative_path, counts, hits)
+            )
+
+    def account_scan(entry: FileEntry, scan: FileScan) -> None:
+        hits, counts = scan[0], scan[1]
+        if digests is not None and scan[2] != digests[_posix_path(entry)]:
+            hits, counts = [], {}
+        account(entry, hits, counts, scan[3], scan[4])
+
+    for entry in inventory.files:
+        if index is not None and digests is not None:
+            digest = digests[_posix_path(entry)]
+            found = index.lookup_content(digest, engine_key)
+            if found is not None:
+                hits, counts, kind = found
+                results[entry.path] = hits, counts, digest, kind
+                account(entry, hits, counts, entry.size, kind)
+                continue
+        elif index is not None:
+            cached = index.lookup(entry.key, engine_key)
+            if cached is not None:
+                hits, counts, digest, kind = cached
+                results[entry.path] = hits, counts, digest, kind
+                account(entry, hits, counts, entry.size, kind)
+                continue
+        pending.append(entry)
+
+    archive = inventory.root if inventory.archive else None
+    # A tar archive is read from the start by every task that opens it.
+    pooled = archive is None or is_zip_archive(archive)
+    if workers > 1 and len(pending) > 1 and pooled:
+        scanned = _scan_files_parallel(
+            pending, workers, account_scan, sample_rows, archive, max_examples, engine
+        )
+    else:
+        by_path: Dict[Path, FileScan] = {}
+        for entry, scan in _iter_scans(
+            pending, sample_rows, archive, max_examples, engine
+        ):
+            by_path[entry.path] = scan
+            account_scan(entry, scan)
+        scanned = [by_path[entry.path] for entry in pending]
+
+    for entry, (hits, counts, digest, _, kind) in zip(pending, scanned):
+        results[entry.path] = hits, counts, digest, kind
+        # A read failure says nothing about the contents; retry it next time.
+        if index is not None and kind != UNREADABLE:
+            index.store(entry.key, digest, engine_key, hits, counts, kind)
+
+    files: List[FileFindings] = []
+    scanned_digests: Dict[str, str] = {}
+    unscanned: List[Tuple[str, str]] = []
+    for entry in inventory.files:
+        hits, counts, digest, kind = results[entry.path]
+        if counts:
+            files.append(FileFindings(entry.relative_path, counts, hits))
+        if kind in UNSCANNED_KINDS:
+            unscanned.append((entry.relative_path, kind))
+        scanned_digests[_posix_path(entry)] = digest
+    return DatasetScan(files, scanned_digests, unscanned)
+
+
+def _posix_path(entry: FileEntry) -> str:
+    return entry.relative_path.replace(os.sep, "/")
+
+
+def _hash_entries(
+    entries: Sequence[FileEntry],
+    archive: Optional[Path] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> List[str]:
+    """
+    Return the SHA-256 hex digests of the contents of `entries`, in the same
+    order; files and archive members that can not be read hash as empty,
+    like their scan.
+
+    This is the unit of work handed to pool workers by `hash_dataset`.
+    """
+
+    def digest(handle: BinaryIO) -> str:
+        hasher = hashlib.sha256()
+        for block in iter(lambda: handle.read(chunk_size), b""):
+            hasher.update(block)
+        return hasher.hexdigest()
+
+    empty = _unreadable_scan()[2]
+    if archive is None:
+        digests: List[str] = []
+        for entry in entries:
+            try:
+                with entry.path.open("rb") as handle:
+                    digests.append(digest(handle))
+            except OSError:
+                digests.append(empty)
+        return digests
+
+    by_member = {entry.member: entry.path for entry in entries}
+    found: Dict[Path, str] = {}
+    for index, stream in iter_members(archive, list(by_member)):
+        found[by_member[index]] = digest(stream)
+    return [found.get(entry.path, empty) for entry in entries]
+
+
+def hash_dataset(inventory: DatasetInventory, workers: int = 1) -> Dict[str, str]:
+    """
+    Return the SHA-256 hex digest of the contents of every file of the
+    dataset, keyed like `DatasetScan.digests`.
+
+    Every byte is read and hashed, whatever a `FindingsIndex` recorded, so
+    the digests can be checked against the request's Merkle root before
+    anything is scanned. With `workers > 1` the files are hashed on a
+    process pool, in the same batches as the scan; a tar archive is hashed
+    in one pass by a single process, like its scan.
+    """
+    entries = inventory.files
+    archive = inventory.root if inventory.archive else None
+    pooled = archive is None or is_zip_archive(archive)
+    if workers > 1 and len(entries) > 1 and pooled:
+        hashed: Dict[Path, str] = {}
+        batches = _batch_by_size(entries)
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+            futures = {
+                pool.submit(_hash_entries, batch, archive): batch for batch in batches
+            }
+            for future in as_completed(futures):
+                for entry, digest in zip(futures[future], future.result()):
+                    hashed[entry.path] = digest
+        digests = [hashed[entry.path] for entry in entries]
+    else:
+        digests = _hash_entries(entries, archive)
+    return {_posix_path(entry): digest for entry, digest in zip(entries, digests)}
+
+
+def build_report_findings(
+    files: Iterable[FileFindings],
+) -> Tuple[List[ComplianceFinding], List[FindingCount], int]:
+    """
+    Build the report's example findings, per-file counts and total count.
+
+    Examples in tables are reported with a `path#column:row` path. Counts
+    are listed per file, then per type in detector order.
+    """
+    findings: List[ComplianceFinding] = []
+    counts: List[FindingCount] = []
+    total = 0
+    for file in files:
+        for finding_type, detail, location in file.examples:
             findings.append(
                 ComplianceFinding(
-                    type="IBAN",
-                    path=relative_path,
-                    detail=match.group(0),
+                    type=finding_type,
+                    path=f"{file.path}#{location}" if location else file.path,
+                    detail=detail,
                 )
             )
-
-    return findings
+        for finding_type, count in file.counts.items():
+            counts.append(FindingCount(type=finding_type, path=file.path, count=count))
+            total += count
+    return findings, counts, total
 
 
 def compute_verdict_and_score(
-    findings: Iterable[ComplianceFinding],
+    count: int, warn_at: int = 1, block_at: int = 3
 ) -> Tuple[str, int]:
     """
     Compute a coarse verdict and score based on the number of findings.
 
-    Rules:
+    `count` is the total number of matches, not just the reported examples.
+    The thresholds are set per policy (see `policies`).
+
+    Rules (with the default thresholds):
     - 0 findings  -> verdict="ALLOW", score=100
     - <3 findings -> verdict="WARN",  score=70
     - >=3         -> verdict="BLOCK", score=20
     """
-    findings_list = list(findings)
-    count = len(findings_list)
-
-    if count == 0:
-        return "ALLOW", 100
-    if count < 3:
+    if count >= block_at:
+        return "BLOCK", 20
+    if count >= warn_at:
         return "WARN", 70
-    return "BLOCK", 20
+    return "ALLOW", 100
 
 
@@ -0,0 +1,191 @@
+"""
+Registry of PII detection policies, keyed by `policyVersion`.
+
+A policy is the set of detectors a report is produced with, plus the
+thresholds that turn its total number of findings into a verdict:
+
+* `v1`: the original email, phone and IBAN regexes, without validation.
+* `v2`: the same, but an IBAN must also pass the ISO 13616 mod-97 checksum,
+  and payment card numbers (`CARD`) are detected and must pass the Luhn
+  check. Overlapping matches are counted once (see `PolicySpec`), so a card
+  number is a `CARD`, not also a `PHONE`.
+
+Policy versions that are not registered are analysed under
+`DEFAULT_POLICY_VERSION`, as every version was before policies existed.
+
+All the detectors of a policy run in the single prefilter pass of one
+`DetectorEngine`: `CARD` shares the phone detector's trigger, so it adds no
+pass over the data, and validators only run on the matches of a detector's
+pattern within the prefilter's candidate windows. A policy's fingerprint
+covers the source of its validators, so editing `iban_checksum_valid` or
+`luhn_valid` invalidates the reports and findings cached under it.
+
+`compile_policy` builds a policy's engine (its combined prefilter and split
+regexes) once; compiled policies are kept in an LRU cache of
+`POLICY_CACHE_SIZE` entries keyed by policy version. `register_policy` adds
+or replaces a policy and drops the compiled ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from .pii_scanner import (
+    DEFAULT_DETECTORS,
+    Detector,
+    DetectorEngine,
+    compute_verdict_and_score,
+)
+
+DEFAULT_POLICY_VERSION = "v1"
+
+# Number of compiled policies kept in memory.
+POLICY_CACHE_SIZE = 16
+
+# 13 to 19 digits, optionally grouped by single spaces or dashes.
+CARD_REGEX = re.compile(r"\b\d(?:[ \-]?\d){12,18}\b")
+
+
+def iban_checksum_valid(value: str) -> bool:
+    """
+    Return True if `value` passes the IBAN mod-97 check (ISO 13616).
+
+    The first four characters are moved to the end, letters are replaced by
+    their values 10 to 35, and the resulting number must be 1 modulo 97.
+    """
+    rearranged = value[4:] + value[:4]
+    remainder = 0
+    for char in rearranged:
+        digits = str(int(char, 36))
+        remainder = (remainder * 10 ** len(digits) + int(digits)) % 97
+    return remainder == 1
+
+
+def luhn_valid(value: str) -> bool:
+    """
+    Return True if the digits of `value` pass the Luhn check.
+    """
+    digits = [int(char) for char in value if char.isdigit()]
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        if position % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+EMAIL_DETECTOR, PHONE_DETECTOR, IBAN_DETECTOR = DEFAULT_DETECTORS
+
+# Card numbers only contain digits, spaces and dashes, so every one lies
+# within a phone trigger hit; the two detectors share that prefilter branch.
+CARD_DETECTOR = Detector(
+    name="CARD",
+    pattern=CARD_REGEX,
+    trigger=PHONE_DETECTOR.trigger,
+    lead=PHONE_DETECTOR.lead,
+    alphabet=r"\d \-",
+    validate=luhn_valid,
+)
+
+
+@dataclass(frozen=True)
+class PolicySpec:
+    """
+    Declaration of a policy: its detectors, in the order their findings are
+    reported, and its verdict thresholds.
+
+    A dataset is flagged WARN from `warn_at` findings and BLOCK from
+    `block_at` findings (see `compute_verdict_and_score`). With
+    `resolve_overlaps`, text matched by several detectors is one finding,
+    attributed as described in `DetectorEngine`.
+    """
+
+    detectors: Tuple[Detector, ...]
+    warn_at: int = 1
+    block_at: int = 3
+    resolve_overlaps: bool = False
+
+    def __post_init__(self) -> None:
+        names = [detector.name for detector in self.detectors]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate detector names in policy: {names}")
+        if not 1 <= self.warn_at <= self.block_at:
+            raise ValueError(
+                f"Invalid thresholds: warn_at={self.warn_at},"
+                f" block_at={self.block_at}"
+            )
+
+
+_POLICIES: Dict[str, PolicySpec] = {
+    "v1": PolicySpec(DEFAULT_DETECTORS),
+    "v2": PolicySpec(
+        (
+            EMAIL_DETECTOR,
+            PHONE_DETECTOR,
+            replace(IBAN_DETECTOR, validate=iban_checksum_valid),
+            CARD_DETECTOR,
+        ),
+        resolve_overlaps=True,
+    ),
+}
+
+
+class CompiledPolicy:
+    """
+    A policy ready to scan with: its `DetectorEngine` and thresholds.
+
+    `fingerprint` identifies everything that shapes a report under this
+    policy, so that cached reports are never reused once it changes.
+    """
+
+    __slots__ = ("version", "engine", "spec", "fingerprint")
+
+    def __init__(self, version: str, spec: PolicySpec) -> None:
+        self.version = version
+        self.spec = spec
+        self.engine = DetectorEngine(spec.detectors, spec.resolve_overlaps)
+        self.fingerprint = hashlib.sha256(
+            json.dumps(
+                [self.engine.fingerprint, spec.warn_at, spec.block_at]
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def verdict_and_score(self, count: int) -> Tuple[str, int]:
+        """
+        Compute the verdict and score for `count` findings.
+        """
+        spec = self.spec
+        return compute_verdict_and_score(count, spec.warn_at, spec.block_at)
+
+
+@lru_cache(maxsize=POLICY_CACHE_SIZE)
+def _compile(version: str) -> CompiledPolicy:
+    return CompiledPolicy(version, _POLICIES[version])
+
+
+def compile_policy(policy_version: str) -> CompiledPolicy:
+    """
+    Return the compiled policy for `policy_version`, building it on first use.
+
+    Unregistered versions get the `DEFAULT_POLICY_VERSION` policy.
+    """
+    if policy_version not in _POLICIES:
+        policy_version = DEFAULT_POLICY_VERSION
+    return _compile(policy_version)
+
+
+def register_policy(policy_version: str, spec: PolicySpec) -> None:
+    """
+    Add or replace the policy for `policy_version`.
+
+    Validators must be module-level functions (see `Detector`).
+    """
+    _POLICIES[policy_version] = spec
+    _compile.cache_clear()
@@ -0,0 +1,163 @@
+"""
+Persistent, size-bounded cache of compliance reports.
+
+Reports are content-addressed: the key is derived from the Merkle root that
+the enclave computed from the dataset contents (never the root a request
+claims) plus the policy and model versions (and the findings example cap, the
+table row sampling, the policy's fingerprint, the weapon sample size and the
+gun detector, which shape the report), so the same dataset analysed under the
+same policy is only scanned once. Each
+entry is a JSON file named after the key; reading an entry refreshes its
+mtime, and the least recently used entries are evicted once the directory
+grows past `max_bytes`.
+
+Only the report is cached, plus the file digests of each analysed dataset so
+that Merkle inclusion proofs can be served later. Nonces and signatures are
+produced fresh for every response by the caller.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .merkle import normalize_root
+
+
+def report_cache_key(
+    dataset_merkle_root: str,
+    policy_version: str,
+    model_version: str,
+    max_examples: int = 0,
+    policy_fingerprint: str = "",
+    sample_rows: int = 0,
+    weapon_sample_size: int = 0,
+    gun_detector: str = "",
+) -> str:
+    """
+    Derive the cache key for a dataset/policy/model combination and the
+    number of example findings listed per type and file.
+
+    `policy_fingerprint` identifies the detectors and thresholds the policy
+    version currently maps to (see `policies.CompiledPolicy`); `sample_rows`
+    is the number of table rows scanned per file (0 for all).
+    `weapon_sample_size` is the number of images checked for weapons and
+    `gun_detector` the backend and weights that check them (see
+    `weapon_and_claude.gun_detector_version`).
+    """
+    material = json.dumps(
+        [
+            dataset_merkle_root,
+            policy_version,
+            model_version,
+            max_examples,
+            policy_fingerprint,
+            sample_rows,
+            weapon_sample_size,
+            gun_detector,
+        ],
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return hashlib.sha256(material).hexdigest()
+
+
+def merkle_cache_key(dataset_merkle_root: str) -> str:
+    """
+    Derive the cache key of the file digests of the dataset with the given
+    Merkle root, from which inclusion proofs are served.
+    """
+    material = json.dumps(
+        ["merkle", normalize_root(dataset_merkle_root)], separators=(",", ":")
+    ).encode("utf-8")
+    return hashlib.sha256(material).hexdigest()
+
+
+class ReportCache:
+    """
+    On-disk LRU cache mapping a key to a JSON-serialisable report dict.
+
+    A `max_bytes` of 0 disables the cache: `get` always misses and `put` is a
+    no-op.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached value for `key`, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                value = json.load(handle)
+            # Mark as recently used for eviction purposes.
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store `value` under `key`, then evict old entries if over budget.
+        """
+        if not self.enabled:
+            return
+
+        data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write atomically so concurrent readers never see partial files.
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, self._entry_path(key))
+            except OSError:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                return
+            self._evict()
+
+    def _evict(self) -> None:
+        entries: List[Tuple[float, int, Path]] = []
+        total = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort(key=lambda entry: entry[0])
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
@@ -0,0 +1,508 @@
+"""
+Column extractors for tabular dataset files.
+
+Scanning the raw text of a table loses track of which column a value came
+from, and wastes regex time on numbers, delimiters and quoting. The
+extractors here stream a table in row batches and yield its string cells
+column by column:
+
+* CSV / TSV with pyarrow's streaming CSV reader, or the stdlib `csv` reader
+  when pyarrow is not installed. The dialect is sniffed from the first block
+  and the first row is the header. CSV has no types, so every column is
+  treated as a string column.
+* JSONL / NDJSON with `json`, one object per line. Nested values are
+  flattened into column names such as `user.email` or `tags[0]`. Strings and
+  numbers (as their JSON text) are kept, and so are object keys, in columns
+  such as `user{0}` for the first key of `user` (`{0}` at the top level).
+  Lines longer than `MAX_ROW_BYTES` are not parsed: like a CSV row that does
+  not fit pyarrow's read block, they raise TableFormatError, and the caller
+  scans the file as text instead.
+* Parquet with pyarrow, reading only the top-level string columns. Without
+  pyarrow, Parquet files can not be extracted.
+
+With `sample_rows > 0`, at most that many rows per table are yielded. They
+are picked by a seeded uniform sample (drawn up front for Parquet, whose row
+count is in its footer, and with a reservoir otherwise), so the same file
+always yields the same rows, and only picked rows become Python strings.
+
+Row numbers are 0-based data-row indices: the CSV header and blank lines are
+not counted, and JSONL rows are numbered by line. The CSV header cells are
+yielded too (a "header" is often the first data row of a headerless file),
+first and never sampled out, with row number `HEADER_ROW`.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import itertools
+import json
+import math
+import random
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .content_sniffer import STRUCTURED, TEXT
+
+CSV = "csv"
+JSONL = "jsonl"
+PARQUET = "parquet"
+
+# Text-based tables are recognised by suffix, Parquet by its magic bytes.
+TEXT_TABLE_SUFFIXES: Dict[str, str] = {
+    ".csv": CSV,
+    ".tsv": CSV,
+    ".jsonl": JSONL,
+    ".ndjson": JSONL,
+}
+
+# Rows per batch for the stdlib readers and Parquet.
+TABLE_BATCH_ROWS = 4096
+
+# Characters of a CSV file used to detect its dialect and header.
+_CSV_SNIFF_CHARS = 8192
+
+# Bump whenever extraction changes what is yielded for a given file.
+EXTRACTOR_VERSION = 2
+
+# Longest JSONL line parsed, and pyarrow's CSV read block: a CSV row must fit
+# in one block.
+MAX_ROW_BYTES = 1 << 20
+
+# Row number of the CSV header cells.
+HEADER_ROW = -1
+
+# (column name, row number of each value, values)
+ColumnBatch = Tuple[str, Sequence[int], List[str]]
+
+
+class TableFormatError(ValueError):
+    """
+    Raised when a file can not be read as the table format it looks like.
+    """
+
+
+def table_format(suffix: str, head: bytes, kind: str) -> Optional[str]:
+    """
+    Return the table format of a file, or None if it is not a table.
+
+    `suffix` is the lowercase file suffix, `head` the file's first block and
+    `kind` its sniffed content kind.
+    """
+    if kind == STRUCTURED and head.startswith(b"PAR1"):
+        return PARQUET
+    if kind == TEXT:
+        return TEXT_TABLE_SUFFIXES.get(suffix)
+    return None
+
+
+def iter_columns(
+    fmt: str,
+    source: BinaryIO,
+    sample_rows: int = 0,
+    batch_rows: int = TABLE_BATCH_ROWS,
+    use_arrow: bool = True,
+) -> Iterator[ColumnBatch]:
+    """
+    Yield the string cells of a table as column batches.
+
+    `source` is a binary stream positioned at the start of the file; it must
+    support `peek` for CSV and `seek` for Parquet. Raises TableFormatError if
+    the content can not be parsed.
+
+    pyarrow's CSV reader rejects some files the stdlib reader accepts (ragged
+    rows, invalid UTF-8); when it raises, the caller can retry from the start
+    with `use_arrow=False`, which yields what pyarrow would have yielded.
+    """
+    try:
+        import pyarrow as pa
+
+        arrow_errors: Tuple[type, ...] = (pa.ArrowException,)
+    except ImportError:
+        arrow_errors = ()
+
+    try:
+        # Row count, when the format records it up front.
+        total: Optional[int] = None
+        batches: Iterable[Any]
+        if fmt == PARQUET:
+            total, batches = _parquet_batches(source, batch_rows)
+        elif fmt == CSV:
+            header, batches = _csv_batches(source, batch_rows, use_arrow)
+            yield from header
+        else:
+            batches = _jsonl_batches(source, batch_rows)
+
+        if sample_rows > 0:
+            yield from _sampled_columns(batches, sample_rows, batch_rows, total)
+        else:
+            for batch in batches:
+                yield from batch.columns()
+    except (csv.Error, json.JSONDecodeError, UnicodeError, *arrow_errors) as exc:
+        raise TableFormatError(f"Unreadable {fmt} content: {exc}") from exc
+
+
+class _ListBatch:
+    """
+    CSV rows from the stdlib reader, as lists of cells.
+    """
+
+    def __init__(
+        self, numbers: Sequence[int], names: List[str], rows: List[List[str]]
+    ) -> None:
+        self.numbers = numbers
+        self._names = names
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def columns(self) -> Iterator[ColumnBatch]:
+        width = max(len(row) for row in self._rows)
+        self._names.extend(
+            f"column{index}" for index in range(len(self._names), width)
+        )
+        cells = [
+            row if len(row) == width else row + [""] * (width - len(row))
+            for row in self._rows
+        ]
+        for name, values in zip(self._names, zip(*cells)):
+            yield name, self.numbers, list(values)
+
+    def rows(self, offsets: Sequence[int]) -> List[Dict[str, str]]:
+        width = max(len(self._rows[offset]) for offset in offsets)
+        self._names.extend(
+            f"column{index}" for index in range(len(self._names), width)
+        )
+        return [dict(zip(self._names, self._rows[offset])) for offset in offsets]
+
+
+class _DictBatch:
+    """
+    JSONL rows, as flattened `{column: value}` dicts.
+    """
+
+    def __init__(self, numbers: Sequence[int], rows: List[Dict[str, str]]) -> None:
+        self.numbers = numbers
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def columns(self) -> Iterator[ColumnBatch]:
+        return _dict_columns(zip(self.numbers, self._rows))
+
+    def rows(self, offsets: Sequence[int]) -> List[Dict[str, str]]:
+        return [self._rows[offset] for offset in offsets]
+
+
+class _ArrowBatch:
+    """
+    A pyarrow record batch of string columns.
+    """
+
+    def __init__(self, first: int, batch: Any) -> None:
+        self.numbers = range(first, first + batch.num_rows)
+        self._batch = batch
+
+    def __len__(self) -> int:
+        return self._batch.num_rows
+
+    def columns(self) -> Iterator[ColumnBatch]:
+        for name, array in zip(self._batch.schema.names, self._batch.columns):
+            yield name, self.numbers, [value or "" for value in array.to_pylist()]
+
+    def rows(self, offsets: Sequence[int]) -> List[Dict[str, str]]:
+        import pyarrow as pa
+
+        rows = self._batch.take(pa.array(offsets, type=pa.int64())).to_pylist()
+        return [{name: value or "" for name, value in row.items()} for row in rows]
+
+
+def _dict_columns(
+    rows: Iterable[Tuple[int, Dict[str, str]]],
+) -> Iterator[ColumnBatch]:
+    """
+    Yield `(row number, {column: value})` rows column by column, in order of
+    first appearance.
+    """
+    columns: Dict[str, Tuple[List[int], List[str]]] = {}
+    for number, cells in rows:
+        for name, value in cells.items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = ([], [])
+            column[0].append(number)
+            column[1].append(value)
+    for name, (numbers, values) in columns.items():
+        yield name, numbers, values
+
+
+class _Reservoir:
+    """
+    Seeded reservoir sampler (Algorithm L) deciding which rows to keep.
+
+    The next kept row is drawn as a geometric skip, so the cost grows with
+    the number of kept rows rather than with the table size, and the picks
+    do not depend on how rows are batched.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._rng = random.Random(0)
+        self._weight = math.exp(math.log(self._uniform()) / size)
+        # Index of the next row to keep once the reservoir is full.
+        self._next = size + self._skip()
+
+    def _uniform(self) -> float:
+        return max(self._rng.random(), 1e-300)
+
+    def _skip(self) -> int:
+        return int(math.log(self._uniform()) / math.log(1 - self._weight))
+
+    def picks(self, first: int, count: int) -> Dict[int, int]:
+        """
+        Return `{slot: row index}` for the kept rows among rows
+        `first .. first + count - 1`; a later row taking a slot wins.
+        """
+        picked: Dict[int, int] = {}
+        for index in range(first, min(first + count, self.size)):
+            picked[index] = index
+        while self._next < first + count:
+            picked[self._rng.randrange(self.size)] = self._next
+            self._weight *= math.exp(math.log(self._uniform()) / self.size)
+            self._next += self._skip() + 1
+        return picked
+
+
+class _FixedSample:
+    """
+    Seeded uniform sample of `size` rows out of a known `total`, with the
+    same `picks` interface as `_Reservoir`.
+    """
+
+    def __init__(self, size: int, total: int) -> None:
+        self._indices = sorted(random.Random(0).sample(range(total), min(size, total)))
+        self._cursor = 0
+
+    def picks(self, first: int, count: int) -> Dict[int, int]:
+        picked: Dict[int, int] = {}
+        indices = self._indices
+        while self._cursor < len(indices) and indices[self._cursor] < first + count:
+            picked[self._cursor] = indices[self._cursor]
+            self._cursor += 1
+        return picked
+
+
+def _sampled_columns(
+    batches: Iterable[Any], size: int, batch_rows: int, total: Optional[int] = None
+) -> Iterator[ColumnBatch]:
+    """
+    Sample `size` rows out of `batches` and yield them as columns, in row
+    order. With the row `total` known the sample is drawn up front, otherwise
+    with a reservoir.
+    """
+    sampler = _Reservoir(size) if total is None else _FixedSample(size, total)
+    sample: List[Tuple[int, Dict[str, str]]] = []
+    first = 0
+    for batch in batches:
+        picks = sampler.picks(first, len(batch))
+        if picks:
+            offsets = sorted({index - first for index in picks.values()})
+            rows = dict(zip(offsets, batch.rows(offsets)))
+            for slot, index in picks.items():
+                offset = index - first
+                row = (batch.numbers[offset], rows[offset])
+                if slot == len(sample):
+                    sample.append(row)
+                else:
+                    sample[slot] = row
+        first += len(batch)
+
+    sample.sort(key=lambda row: row[0])
+    for start in range(0, len(sample), batch_rows):
+        yield from _dict_columns(sample[start : start + batch_rows])
+
+
+def _column_names(header: Sequence[str]) -> List[str]:
+    """
+    Make CSV header names usable as unique column names.
+    """
+    names: List[str] = []
+    seen = set()
+    for index, raw in enumerate(header):
+        name = raw.strip() or f"column{index}"
+        if name in seen:
+            name = f"{name}.{index}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _csv_batches(
+    source: Any, batch_rows: int, use_arrow: bool
+) -> Tuple[List[ColumnBatch], Iterator[Any]]:
+    """
+    Sniff the dialect and header of a CSV file and return the header cells as
+    column batches, and an iterator over its row batches.
+    """
+    sample = source.peek(_CSV_SNIFF_CHARS)[:_CSV_SNIFF_CHARS]
+    text = sample.decode("utf-8", errors="ignore").lstrip("\ufeff")
+    # The sniffer is slow on long input; a few complete lines are enough.
+    lines = text[: text.rfind("\n") + 1] or text
+    try:
+        dialect: Any = csv.Sniffer().sniff(lines, delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel_tab if "\t" in text.split("\n", 1)[0] else csv.excel
+    header = next(csv.reader(io.StringIO(lines, newline=""), dialect), None)
+    if header is None:
+        return [], iter(())
+    names = _column_names(header)
+    header_cells: List[ColumnBatch] = [
+        (name, (HEADER_ROW,), [cell]) for name, cell in zip(names, header) if cell
+    ]
+
+    try:
+        if not use_arrow:
+            raise ImportError
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return header_cells, _stdlib_csv_batches(source, dialect, names, batch_rows)
+
+    reader = pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(
+            column_names=names, skip_rows=1, block_size=MAX_ROW_BYTES
+        ),
+        parse_options=pa_csv.ParseOptions(
+            delimiter=dialect.delimiter,
+            quote_char=dialect.quotechar or False,
+            double_quote=dialect.doublequote,
+            escape_char=dialect.escapechar or False,
+            newlines_in_values=True,
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in names}
+        ),
+    )
+    return header_cells, _arrow_batches(reader)
+
+
+def _arrow_batches(batches: Iterable[Any]) -> Iterator[_ArrowBatch]:
+    first = 0
+    for batch in batches:
+        yield _ArrowBatch(first, batch)
+        first += batch.num_rows
+
+
+def _stdlib_csv_batches(
+    source: BinaryIO, dialect: Any, names: List[str], batch_rows: int
+) -> Iterator[_ListBatch]:
+    stream = io.TextIOWrapper(source, encoding="utf-8-sig", errors="ignore", newline="")
+    try:
+        reader = csv.reader(stream, dialect)
+        next(reader, None)
+        # Blank lines are not rows, as with pyarrow.
+        nonblank = (row for row in reader if row)
+        first = 0
+        while True:
+            rows = list(itertools.islice(nonblank, batch_rows))
+            if not rows:
+                return
+            yield _ListBatch(range(first, first + len(rows)), names, rows)
+            first += len(rows)
+    finally:
+        # Leave `source` open for the caller.
+        stream.detach()
+
+
+def _flatten(value: Any, name: str, out: Dict[str, str]) -> None:
+    if isinstance(value, str):
+        out[name] = value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[name] = json.dumps(value)
+    elif isinstance(value, dict):
+        for index, (key, item) in enumerate(value.items()):
+            out[f"{name}{{{index}}}"] = key
+            _flatten(item, f"{name}.{key}" if name else key, out)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            _flatten(item, f"{name}[{index}]", out)
+
+
+def _bounded_lines(source: BinaryIO, max_bytes: int) -> Iterator[str]:
+    """
+    Yield the lines of a UTF-8 stream without reading more than `max_bytes`
+    of any line; raises TableFormatError on a longer line.
+    """
+    for number in itertools.count():
+        line = source.readline(max_bytes + 1)
+        if not line:
+            return
+        if len(line) > max_bytes:
+            raise TableFormatError(f"Line {number} is longer than {max_bytes} bytes")
+        if number == 0 and line.startswith(codecs.BOM_UTF8):
+            line = line[len(codecs.BOM_UTF8) :]
+        yield line.decode("utf-8", errors="ignore")
+
+
+def _jsonl_batches(source: BinaryIO, batch_rows: int) -> Iterator[_DictBatch]:
+    numbers: List[int] = []
+    rows: List[Dict[str, str]] = []
+    for number, line in enumerate(_bounded_lines(source, MAX_ROW_BYTES)):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        cells: Dict[str, str] = {}
+        _flatten(record, "" if isinstance(record, dict) else "value", cells)
+        numbers.append(number)
+        rows.append(cells)
+        if len(rows) >= batch_rows:
+            yield _DictBatch(numbers, rows)
+            numbers, rows = [], []
+    if rows:
+        yield _DictBatch(numbers, rows)
+
+
+def _string_columns(schema: Any) -> List[str]:
+    import pyarrow as pa
+
+    names: List[str] = []
+    for field in schema:
+        kind = field.type
+        if pa.types.is_dictionary(kind):
+            kind = kind.value_type
+        if pa.types.is_string(kind) or pa.types.is_large_string(kind):
+            names.append(field.name)
+    return names
+
+
+def _parquet_batches(
+    source: BinaryIO, batch_rows: int
+) -> Tuple[int, Iterator[_ArrowBatch]]:
+    """
+    Open a Parquet file and return its row count and string-column batches.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise TableFormatError("pyarrow is required to read Parquet") from exc
+
+    parquet = pq.ParquetFile(source)
+    columns = _string_columns(parquet.schema_arrow)
+
+    if not columns:
+        return parquet.metadata.num_rows, iter(())
+    batches = parquet.iter_batches(batch_size=batch_rows, columns=columns)
+    return parquet.metadata.num_rows, _arrow_batches(batches)
@@ -0,0 +1,7 @@
+"""
+Tests for the substitute enclave.
+
+Run them from the repository root:
+
+    python -m pytest tee_v1/tests
+"""
@@ -0,0 +1,71 @@
+"""
+The streaming canonical JSON encoder must produce exactly the bytes of
+`json.dumps(value, sort_keys=True, separators=(",", ":"))` over `.dict()`:
+report hashes and signatures are computed over them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from typing import Any, Callable, Tuple
+
+import pytest
+from pydantic import BaseModel
+
+from tee_v1 import canonical_json
+from tee_v1.benchmarks.bench_canonical_json import (
+    make_report,
+    random_model,
+    random_value,
+)
+from tee_v1.crypto_utils import canonical_json_bytes, compute_report_hash
+
+CASES = 2000
+
+
+def _plain(value: Any) -> Any:
+    # What `.dict()` turns nested models into, for the reference encoding.
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_plain(item) for item in value)
+    return value
+
+
+def _outcome(encode: Callable[[], bytes]) -> Tuple[str, bytes]:
+    try:
+        return "ok", encode()
+    except TypeError:
+        return "TypeError", b""
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.mark.parametrize("chunk_chars", [canonical_json.CHUNK_CHARS, 7])
+def test_random_values_match_json_dumps(
+    chunk_chars: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(canonical_json, "CHUNK_CHARS", chunk_chars)
+    rng = random.Random(0)
+    rejected = 0
+    for case in range(CASES):
+        value = {"value": random_value(rng)} if case % 3 else random_model(rng, 0)
+        expected = _outcome(lambda: _dumps(_plain(value)))
+        assert _outcome(lambda: canonical_json_bytes(value)) == expected, case
+        rejected += expected[0] != "ok"
+    # Both encoders must also agree on what they reject.
+    assert 0 < rejected < CASES
+
+
+def test_report_hash_matches_json_dumps() -> None:
+    report = make_report(500)
+    expected = "0x" + hashlib.sha256(_dumps(report.dict())).hexdigest()
+    assert compute_report_hash(report) == expected
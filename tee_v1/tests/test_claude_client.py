@@ -0,0 +1,76 @@
+"""
+The shared Claude client must reuse its pooled connections across calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Iterator
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from tee_v1.benchmarks.bench_claude_client import StubServer  # noqa: E402
+from tee_v1.claude_client import ClaudeClient  # noqa: E402
+
+CALLS = 40
+CONCURRENCY = 4
+
+
+@pytest.fixture
+def stub(monkeypatch: pytest.MonkeyPatch) -> Iterator[StubServer]:
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv(
+        "ANTHROPIC_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}"
+    )
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "stub")
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def _create(shared: ClaudeClient) -> None:
+    await shared.client.messages.create(
+        model="stub",
+        max_tokens=16,
+        messages=[{"role": "user", "content": "ping"}],
+    )
+
+
+def test_calls_reuse_pooled_connections(stub: StubServer) -> None:
+    shared = ClaudeClient(CONCURRENCY, CONCURRENCY, 30.0, 60.0)
+
+    async def run() -> None:
+        shared.start()
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def bounded() -> None:
+            async with semaphore:
+                await _create(shared)
+
+        try:
+            await asyncio.gather(*(bounded() for _ in range(CALLS)))
+        finally:
+            await shared.stop()
+
+    asyncio.run(run())
+    assert shared.metrics.requests == CALLS
+    assert 1 <= shared.metrics.connections_opened <= CONCURRENCY
+    assert len(stub.peers) == shared.metrics.connections_opened
+    assert shared.metrics.reused_requests == CALLS - len(stub.peers)
+    assert shared.metrics.tls_handshakes == 0
+    with pytest.raises(RuntimeError):
+        shared.client
+
+
+def test_no_client_without_api_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    shared = ClaudeClient(1, 1, 30.0, 60.0)
+    shared.start()
+    with pytest.raises(RuntimeError):
+        shared.client
@@ -0,0 +1,45 @@
+"""
+Magic bytes only decide a file's content kind when its suffix agrees, so a
+file disguised behind another kind's magic is still scanned as text.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from tee_v1.content_sniffer import ARCHIVE, IMAGE, STRUCTURED, TEXT, sniff_content
+from tee_v1.pii_scanner import scan_dataset_for_pii
+
+_JPEG = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00"
+
+
+@pytest.mark.parametrize(
+    "head, suffix, kind",
+    [
+        (_JPEG, ".jpg", IMAGE),
+        (_JPEG, ".JPEG", IMAGE),
+        (_JPEG, "", IMAGE),
+        (_JPEG, ".bin", IMAGE),
+        (_JPEG, ".csv", TEXT),
+        (_JPEG, ".parquet", TEXT),
+        (b"PAR1\x15\x04", ".parquet", STRUCTURED),
+        (b"PAR1\x15\x04", ".png", TEXT),
+        (b"PK\x03\x04", ".zip", ARCHIVE),
+        (b"PK\x03\x04", ".jsonl", TEXT),
+    ],
+)
+def test_magic_must_agree_with_the_suffix(head: bytes, suffix: str, kind: str) -> None:
+    assert sniff_content(head, suffix) == kind
+
+
+def test_disguised_text_is_scanned(tmp_path: Path) -> None:
+    (tmp_path / "users.csv").write_bytes(_JPEG + b"\njane.doe@example.com\n")
+    (tmp_path / "photo.jpg").write_bytes(_JPEG + b"\njane.doe@example.com\n")
+
+    scan = scan_dataset_for_pii(tmp_path)
+
+    assert [(file.path, file.counts) for file in scan.files] == [
+        ("users.csv", {"EMAIL": 1})
+    ]
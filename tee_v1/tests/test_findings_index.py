@@ -0,0 +1,57 @@
+"""
+Findings recorded in the `FindingsIndex` must never outlive the contents they
+were found in, even when a file is rewritten with its stat fingerprint kept,
+and files that could not be read must not be recorded as clean.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from tee_v1.findings_index import FindingsIndex
+from tee_v1.inventory import build_inventory
+from tee_v1.pii_scanner import hash_dataset, index_engine_key, scan_dataset_for_pii
+
+
+def test_content_digests_ignore_a_preserved_stat(tmp_path: Path) -> None:
+    dataset = tmp_path / "dataset"
+    dataset.mkdir()
+    target = dataset / "pay.csv"
+    target.write_bytes(b"card,4111 1111 1111 1111\n")
+    index = FindingsIndex(tmp_path / "index.sqlite3")
+
+    def scan():
+        inventory = build_inventory(dataset)
+        digests = hash_dataset(inventory)
+        scan = scan_dataset_for_pii(
+            dataset, inventory=inventory, index=index, digests=digests
+        )
+        assert scan.digests == digests
+        return scan
+
+    assert scan().files
+
+    # Same size, mtime and inode, different contents.
+    stat = os.stat(target)
+    with target.open("r+b") as handle:
+        handle.write(b"x" * stat.st_size)
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert scan().files == []
+
+
+def test_unreadable_files_are_reported_and_not_recorded(tmp_path: Path) -> None:
+    dataset = tmp_path / "dataset"
+    dataset.mkdir()
+    (dataset / "blob.bin").write_bytes(b"\x00\x01" * 100)
+    (dataset / "gone.txt").write_bytes(b"jane.doe@example.com\n")
+    index = FindingsIndex(tmp_path / "index.sqlite3")
+
+    inventory = build_inventory(dataset)
+    gone = next(e for e in inventory.files if e.relative_path == "gone.txt")
+    (dataset / "gone.txt").unlink()
+    scan = scan_dataset_for_pii(dataset, inventory=inventory, index=index)
+
+    assert scan.unscanned == [("blob.bin", "binary"), ("gone.txt", "unreadable")]
+    assert index.lookup(gone.key, index_engine_key()) is None
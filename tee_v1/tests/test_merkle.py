@@ -0,0 +1,33 @@
+"""
+The dataset root must not depend on how the files are hashed: serially or
+on a worker pool, from a directory or from the same files archived.
+"""
+
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from pathlib import Path
+
+from tee_v1.inventory import build_inventory
+from tee_v1.pii_scanner import hash_dataset, scan_dataset_for_pii
+
+
+def test_pooled_hashes_match_the_scan(tmp_path: Path) -> None:
+    dataset = tmp_path / "dataset"
+    (dataset / "nested").mkdir(parents=True)
+    for index in range(6):
+        (dataset / f"part{index}.txt").write_bytes(b"row %d\n" % index * 5000)
+    (dataset / "nested" / "empty.bin").write_bytes(b"")
+    with zipfile.ZipFile(tmp_path / "dataset.zip", "w") as bundle:
+        for path in sorted(dataset.rglob("*")):
+            if path.is_file():
+                bundle.write(path, path.relative_to(dataset).as_posix())
+    with tarfile.open(tmp_path / "dataset.tar.gz", "w:gz") as bundle:
+        bundle.add(dataset, arcname=".")
+
+    expected = scan_dataset_for_pii(dataset).digests
+    for root in (dataset, tmp_path / "dataset.zip", tmp_path / "dataset.tar.gz"):
+        inventory = build_inventory(root)
+        for workers in (1, 3):
+            assert hash_dataset(inventory, workers) == expected
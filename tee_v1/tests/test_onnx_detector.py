@@ -0,0 +1,154 @@
+"""
+The ONNX Runtime gun detector: batching must not change detections, and
+the exported train18 model must agree with ultralytics when both are
+available.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+from PIL import Image
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from onnx import TensorProto, helper  # noqa: E402
+
+from tee_v1.config import get_gun_detector_onnx_path  # noqa: E402
+from tee_v1.onnx_detector import OnnxGunDetector, nms  # noqa: E402
+
+IMGSZ = 64
+CLASSES = 2
+
+
+def _write_model(path: Path, batch: object) -> Path:
+    """
+    Write a small model with the YOLOv8 head's `(batch, 4 + nc, anchors)`
+    output: one anchor per 8x8 cell, computed from the cell's mean colour.
+    """
+    rng = np.random.default_rng(0)
+    outputs = 4 + CLASSES
+    initializers = [
+        helper.make_tensor("shape", TensorProto.INT64, [3], [0, 3, -1]),
+        helper.make_tensor(
+            "weight",
+            TensorProto.FLOAT,
+            [3, outputs],
+            rng.normal(0, 4, (3, outputs)).astype(np.float32).ravel(),
+        ),
+        helper.make_tensor(
+            "bias", TensorProto.FLOAT, [outputs], rng.normal(0, 1, outputs)
+        ),
+        helper.make_tensor(
+            "scale",
+            TensorProto.FLOAT,
+            [outputs],
+            [IMGSZ, IMGSZ, IMGSZ / 2, IMGSZ / 2] + [1.0] * CLASSES,
+        ),
+    ]
+    nodes = [
+        helper.make_node(
+            "AveragePool", ["images"], ["cells"], kernel_shape=[8, 8], strides=[8, 8]
+        ),
+        helper.make_node("Reshape", ["cells", "shape"], ["flat"]),
+        helper.make_node("Transpose", ["flat"], ["anchors"], perm=[0, 2, 1]),
+        helper.make_node("MatMul", ["anchors", "weight"], ["linear"]),
+        helper.make_node("Add", ["linear", "bias"], ["logits"]),
+        helper.make_node("Sigmoid", ["logits"], ["unit"]),
+        helper.make_node("Mul", ["unit", "scale"], ["head"]),
+        helper.make_node("Transpose", ["head"], ["output0"], perm=[0, 2, 1]),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "yolo_head",
+        [
+            helper.make_tensor_value_info(
+                "images", TensorProto.FLOAT, [batch, 3, IMGSZ, IMGSZ]
+            )
+        ],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, None)],
+        initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return path
+
+
+def _images() -> List[Image.Image]:
+    rng = np.random.default_rng(1)
+    sizes = [(64, 64), (100, 40), (33, 90), (64, 64), (17, 17)]
+    return [
+        Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+        for width, height in sizes
+    ]
+
+
+def test_static_batches_match_one_dynamic_batch(tmp_path: Path) -> None:
+    static = OnnxGunDetector(
+        _write_model(tmp_path / "static.onnx", 1), imgsz=IMGSZ
+    )
+    dynamic = OnnxGunDetector(
+        _write_model(tmp_path / "dynamic.onnx", "batch"), imgsz=IMGSZ
+    )
+    images = _images()
+
+    # The static model is run one image per chunk, the dynamic one in a
+    # single chunk: detections must be mapped back to the right images.
+    chunked = static.detect(images)
+    batched = dynamic.detect(images)
+    single = [dynamic.detect([image])[0] for image in images]
+    assert any(chunked)
+    for detections in (batched, single):
+        assert len(detections) == len(chunked)
+        for expected, actual in zip(chunked, detections):
+            assert [d.class_id for d in actual] == [d.class_id for d in expected]
+            for got, want in zip(actual, expected):
+                assert (got.confidence, got.x1, got.y1, got.x2, got.y2) == (
+                    pytest.approx(
+                        (want.confidence, want.x1, want.y1, want.x2, want.y2),
+                        abs=1e-4,
+                    )
+                )
+
+
+def test_nms_keeps_the_best_of_overlapping_boxes() -> None:
+    boxes = np.array(
+        [[0, 0, 10, 10], [1, 1, 10, 10], [20, 20, 30, 30]], dtype=np.float32
+    )
+    scores = np.array([0.6, 0.9, 0.3], dtype=np.float32)
+    assert nms(boxes, scores, 0.7) == [1, 2]
+    assert nms(boxes, scores, 0.9) == [1, 0, 2]
+
+
+def test_matches_ultralytics() -> None:
+    """
+    Parity with ultralytics on the repository's images, when the train18
+    weights, their ONNX export and ultralytics are all installed.
+    """
+    pytest.importorskip("ultralytics")
+    from tee_v1.benchmarks.bench_gun_detection import DEFAULT_IMAGES, collect_images
+    from tee_v1.weapon_and_claude import (
+        decode_image,
+        load_yolo_model,
+        max_confidence,
+    )
+
+    onnx_path = get_gun_detector_onnx_path()
+    yolo = load_yolo_model()
+    if yolo is None or not onnx_path.exists():
+        pytest.skip("train18 weights or their ONNX export are not available")
+    detector = OnnxGunDetector(onnx_path)
+
+    for path in collect_images(DEFAULT_IMAGES, 8):
+        image = decode_image(path)
+        assert image is not None
+        results = yolo.predict(source=image, imgsz=640, verbose=False)
+        expected = max((max_confidence(r) for r in results), default=0.0)
+        (actual,) = detector.max_confidences([image])
+        assert actual == pytest.approx(expected, abs=0.05), path
+        assert (actual > 0.5) == (expected > 0.5), path
@@ -0,0 +1,113 @@
+"""
+Every policy's engine must find exactly what one `finditer` pass per
+detector over the whole text finds (see `bench_policies.scan_per_detector`),
+whether the text is scanned at once or streamed in small blocks.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+from typing import List, Tuple
+
+import pytest
+
+from tee_v1.benchmarks.bench_policies import scan_per_detector
+from tee_v1.pii_scanner import DetectorEngine, _iter_text_segments
+from tee_v1.policies import _POLICIES, CARD_DETECTOR, compile_policy
+
+CASES = 40_000
+
+# Mostly the characters the detectors and their windows care about, plus
+# word characters (ASCII or not) that decide their word boundaries.
+_ALPHABET = "0123456789" * 4 + "    --\n+().,;_aRxé@.DE"
+_VALUES = (
+    "4111 1111 1111 1111",
+    "5500-0000-0000-0004",
+    "378282246310005",
+    "DE89370400440532013000",
+    "GB82WEST12345698765432",
+    "jane.doe@example.com",
+    "+33 6 12 34 56 78",
+)
+
+
+def _random_text(rng: random.Random) -> str:
+    parts: List[str] = []
+    for _ in range(rng.randint(1, 4)):
+        if rng.random() < 0.3:
+            parts.append(rng.choice(_VALUES))
+        else:
+            parts.append(
+                "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 24)))
+            )
+    return "".join(parts)
+
+
+def _streamed(version: str, text: str, block: int) -> List[Tuple[str, str]]:
+    engine = compile_policy(version).engine
+    data = text.encode("utf-8")
+    blocks = (data[i : i + block] for i in range(0, len(data), block))
+    hits: List[List[str]] = [[] for _ in engine.detectors]
+    for buffer, start in _iter_text_segments(blocks, engine):
+        for index, match in engine.iter_matches(buffer, start):
+            hits[index].append(match.group(0))
+    return engine.flatten(hits)
+
+
+@pytest.mark.parametrize("version", sorted(_POLICIES))
+def test_engine_matches_whole_text_reference(version: str) -> None:
+    spec = _POLICIES[version]
+    engine = compile_policy(version).engine
+    rng = random.Random(version)
+    for case in range(CASES):
+        text = _random_text(rng)
+        expected = scan_per_detector(spec, text)
+        assert engine.scan(text) == expected, (case, text)
+        if case % 10 == 0:
+            assert _streamed(version, text, rng.randint(1, 8)) == expected, (
+                case,
+                text,
+            )
+
+
+def test_card_at_the_end_of_a_window() -> None:
+    # The digits end the phone trigger's window, but not a word.
+    engine = compile_policy("v2").engine
+    assert [name for name, _ in engine.scan("\n04111 1111 1111 1111aR-")] == [
+        "PHONE"
+    ]
+
+
+def test_overlapping_matches_count_once() -> None:
+    policy = compile_policy("v2")
+    text = "card 4111 1111 1111 1111, iban DE89370400440532013000"
+    assert policy.engine.scan(text) == [
+        ("IBAN", "DE89370400440532013000"),
+        ("CARD", "4111 1111 1111 1111"),
+    ]
+    # Without overlap resolution, the same digits were also phone numbers.
+    assert compile_policy("v1").engine.scan(text) == [
+        ("PHONE", "4111 1111 1111 1111"),
+        ("PHONE", "89370400440532013000"),
+        ("IBAN", "DE89370400440532013000"),
+    ]
+
+
+def _always(value: str) -> bool:
+    return True
+
+
+def _never(value: str) -> bool:
+    return False
+
+
+def test_fingerprint_covers_validator_code() -> None:
+    # Same detector, same validator name, different check.
+    changed = _never
+    changed.__qualname__ = _always.__qualname__
+    fingerprints = {
+        DetectorEngine([replace(CARD_DETECTOR, validate=validate)]).fingerprint
+        for validate in (_always, changed)
+    }
+    assert len(fingerprints) == 2
@@ -0,0 +1,60 @@
+"""
+JSONL rows must expose everything a value can hide in (object keys and
+numbers, not only strings), and a line too long to parse must not be read
+into memory: the file is then scanned as text, so nothing is missed.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from tee_v1.pii_scanner import scan_dataset_for_pii
+from tee_v1.policies import compile_policy
+from tee_v1.table_extractors import (
+    JSONL,
+    MAX_ROW_BYTES,
+    TableFormatError,
+    iter_columns,
+)
+
+
+def _columns(data: bytes) -> Dict[str, List[str]]:
+    source = io.BufferedReader(io.BytesIO(data))
+    return {name: values for name, _, values in iter_columns(JSONL, source)}
+
+
+def test_jsonl_keys_and_numbers_are_cells() -> None:
+    record = {
+        "jane.doe@example.com": True,
+        "payment": {"card": 4111111111111111, "amount": 12.5, "note": None},
+    }
+    assert _columns(json.dumps(record).encode("utf-8") + b"\n") == {
+        "{0}": ["jane.doe@example.com"],
+        "{1}": ["payment"],
+        "payment{0}": ["card"],
+        "payment.card": ["4111111111111111"],
+        "payment{1}": ["amount"],
+        "payment.amount": ["12.5"],
+        "payment{2}": ["note"],
+    }
+
+
+def test_jsonl_line_limit(tmp_path: Path) -> None:
+    long_line = json.dumps({"blob": "x" * MAX_ROW_BYTES}).encode("utf-8")
+    with pytest.raises(TableFormatError):
+        _columns(long_line + b"\n")
+
+    dataset = tmp_path / "dataset"
+    dataset.mkdir()
+    (dataset / "rows.jsonl").write_bytes(
+        long_line + b'\n{"contact": "jane.doe@example.com"}\n'
+    )
+    scan = scan_dataset_for_pii(dataset, engine=compile_policy("v2").engine)
+    assert [(f.path, f.counts) for f in scan.files] == [
+        ("rows.jsonl", {"EMAIL": 1})
+    ]
@@ -0,0 +1,88 @@
+"""
+The verdict cache answers a byte-identical image from its SHA-256 alone: an
+exact hit must not decode the image, in the service's gun detector or in the
+tee_v0 Claude verifier.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from PIL import Image
+
+from tee_v1 import weapon_and_claude
+from tee_v1.verdict_cache import VerdictCache, fingerprint_file
+
+
+class _FakeDetector:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def max_confidences(self, images: List[Image.Image]) -> List[float]:
+        self.calls += 1
+        return [0.9] * len(images)
+
+
+def _write_image(path: Path) -> Path:
+    image = Image.new("RGB", (32, 32))
+    image.putdata([(x * 8, y * 8, 0) for y in range(32) for x in range(32)])
+    image.save(path)
+    return path
+
+
+def _count_decodes(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    decodes = [0]
+    original = Image.open
+
+    def counting_open(*args: Any, **kwargs: Any) -> Image.Image:
+        decodes[0] += 1
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(Image, "open", counting_open)
+    return decodes
+
+
+def test_exact_hit_skips_decoding_in_gun_detection(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = _write_image(tmp_path / "gun.png")
+    detector = _FakeDetector()
+    cache = VerdictCache(tmp_path / "verdicts.db", 100, 6)
+    monkeypatch.setattr(weapon_and_claude, "_detector_loaded", True)
+    monkeypatch.setattr(weapon_and_claude, "_YOLO_MODEL", None)
+    monkeypatch.setattr(weapon_and_claude, "_ONNX_DETECTOR", detector)
+    monkeypatch.setattr(weapon_and_claude, "_VERDICT_CACHE", cache)
+    monkeypatch.setattr(weapon_and_claude, "_VERDICT_NAMESPACE", "gun:test")
+    decodes = _count_decodes(monkeypatch)
+
+    assert list(weapon_and_claude.iter_gun_detection_batches([path])) == [[0.9]]
+    assert (detector.calls, decodes[0]) == (1, 1)
+
+    sources = [path, path.read_bytes()]
+    assert list(weapon_and_claude.iter_gun_detection_batches(sources)) == [
+        [0.9, 0.9]
+    ]
+    assert (detector.calls, decodes[0]) == (1, 1)
+    cache.close()
+
+
+def test_exact_hit_skips_decoding_in_claude_verifier(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("anthropic")
+    from tee_v0.claude_report import VERDICT_NAMESPACE, classify_image
+
+    path = _write_image(tmp_path / "photo.png")
+    verdict = {"weapon": False, "description": "a gradient", "decision": True}
+    cache = VerdictCache(tmp_path / "verdicts.db", 100, 6)
+    fingerprint = fingerprint_file(path)
+    assert fingerprint is not None
+    cache.store(VERDICT_NAMESPACE, fingerprint, verdict)
+    decodes = _count_decodes(monkeypatch)
+
+    # The client is never reached on a cache hit.
+    assert classify_image(None, path, cache) == verdict  # type: ignore[arg-type]
+    assert decodes[0] == 0
+    cache.close()
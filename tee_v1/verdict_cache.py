@@ -0,0 +1,350 @@
+"""
+Near-duplicate aware cache of per-image verdicts.
+
+The same pictures are uploaded again and again, byte-identical or re-encoded,
+resized or recompressed. Each entry is keyed by:
+
+* the SHA-256 of the file bytes, for exact hits, which `lookup_exact`
+  answers before the image is even decoded, and
+* a 64-bit pHash (DCT of a 32x32 grayscale thumbnail) plus a 64-bit dHash
+  (horizontal gradient of a 9x8 thumbnail), for near-duplicates: an image
+  matches when *both* Hamming distances are within `max_distance`.
+
+Verdicts are namespaced by what produced them (model, prompt, backend), so a
+model change never serves stale answers. Entries live in a small SQLite
+database bounded to `max_entries` and evicted least-recently-used; the
+perceptual hashes of each namespace are mirrored in memory so a lookup never
+scans the table.
+
+The in-memory pHashes are bucketed by band (`_NearDuplicateIndex`): split
+into `max_distance + 1` bands, two hashes within `max_distance` bits of each
+other agree on at least one whole band, so a lookup only compares the
+entries that share a band with the query instead of every entry.
+
+This module only depends on the standard library and Pillow, so the tee_v0
+scripts can import it as well.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from PIL import Image
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    namespace TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    phash INTEGER NOT NULL,
+    dhash INTEGER NOT NULL,
+    verdict TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (namespace, sha256)
+);
+CREATE INDEX IF NOT EXISTS verdicts_last_used ON verdicts (last_used);
+"""
+
+_PHASH_SIZE = 32
+_PHASH_LOW = 8
+# DCT-II basis for the low frequencies only: _DCT[u][x].
+_DCT = [
+    [
+        math.cos(math.pi * (2 * x + 1) * u / (2 * _PHASH_SIZE))
+        for x in range(_PHASH_SIZE)
+    ]
+    for u in range(_PHASH_LOW)
+]
+
+
+@dataclass(frozen=True)
+class ImageFingerprint:
+    sha256: str
+    phash: int
+    dhash: int
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit.
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _bits(values: List[float], threshold: float) -> int:
+    result = 0
+    for value in values:
+        result = (result << 1) | (value > threshold)
+    return result
+
+
+def dhash(image: Image.Image) -> int:
+    """
+    Return the 64-bit difference hash of `image`.
+    """
+    gray = image.convert("L").resize((9, 8), Image.BILINEAR)
+    pixels = list(gray.getdata())
+    gradients = [
+        pixels[row * 9 + col + 1] - pixels[row * 9 + col]
+        for row in range(8)
+        for col in range(8)
+    ]
+    return _bits(gradients, 0)
+
+
+def phash(image: Image.Image) -> int:
+    """
+    Return the 64-bit perceptual (DCT) hash of `image`.
+    """
+    gray = image.convert("L").resize((_PHASH_SIZE, _PHASH_SIZE), Image.BILINEAR)
+    pixels = list(gray.getdata())
+    rows = [pixels[i : i + _PHASH_SIZE] for i in range(0, len(pixels), _PHASH_SIZE)]
+    # Separable DCT restricted to the 8x8 low-frequency block.
+    row_dct = [
+        [sum(b * p for b, p in zip(basis, row)) for basis in _DCT] for row in rows
+    ]
+    low = [
+        sum(_DCT[u][x] * row_dct[x][v] for x in range(_PHASH_SIZE))
+        for u in range(_PHASH_LOW)
+        for v in range(_PHASH_LOW)
+    ]
+    # The DC term only carries overall brightness.
+    median = sorted(low[1:])[len(low[1:]) // 2]
+    return _bits(low, median)
+
+
+def content_sha256(data: bytes) -> str:
+    """
+    Return the exact-hit key of an image whose file contents are `data`.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def fingerprint_image(
+    image: Image.Image, data: bytes, sha256: Optional[str] = None
+) -> ImageFingerprint:
+    """
+    Fingerprint a decoded image whose encoded file contents are `data`.
+
+    `sha256` may pass in `content_sha256(data)` when it is already known.
+    """
+    return ImageFingerprint(
+        sha256 or content_sha256(data), phash(image), dhash(image)
+    )
+
+
+def fingerprint_bytes(
+    data: bytes, sha256: Optional[str] = None
+) -> Optional[ImageFingerprint]:
+    """
+    Fingerprint an image from its file contents, or return None if they can
+    not be decoded.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return fingerprint_image(image, data, sha256)
+    except Exception:
+        return None
+
+
+def fingerprint_file(path: Path) -> Optional[ImageFingerprint]:
+    """
+    Fingerprint an image file, or return None if it can not be decoded.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    return fingerprint_bytes(data)
+
+
+class _NearDuplicateIndex:
+    """
+    The perceptual hashes of one namespace, bucketed by pHash band.
+
+    Distances above 63 bits leave no band to bucket on; every entry is then
+    a candidate.
+    """
+
+    def __init__(self, max_distance: int) -> None:
+        self.max_distance = max_distance
+        self.hashes: Dict[str, Tuple[int, int]] = {}
+        count = max_distance + 1
+        # (shift, mask) of each band, covering the 64 bits.
+        self._bands: List[Tuple[int, int]] = []
+        if count <= 64:
+            bounds = [64 * band // count for band in range(count + 1)]
+            self._bands = [
+                (low, (1 << high - low) - 1) for low, high in zip(bounds, bounds[1:])
+            ]
+        self._buckets: List[Dict[int, Set[str]]] = [{} for _ in self._bands]
+
+    def __contains__(self, sha: str) -> bool:
+        return sha in self.hashes
+
+    def add(self, sha: str, p: int, d: int) -> None:
+        self.remove(sha)
+        self.hashes[sha] = (p, d)
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            buckets.setdefault(p >> shift & mask, set()).add(sha)
+
+    def remove(self, sha: str) -> None:
+        entry = self.hashes.pop(sha, None)
+        if entry is None:
+            return
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            key = entry[0] >> shift & mask
+            bucket = buckets[key]
+            bucket.discard(sha)
+            if not bucket:
+                del buckets[key]
+
+    def _candidates(self, p: int) -> Set[str]:
+        if not self._bands:
+            return set(self.hashes)
+        found: Set[str] = set()
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            found.update(buckets.get(p >> shift & mask, ()))
+        return found
+
+    def nearest(self, fingerprint: ImageFingerprint) -> Optional[str]:
+        """
+        Return the entry with the same SHA-256, or else the one with the
+        smallest distance within `max_distance`, if any.
+        """
+        if fingerprint.sha256 in self.hashes:
+            return fingerprint.sha256
+        best: Optional[str] = None
+        best_key = (self.max_distance + 1, "")
+        for sha in self._candidates(fingerprint.phash):
+            p, d = self.hashes[sha]
+            p_distance = (p ^ fingerprint.phash).bit_count()
+            d_distance = (d ^ fingerprint.dhash).bit_count()
+            # Ties go to the smallest SHA-256, whatever the bucket order.
+            key = (max(p_distance, d_distance), sha)
+            if key < best_key:
+                best, best_key = sha, key
+        return best
+
+
+class VerdictCache:
+    """
+    SQLite-backed verdict cache, safe to share across threads.
+    """
+
+    def __init__(self, path: Path, max_entries: int, max_distance: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+        self._hashes: Dict[str, _NearDuplicateIndex] = {}
+
+    def _namespace_hashes(self, namespace: str) -> _NearDuplicateIndex:
+        hashes = self._hashes.get(namespace)
+        if hashes is None:
+            rows = self._conn.execute(
+                "SELECT sha256, phash, dhash FROM verdicts WHERE namespace = ?",
+                (namespace,),
+            ).fetchall()
+            hashes = _NearDuplicateIndex(self.max_distance)
+            for sha, p, d in rows:
+                hashes.add(sha, p & (1 << 64) - 1, d & (1 << 64) - 1)
+            self._hashes[namespace] = hashes
+        return hashes
+
+    def lookup(
+        self, namespace: str, fingerprint: ImageFingerprint
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the verdict of the same or a near-duplicate image, if cached.
+        """
+        with self._lock:
+            hashes = self._namespace_hashes(namespace)
+            sha = hashes.nearest(fingerprint)
+            if sha is None:
+                return None
+            return self._fetch(namespace, hashes, sha)
+
+    def lookup_exact(self, namespace: str, sha256: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the verdict of a byte-identical image, if cached.
+
+        Needs only `content_sha256` of the file, so a hit skips decoding and
+        perceptual hashing entirely.
+        """
+        with self._lock:
+            hashes = self._namespace_hashes(namespace)
+            if sha256 not in hashes:
+                return None
+            return self._fetch(namespace, hashes, sha256)
+
+    def _fetch(
+        self, namespace: str, hashes: _NearDuplicateIndex, sha: str
+    ) -> Optional[Dict[str, Any]]:
+        with self._conn:
+            row = self._conn.execute(
+                "SELECT verdict FROM verdicts WHERE namespace = ? AND sha256 = ?",
+                (namespace, sha),
+            ).fetchone()
+            if row is None:
+                # Evicted by another process.
+                hashes.remove(sha)
+                return None
+            self._conn.execute(
+                "UPDATE verdicts SET last_used = ? WHERE namespace = ? AND sha256 = ?",
+                (time.time(), namespace, sha),
+            )
+        return json.loads(row[0])
+
+    def store(
+        self, namespace: str, fingerprint: ImageFingerprint, verdict: Dict[str, Any]
+    ) -> None:
+        """
+        Record the verdict for an image, evicting the oldest entries if full.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    namespace,
+                    fingerprint.sha256,
+                    _to_signed(fingerprint.phash),
+                    _to_signed(fingerprint.dhash),
+                    json.dumps(verdict),
+                    time.time(),
+                ),
+            )
+            self._namespace_hashes(namespace).add(
+                fingerprint.sha256, fingerprint.phash, fingerprint.dhash
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        evicted = self._conn.execute(
+            "SELECT namespace, sha256 FROM verdicts ORDER BY last_used LIMIT ?",
+            (excess,),
+        ).fetchall()
+        self._conn.executemany(
+            "DELETE FROM verdicts WHERE namespace = ? AND sha256 = ?", evicted
+        )
+        for namespace, sha in evicted:
+            hashes = self._hashes.get(namespace)
+            if hashes is not None:
+                hashes.remove(sha)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
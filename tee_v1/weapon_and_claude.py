@@ -1,38 +1,104 @@
 """
 Extra analysis for the TEE substitute:
 
-* Randomly sample files from the dataset folder.
-* If the sampled file is an image (.png / .jpg / .jpeg), run the local
-  YOLOv8 gun detection model and set `weapon_flag=True` when the probability
-  is greater than 0.5.
+* Randomly sample images from the dataset folder.
+* Run the local YOLOv8 gun detection model over the sampled images (.png /
+  .jpg / .jpeg) and set `weapon_flag=True` when any probability is greater
+  than 0.5. Images are decoded in a thread pool and fed to the model in
+  fixed-size batches, so sampling hundreds of images stays cheap. The model
+  runs on ultralytics by default, or on ONNX Runtime's CPU provider with
+  `GUN_DETECTOR_BACKEND=onnx` (see `onnx_detector`). Per-image results are
+  kept in a verdict cache keyed by SHA-256 and perceptual hashes (see
+  `verdict_cache`), so re-uploaded or near-identical images skip the model.
+  Images of an archive dataset are read straight from the archive, a batch
+  at a time.
 * Always call the Claude API with a specific prompt and ask it to return a
   Nautilus-like JSON report, extended with a `weapon_flag` field.
+
+Sampling and detection are blocking and meant to run in a worker thread; the
+Claude call is a coroutine on the shared async Anthropic client owned by
+`main`. ultralytics and ONNX Runtime are imported lazily, and the detector is loaded on
+first use or by `load_gun_detector()` (see the warm-up in `main`).
 """
 
 from __future__ import annotations
 
+import io
+import itertools
 import json
 import os
 import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
-
-import httpx
-from anthropic import Anthropic
-from ultralytics import YOLO
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from PIL import Image
+
+from .config import (
+    get_gun_detector_backend,
+    get_gun_detector_onnx_path,
+    get_verdict_cache_max_distance,
+    get_verdict_cache_max_entries,
+    get_verdict_cache_path,
+)
+from .archive_reader import iter_member_bytes
+from .inventory import DatasetInventory, build_inventory
+from .verdict_cache import (
+    ImageFingerprint,
+    VerdictCache,
+    content_sha256,
+    fingerprint_image,
+)
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+    from ultralytics import YOLO
+
+    from .onnx_detector import OnnxGunDetector
 
 IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
 
+# Batched detection: images per model call, and threads decoding the next
+# batch while the current one is being inferred.
+DETECTION_BATCH_SIZE = 16
+DETECTION_DECODE_WORKERS = 4
 
-def _iter_files(root: Path) -> List[Path]:
-    return [p for p in root.rglob("*") if p.is_file()]
+# Archive members larger than this are not read, and so not decoded as images.
+MAX_IMAGE_BYTES = 64 << 20
 
 
-def sample_files(dataset_root: Path, sample_size: int = 1) -> List[Path]:
+def sample_files(
+    dataset_root: Path,
+    sample_size: int = 1,
+    suffixes: Optional[AbstractSet[str]] = None,
+    inventory: Optional[DatasetInventory] = None,
+) -> List[Path]:
     """
     Randomly sample up to `sample_size` files from the dataset directory.
+
+    If `suffixes` is given, only files with one of those (lowercase)
+    extensions are considered. The request's `inventory` is reused if given.
     """
-    files = _iter_files(dataset_root)
+    if inventory is None:
+        inventory = build_inventory(dataset_root)
+    files = [
+        entry.path
+        for entry in inventory.files
+        if suffixes is None or entry.suffix in suffixes
+    ]
     if not files:
         return []
     if len(files) <= sample_size:
@@ -40,9 +106,9 @@ def sample_files(dataset_root: Path, sample_size: int = 1) -> List[Path]:
     return random.sample(files, sample_size)
 
 
-def _load_yolo_model() -> Optional[YOLO]:
+def _resolve_yolo_model_path() -> Optional[str]:
     """
-    Load the YOLOv8 gun detection model if available.
+    Return the YOLOv8 weights to load, if any.
 
     The model path can be overridden with GUN_MODEL_PATH. Otherwise we fall
     back to a best-effort default inside the Guns-Detection-YOLOv8-main repo.
@@ -66,17 +132,114 @@ def _load_yolo_model() -> Optional[YOLO]:
                 model_path = str(p)
                 break
 
+    return model_path or None
+
+
+def load_yolo_model() -> Optional[YOLO]:
+    """
+    Load the YOLOv8 gun detection model if available.
+    """
+    model_path = _resolve_yolo_model_path()
     if not model_path:
         return None
 
     try:
+        from ultralytics import YOLO
+
         return YOLO(model_path)
     except Exception:
         # In dev mode we don't hard-fail if the model can't be loaded.
         return None
 
 
-_YOLO_MODEL: Optional[YOLO] = _load_yolo_model()
+def _load_onnx_detector() -> Optional[OnnxGunDetector]:
+    """
+    Load the exported ONNX model for the `onnx` backend, if available.
+    """
+    model_path = get_gun_detector_onnx_path()
+    if not model_path.exists():
+        return None
+    try:
+        from .onnx_detector import OnnxGunDetector
+
+        return OnnxGunDetector(model_path)
+    except Exception:
+        return None
+
+
+# The detector is loaded on first use (or by a background warm-up), never at
+# import time, so that the service starts serving immediately.
+_detector_lock = threading.Lock()
+_detector_loaded = False
+_YOLO_MODEL: Optional[YOLO] = None
+_ONNX_DETECTOR: Optional[OnnxGunDetector] = None
+_VERDICT_CACHE: Optional[VerdictCache] = None
+# Cached probabilities are only reused for the same backend and weights file.
+_VERDICT_NAMESPACE = ""
+
+
+def _open_verdict_cache() -> Optional[VerdictCache]:
+    path = get_verdict_cache_path()
+    if path is None:
+        return None
+    try:
+        return VerdictCache(
+            path, get_verdict_cache_max_entries(), get_verdict_cache_max_distance()
+        )
+    except Exception:
+        return None
+
+
+def _verdict_namespace(backend: str, model_path: Optional[str]) -> str:
+    try:
+        stat = Path(model_path or "").stat()
+        version = f"{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        version = ""
+    return f"gun:{backend}:{model_path}:{version}"
+
+
+def gun_detector_version() -> str:
+    """
+    Identify the configured detector: its backend and weights file (path,
+    size and mtime). Does not load the model.
+    """
+    backend = get_gun_detector_backend()
+    if backend == "onnx":
+        model_path: Optional[str] = str(get_gun_detector_onnx_path())
+    else:
+        model_path = _resolve_yolo_model_path()
+    return _verdict_namespace(backend, model_path)
+
+
+def load_gun_detector() -> bool:
+    """
+    Load the configured gun detection backend once per process.
+
+    Thread-safe: concurrent callers wait for a single load. Returns True if a
+    model is available afterwards.
+    """
+    global _detector_loaded, _YOLO_MODEL, _ONNX_DETECTOR
+    global _VERDICT_CACHE, _VERDICT_NAMESPACE
+    if not _detector_loaded:
+        with _detector_lock:
+            if not _detector_loaded:
+                if get_gun_detector_backend() == "onnx":
+                    _ONNX_DETECTOR = _load_onnx_detector()
+                else:
+                    _YOLO_MODEL = load_yolo_model()
+                _VERDICT_CACHE = _open_verdict_cache()
+                _VERDICT_NAMESPACE = gun_detector_version()
+                _detector_loaded = True
+    return _YOLO_MODEL is not None or _ONNX_DETECTOR is not None
+
+
+def gun_detector_warm() -> bool:
+    """
+    Return True once the gun detector load has completed (even if no model
+    could be found).
+    """
+    return _detector_loaded
 
 
 def run_gun_detection(image_path: Path) -> float:
@@ -84,84 +247,226 @@ def run_gun_detection(image_path: Path) -> float:
     Run the YOLOv8 gun detection model on an image and return a probability
     estimate in [0, 1]. If detection is unavailable, returns 0.0.
     """
-    if _YOLO_MODEL is None:
-        return 0.0
+    return _predict_batch([_load_sample(image_path)])[0]
+
+
+def max_confidence(result: Any) -> float:
+    """
+    Return the highest confidence found in a single YOLO result.
+    """
+    # Best-effort: prefer explicit probabilities, otherwise box confidence.
+    if getattr(result, "probs", None) is not None and result.probs is not None:
+        try:
+            return float(result.probs.top1conf)
+        except Exception:
+            pass
 
+    max_conf = 0.0
+    if getattr(result, "boxes", None) is not None and result.boxes is not None:
+        try:
+            for b in result.boxes:
+                if getattr(b, "conf", None) is not None:
+                    max_conf = max(max_conf, float(b.conf))
+        except Exception:
+            pass
+    return max_conf
+
+
+# An image file, or the contents of one read from a dataset archive.
+ImageSource = Union[Path, bytes]
+
+# A decoded image plus its verdict-cache fingerprint (None if caching is off),
+# and the cached probability of an exact hit, which is never decoded.
+Sample = Tuple[Optional[Image.Image], Optional[ImageFingerprint], Optional[float]]
+
+
+def decode_image(source: ImageSource) -> Optional[Image.Image]:
+    """
+    Decode an image file, or its contents, to RGB the way the detector sees
+    it. Returns None if it can not be decoded.
+    """
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
     try:
-        results = _YOLO_MODEL.predict(
-            source=str(image_path),
-            imgsz=640,
-            verbose=False,
-        )
+        with Image.open(stream) as raw:
+            return raw.convert("RGB")
     except Exception:
-        return 0.0
+        return None
 
-    max_conf = 0.0
-    for r in results:
-        # Best-effort: prefer explicit probabilities, otherwise box confidence.
-        if getattr(r, "probs", None) is not None and r.probs is not None:
-            try:
-                conf = float(r.probs.top1conf)
-                max_conf = max(max_conf, conf)
+
+def _load_sample(source: ImageSource) -> Sample:
+    """
+    Decode an image from a single read of its bytes, fingerprinting it when
+    the verdict cache is enabled.
+
+    A byte-identical image already in the verdict cache is answered from its
+    SHA-256 alone, without decoding it or computing its perceptual hashes.
+    """
+    load_gun_detector()
+    try:
+        data = source if isinstance(source, bytes) else source.read_bytes()
+    except OSError:
+        return None, None, None
+    sha256: Optional[str] = None
+    if _VERDICT_CACHE is not None:
+        sha256 = content_sha256(data)
+        verdict = _VERDICT_CACHE.lookup_exact(_VERDICT_NAMESPACE, sha256)
+        if verdict is not None:
+            return None, None, float(verdict["probability"])
+    image = decode_image(data)
+    if image is None:
+        return None, None, None
+    if _VERDICT_CACHE is None:
+        return image, None, None
+    return image, fingerprint_image(image, data, sha256), None
+
+
+def _infer(images: List[Image.Image]) -> List[float]:
+    """
+    Run the loaded model once over a batch and return max confidences.
+    """
+    if _ONNX_DETECTOR is not None:
+        return _ONNX_DETECTOR.max_confidences(images)
+    # A list source is inferred as a single batch.
+    results = _YOLO_MODEL.predict(source=images, imgsz=640, verbose=False)
+    return [max_confidence(result) for result in results]
+
+
+def _predict_batch(samples: Sequence[Sample]) -> List[float]:
+    """
+    Score a batch; undecodable images score 0.0.
+
+    Images already in the verdict cache (exactly, see `_load_sample`, or as a
+    near-duplicate) are answered from it; the model runs once over the rest,
+    and its results are cached.
+    """
+    probabilities = [0.0] * len(samples)
+    if not load_gun_detector():
+        return probabilities
+
+    uncached: List[int] = []
+    for i, (image, fingerprint, cached) in enumerate(samples):
+        if cached is not None:
+            probabilities[i] = cached
+            continue
+        if image is None:
+            continue
+        if _VERDICT_CACHE is not None and fingerprint is not None:
+            verdict = _VERDICT_CACHE.lookup(_VERDICT_NAMESPACE, fingerprint)
+            if verdict is not None:
+                probabilities[i] = float(verdict["probability"])
                 continue
-            except Exception:
-                pass
-        if getattr(r, "boxes", None) is not None and r.boxes is not None:
-            try:
-                for b in r.boxes:
-                    if getattr(b, "conf", None) is not None:
-                        max_conf = max(max_conf, float(b.conf))
-            except Exception:
-                pass
+        uncached.append(i)
+    if not uncached:
+        return probabilities
 
-    return max_conf
+    try:
+        scores = _infer([samples[i][0] for i in uncached])
+    except Exception:
+        return probabilities
+
+    for i, score in zip(uncached, scores):
+        probabilities[i] = score
+        fingerprint = samples[i][1]
+        if _VERDICT_CACHE is not None and fingerprint is not None:
+            _VERDICT_CACHE.store(
+                _VERDICT_NAMESPACE, fingerprint, {"probability": score}
+            )
+    return probabilities
+
+
+def iter_gun_detection_batches(
+    images: Iterable[ImageSource],
+    batch_size: int = DETECTION_BATCH_SIZE,
+    decode_workers: int = DETECTION_DECODE_WORKERS,
+) -> Iterator[List[float]]:
+    """
+    Run gun detection over `images` in batches.
+
+    Yields one list of probabilities per batch, in input order. The next
+    batch is decoded in a thread pool while the current one is inferred, so
+    at most two batches of decoded images are held in memory. `images` is
+    consumed lazily, one batch ahead.
+    """
+    sources = iter(images)
+    with ThreadPoolExecutor(max_workers=decode_workers) as pool:
 
+        def submit_batch() -> List[Future[Sample]]:
+            batch = itertools.islice(sources, batch_size)
+            return [pool.submit(_load_sample, source) for source in batch]
 
-def compute_weapon_flag_from_samples(sampled_files: Sequence[Path]) -> bool:
+        pending = submit_batch()
+        while pending:
+            samples = [future.result() for future in pending]
+            pending = submit_batch()
+            yield _predict_batch(samples)
+
+
+def compute_weapon_flag_from_samples(
+    sampled_files: Sequence[Path],
+    batch_size: int = DETECTION_BATCH_SIZE,
+    inventory: Optional[DatasetInventory] = None,
+) -> bool:
     """
     Given a list of sampled files, run gun detection on image files and
     return True if any image yields a probability > 0.5.
+
+    Stops after the first batch containing such an image. If `inventory` is
+    an archive dataset, the sampled files are its members and are streamed
+    from the archive.
     """
-    for path in sampled_files:
-        if path.suffix.lower() in IMAGE_EXTENSIONS:
-            prob = run_gun_detection(path)
-            if prob > 0.5:
-                return True
+    images: Iterable[ImageSource] = [
+        p for p in sampled_files if p.suffix.lower() in IMAGE_EXTENSIONS
+    ]
+    if inventory is not None and inventory.archive:
+        members = {entry.path: entry.member for entry in inventory.files}
+        images = iter_member_bytes(
+            inventory.root, [members[p] for p in images], MAX_IMAGE_BYTES
+        )
+    for probabilities in iter_gun_detection_batches(images, batch_size):
+        if any(prob > 0.5 for prob in probabilities):
+            return True
     return False
 
 
-def _build_claude_client() -> Anthropic:
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise RuntimeError("ANTHROPIC_API_KEY environment variable is not set")
-    # Use httpx client to play nicer inside FastAPI.
-    client = httpx.Client(timeout=60)
-    return Anthropic(api_key=api_key, http_client=client)
+def compute_dataset_stats(
+    dataset_path: Path, inventory: Optional[DatasetInventory] = None
+) -> Dict[str, Any]:
+    """
+    Return simple dataset stats (file count, total size, type histogram).
 
+    Without an `inventory` this walks the dataset tree, so call it off the
+    event loop; with one it does no I/O.
+    """
+    if inventory is None:
+        inventory = build_inventory(dataset_path)
+    file_types: Dict[str, int] = {}
+    for entry in inventory.files:
+        ext = entry.suffix.lstrip(".") or "unknown"
+        file_types[ext] = file_types.get(ext, 0) + 1
 
-def call_claude_report(
+    return {
+        "file_count": len(inventory.files),
+        "total_size": inventory.total_size,
+        "file_types": file_types,
+    }
+
+
+async def call_claude_report(
+    client: AsyncAnthropic,
     dataset_id: str,
-    dataset_path: Path,
+    dataset_stats: Dict[str, Any],
     weapon_flag: bool,
 ) -> Dict[str, Any]:
     """
     Call Claude with a fixed prompt asking for a Nautilus-like report JSON,
     extended with a `weapon_flag` boolean field.
-    """
-    client = _build_claude_client()
 
-    # Simple dataset stats to give Claude a bit of context.
-    all_files = _iter_files(dataset_path)
-    file_count = len(all_files)
-    file_types: Dict[str, int] = {}
-    total_size = 0
-    for f in all_files:
-        ext = f.suffix.lower().lstrip(".") or "unknown"
-        file_types[ext] = file_types.get(ext, 0) + 1
-        try:
-            total_size += f.stat().st_size
-        except OSError:
-            pass
+    `client` is the process-wide client (see `claude_client`);
+    `dataset_stats` is the output of `compute_dataset_stats`.
+    """
+    file_count = dataset_stats["file_count"]
+    total_size = dataset_stats["total_size"]
+    file_types = dataset_stats["file_types"]
 
     prompt = f"""
 You are a compliance engine running inside a TEE.
@@ -203,7 +508,7 @@ Your task:
 Output ONLY valid JSON, no markdown, no comments.
 """
 
-    response = client.messages.create(
+    response = await client.messages.create(
         model="claude-3-5-sonnet-latest",
         max_tokens=1500,
         temperature=0.1,